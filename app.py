@@ -1,9 +1,12 @@
 import streamlit as st
-import modules.quant_a as quant_a
-import modules.quant_b as quant_b
-import yfinance as yf
+from modules import profiling
+from modules.compute_cache import get_cache
+from modules.downsample import CHART_POINTS
+from modules.live_quotes import QuoteService, StoreQuoteSource
+from modules.market_data import get_store
+from modules.report_store import ReportStore
+import json
 import os
-import glob
 
 # -----------------------------------------------------------------------------
 # 1. CONFIGURATION
@@ -61,12 +64,12 @@ st.markdown("""
         padding: 20px;
         text-align: center;
         margin: 0 auto 40px auto;
-        width: 60%; 
+        width: 100%; 
         box-shadow: 0 0 15px rgba(0, 210, 255, 0.1); 
     }
 
     .ticker-price {
-        font-size: 40px;
+        font-size: 30px;
         font-weight: bold;
         color: #FAFAFA;
         font-family: 'Courier New', monospace; 
@@ -119,18 +122,42 @@ if 'page' not in st.session_state: st.session_state.page = 'home'
 def go_home(): st.session_state.page = 'home'
 def go_quant_a(): st.session_state.page = 'quant_a'
 def go_quant_b(): st.session_state.page = 'quant_b'
+def go_screener(): st.session_state.page = 'screener'
 
-@st.cache_data(ttl=30)
-def get_btc_data():
-    try:
-        btc = yf.Ticker("BTC-USD")
-        hist = btc.history(period="2d")
-        current = hist['Close'].iloc[-1]
-        prev = hist['Close'].iloc[-2]
-        delta = ((current - prev) / prev) * 100
-        return current, delta
-    except:
-        return 0.0, 0.0
+# Symboles du bandeau de cotations (configurable : QUANT_LIVE_SYMBOLS="BTC-USD,ETH-USD,...")
+LIVE_SYMBOLS = [s for s in os.environ.get("QUANT_LIVE_SYMBOLS", "BTC-USD,ETH-USD,AAPL,GC=F").split(",") if s]
+
+@st.cache_resource
+def get_quote_service():
+    # Partagé entre les sessions : une seule requête en vol par symbole
+    return QuoteService(StoreQuoteSource(get_store()))
+
+@st.cache_resource
+def get_report_store():
+    return ReportStore()
+
+# Compteurs du cache de calculs partagé (dimensionnement : QUANT_CACHE_MB / QUANT_CACHE_DIR)
+with st.sidebar.expander("🧮 Cache de calcul"):
+    st.json(get_cache().stats())
+    # Vues par défaut précalculées par precompute.py dans le même dossier (fraîcheur par vue)
+    if get_cache().cache_dir and os.path.exists(os.path.join(get_cache().cache_dir, "precompute_state.json")):
+        from modules.precompute import STATE_FILE, load_state, state_table
+        st.dataframe(state_table(load_state(os.path.join(get_cache().cache_dir, STATE_FILE))), use_container_width=True)
+
+# Taille des graphiques : les longues séries sont réduites (LTTB) avant d'être envoyées au navigateur.
+# Le budget est partagé entre les courbes d'un graphique ; QUANT_CHART_POINTS s'ajoute aux choix proposés
+st.sidebar.select_slider(
+    "📉 Points max par graphique", options=sorted({500, 1000, 2000, 5000, 20000, CHART_POINTS} - {0}) + [0], value=CHART_POINTS,
+    format_func=lambda n: "Tous" if n == 0 else f"{n:,}", key="chart_points",
+)
+
+# Profilage à la demande : temps par étape de cette relance (désactivé = aucun coût mesurable)
+debug = st.sidebar.checkbox("🐞 Profilage (temps par étape)", value=os.environ.get("QUANT_PROFILE") == "1")
+if debug:
+    profiling.start()
+
+REPORTS_PER_PAGE = 30
+ROWS_PER_PAGE = 50
 
 # -----------------------------------------------------------------------------
 # 4. AFFICHAGE
@@ -142,22 +169,30 @@ if st.session_state.page == 'home':
     st.markdown('<div class="main-title">QUANT TERMINAL</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-title">Advanced Analytics & Portfolio Management</div>', unsafe_allow_html=True)
 
-    price, delta = get_btc_data()
-    color = "#48BB78" if delta >= 0 else "#F56565"
-    sign = "+" if delta >= 0 else ""
-
-    st.markdown(f"""
-    <div class="ticker-box">
-        <span style="color: #A0AEC0; font-size: 18px; margin-right: 15px;">BITCOIN LIVE FEED</span>
-        <br>
-        <span class="ticker-price">{price:,.2f} $</span>
-        <span style="color: {color}; font-size: 22px; font-weight: bold; margin-left: 15px;">
-            {sign}{delta:.2f}%
-        </span>
-    </div>
-    """, unsafe_allow_html=True)
+    # Rendu immédiat : valeurs en cache servies telles quelles, rafraîchies en arrière-plan
+    with profiling.span("quotes"):
+        quotes = get_quote_service().get_quotes(LIVE_SYMBOLS)
+    for col, quote in zip(st.columns(len(quotes)) if quotes else [], quotes):
+        if quote.price is None:
+            body = f'<span style="color: #F56565; font-size: 16px;">{quote.error}</span>'
+        else:
+            color = "#48BB78" if quote.change_pct >= 0 else "#F56565"
+            sign = "+" if quote.change_pct >= 0 else ""
+            body = f"""
+            <span class="ticker-price">{quote.price:,.2f} $</span>
+            <span style="color: {color}; font-size: 18px; font-weight: bold; margin-left: 10px;">
+                {sign}{quote.change_pct:.2f}%
+            </span>"""
+        label = f"{quote.symbol} LIVE FEED" + (" ⏳" if quote.stale else "")
+        col.markdown(f"""
+        <div class="ticker-box">
+            <span style="color: #A0AEC0; font-size: 16px;">{label}</span>
+            <br>
+            {body}
+        </div>
+        """, unsafe_allow_html=True)
 
-    col1, col2 = st.columns(2, gap="large")
+    col1, col2, col3 = st.columns(3, gap="large")
 
     with col1:
         st.markdown("""
@@ -185,18 +220,47 @@ if st.session_state.page == 'home':
         """, unsafe_allow_html=True)
         st.button("OUVRIR PORTEFEUILLE", on_click=go_quant_b, key="btn_b")
 
+    with col3:
+        st.markdown("""
+        <div class="module-card">
+            <div class="card-icon">🔎</div>
+            <div class="card-title">Screener</div>
+            <div class="card-desc">
+                Tout l'univers de symboles en un tableau.<br>
+                Golden Cross, RSI & Bollinger filtrables.
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        st.button("OUVRIR SCREENER", on_click=go_screener, key="btn_s")
+
     # --- RAPPORTS AUTOMATIQUES ---
     st.markdown("---")
     st.header("📊 Daily Automation Reports")
     
-    # Chercher les fichiers générés par cron sur la VM
-    report_files = glob.glob("rapport_*.txt")
-    report_files.sort(reverse=True) # Les plus récents en premier
-
-    if report_files:
-        selected_report = st.selectbox("Consulter l'historique des rapports :", report_files)
-        with open(selected_report, "r") as f:
-            st.code(f.read(), language="text")
+    # Archive SQLite alimentée par le cron (import des anciens fichiers : python import_reports.py)
+    reports = get_report_store()
+    n_reports = reports.count()
+
+    if n_reports:
+        n_pages = (n_reports - 1) // REPORTS_PER_PAGE + 1
+        c1, c2 = st.columns([1, 4])
+        page = c1.number_input("Page", 1, n_pages, 1) if n_pages > 1 else 1
+        dates = reports.dates(limit=REPORTS_PER_PAGE, offset=(page - 1) * REPORTS_PER_PAGE)
+        selected_date = c2.selectbox(f"Consulter l'historique des rapports ({n_reports}) :", dates)
+
+        tab_summary, tab_table, tab_history = st.tabs(["Résumé", "Détail par actif", "Historique"])
+        with tab_summary:
+            st.code(reports.summary(selected_date) or "Résumé indisponible.", language="text")
+        with tab_table:
+            n_rows = reports.n_rows(selected_date)
+            row_page = st.number_input("Page du tableau", 1, max(1, (n_rows - 1) // ROWS_PER_PAGE + 1), 1)
+            st.dataframe(reports.rows(selected_date, ROWS_PER_PAGE, (row_page - 1) * ROWS_PER_PAGE), use_container_width=True)
+        with tab_history:
+            h1, h2 = st.columns([1, 2])
+            report_ticker = h1.selectbox("Actif", reports.tickers())
+            report_metrics = h2.multiselect("Métriques", ["close", "change_pct", "range_pct", "vol_1y", "sharpe_1y", "var_95"], default=["close"])
+            if report_metrics:
+                st.line_chart(reports.history(report_ticker, report_metrics))
     else:
         st.info("ℹ️ Les rapports automatisés apparaîtront ici après l'exécution de la tâche cron (20h00).")
 
@@ -206,10 +270,29 @@ elif st.session_state.page == 'quant_a':
     col_nav, _ = st.columns([1, 8])
     with col_nav: st.button("⬅ RETOUR", on_click=go_home)
     st.markdown("---")
+    from modules import quant_a  # Import différé : Plotly et scikit-learn ne sont chargés que sur cette page
     quant_a.run()
 
 elif st.session_state.page == 'quant_b':
     col_nav, _ = st.columns([1, 8])
     with col_nav: st.button("⬅ RETOUR", on_click=go_home)
     st.markdown("---")
-    quant_b.run()
\ No newline at end of file
+    from modules import quant_b  # Import différé : Plotly et scikit-learn ne sont chargés que sur cette page
+    quant_b.run()
+
+elif st.session_state.page == 'screener':
+    col_nav, _ = st.columns([1, 8])
+    with col_nav: st.button("⬅ RETOUR", on_click=go_home)
+    st.markdown("---")
+    from modules import screener_page
+    screener_page.run()
+
+# --- PROFILAGE ---
+if debug:
+    trace = profiling.stop()
+    with st.expander(f"🐞 Profilage de la relance ({trace.total * 1000:.0f} ms)", expanded=True):
+        st.dataframe(trace.breakdown(), use_container_width=True)
+        st.download_button(
+            "Exporter la trace (Chrome / Perfetto)", json.dumps(trace.to_chrome()),
+            file_name="trace.json", mime="application/json",
+        )
@@ -0,0 +1,74 @@
+import argparse
+import os
+from datetime import datetime
+
+from modules.backtest import STRATEGIES, make_strategy
+from modules.batch import read_tickers, run_batch, run_parallel, write_results
+from modules.execution import ExecutionModel
+from modules.market_data import open_store
+
+
+def parse_param(text):
+    """'short_window=20' -> ('short_window', 20)"""
+    key, _, value = text.partition("=")
+    for cast in (int, float):
+        try:
+            return key, cast(value)
+        except ValueError:
+            pass
+    return key, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest d'une stratégie sur une liste de symboles (sans interface)")
+    parser.add_argument("tickers", nargs="*", help="Symboles (ex: BTC-USD AAPL)")
+    parser.add_argument("--tickers-file", help="Fichier texte avec un symbole par ligne")
+    parser.add_argument("--strategy", default="golden_cross", choices=list(STRATEGIES) + ["all"],
+                        help="'all' = les quatre stratégies avec leurs paramètres par défaut")
+    parser.add_argument("--param", action="append", default=[],
+                        help="Paramètre de stratégie, ex: short_window=20 ou expression='sma(close, 20) > sma(close, 50)'")
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de processus (0 = un par cœur)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Symboles par lot envoyé à un worker")
+    parser.add_argument("--period", default="2y")
+    parser.add_argument("--capital", type=float, default=10000)
+    parser.add_argument("--commission-bps", type=float, default=0.0, help="Commission en points de base par ordre")
+    parser.add_argument("--slippage-bps", type=float, default=0.0, help="Slippage en points de base par ordre")
+    parser.add_argument("--fee", type=float, default=0.0, help="Frais fixes par ordre ($)")
+    parser.add_argument("--target-vol", type=float, help="Volatilité annualisée visée (ex: 0.15) pour la taille de position")
+    parser.add_argument("--data-dir", help="Dossier du store local (défaut : data/)")
+    parser.add_argument("--offline", metavar="DIR", help="Lire les prix depuis un dossier de fichiers CSV/Parquet (store temporaire sans --data-dir)")
+    parser.add_argument("--output", default=f"backtests/backtest_{datetime.now():%Y-%m-%d}.csv",
+                        help=".csv, .jsonl (écrits au fil de l'eau) ou .json")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        tickers += read_tickers(args.tickers_file)
+    if not tickers:
+        parser.error("aucun symbole fourni")
+
+    store = open_store(args.data_dir, args.offline)
+
+    if args.strategy == "all":
+        if args.param:
+            parser.error("--param ne s'utilise qu'avec une seule stratégie")
+        strategies = [make_strategy(name) for name in STRATEGIES if name != "expression"]
+    else:
+        strategies = [make_strategy(args.strategy, **dict(parse_param(p) for p in args.param))]
+
+    execution = ExecutionModel(args.commission_bps, args.slippage_bps, args.fee, args.target_vol)
+
+    if args.workers == 1:
+        rows = run_batch(tickers, strategies, store, args.period, args.capital, execution)
+        write_results(rows, args.output)
+        count = len(rows)
+    else:
+        workers = args.workers or os.cpu_count()
+        count = run_parallel(tickers, strategies, store, args.output, args.period, args.capital,
+                             workers=workers, chunk_size=args.chunk_size, execution=execution)
+
+    print(f"✅ {count} backtests écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
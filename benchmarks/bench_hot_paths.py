@@ -0,0 +1,201 @@
+"""Temps et pic mémoire des chemins critiques (quant_a / quant_b) sur données synthétiques, résultats en JSON.
+
+Usage : python benchmarks/bench_hot_paths.py [--bars 1000 100000 1000000] [--assets 2 10 100 500]
+        [--repeat 3] [--only backtest] [--output FICHIER.json] [--compare ANCIEN.json --threshold 1.2]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.synthetic import gbm_close, gbm_ohlcv
+from modules.bar_store import BarStore, from_frame, resample
+from modules.backtest import BollingerBands, BuyAndHold, ExpressionStrategy, GoldenCross, RSIStrategy, backtest, calculate_metrics
+from modules.forecasting import forecast, make_features
+from modules.portfolio import backtest_portfolio, simulate_portfolio
+from modules.screener import screen
+
+MAX_CELLS = 50_000_000  # Barres x actifs au-delà desquelles un cas multi-actifs est ignoré (~400 Mo par copie)
+_BAR_DIR = tempfile.TemporaryDirectory(prefix="bench_bars_")  # Colonnes memmap des cas de stockage
+
+
+# --- CAS MESURÉS : nom -> fabrique (données préparées hors chrono -> fonction chronométrée) ---
+def _strategy_case(strategy):
+    return lambda df: (lambda close=df['Close'].values: strategy.compute(close))
+
+
+def _metrics_case(df):
+    returns = df['Close'].pct_change().values
+    return lambda: calculate_metrics(returns)
+
+
+def _backtest_case(df):
+    close = df['Close'].values
+    signals, _ = GoldenCross().compute(close)
+    return lambda: backtest(close, signals)
+
+
+def _resample_case(df):
+    """Barres 1 min (prix à l'échelle de la minute) relues en memmap et agrégées en 15 min"""
+    store = BarStore(_BAR_DIR.name)
+    store.write("SYN", "1m", from_frame(gbm_ohlcv(len(df), freq="min", periods_per_year=525_600)))
+    return lambda: resample(store.read("SYN", "1m"), "15m")
+
+
+SINGLE_ASSET_CASES = {
+    "golden_cross": _strategy_case(GoldenCross()),
+    "rsi": _strategy_case(RSIStrategy()),
+    "bollinger": _strategy_case(BollingerBands()),
+    "buy_hold": _strategy_case(BuyAndHold()),
+    "expression": _strategy_case(ExpressionStrategy()),
+    "calculate_metrics": _metrics_case,
+    "backtest": _backtest_case,
+    "features": lambda df: (lambda: make_features(df['Close'])),
+    "forecast_ridge": lambda df: (lambda: forecast(df['Close'], "ridge")),
+    "bars_resample": _resample_case,
+}
+
+MULTI_ASSET_CASES = {
+    "portfolio_returns": lambda prices: (
+        lambda weights=dict.fromkeys(prices.columns, 1 / prices.shape[1]): simulate_portfolio(prices, weights)
+    ),
+    "portfolio_monthly": lambda prices: (
+        lambda weights=dict.fromkeys(prices.columns, 1 / prices.shape[1]): backtest_portfolio(prices, weights, rebalance="monthly")
+    ),
+    "correlation": lambda prices: (lambda returns=prices.pct_change().dropna(): returns.corr()),
+    "screener": lambda prices: (lambda: screen(prices)),
+}
+
+
+# --- MESURES ---
+def measure(func, repeat):
+    """Meilleur temps sur `repeat` exécutions, puis pic mémoire (tracemalloc) d'une exécution de plus"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak / 2**20
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_cases(bars, assets, repeat, only=None, max_cells=MAX_CELLS):
+    """Exécute tous les cas -> liste de résultats {case, bars, assets, seconds, peak_mb}"""
+    selected = lambda name: only is None or any(fnmatch.fnmatch(name, f"*{pattern}*") for pattern in only)
+    results = []
+
+    for n_bars in bars:
+        df = gbm_ohlcv(n_bars)
+        for name, factory in SINGLE_ASSET_CASES.items():
+            if selected(name):
+                results.append({"case": name, "bars": n_bars, "assets": 1, **_run(factory(df), repeat)})
+                _print(results[-1])
+
+        for n_assets in assets:
+            if n_bars * n_assets > max_cells:
+                print(f"{'(ignoré)':<20}{n_bars:>10}{n_assets:>8}   > {max_cells:,} cellules")
+                continue
+            prices = gbm_close(n_bars, n_assets)
+            for name, factory in MULTI_ASSET_CASES.items():
+                if selected(name):
+                    results.append({"case": name, "bars": n_bars, "assets": n_assets, **_run(factory(prices), repeat)})
+                    _print(results[-1])
+            del prices
+    return results
+
+
+def _run(func, repeat):
+    seconds, peak_mb = measure(func, repeat)
+    return {"seconds": seconds, "peak_mb": peak_mb}
+
+
+def _print(result):
+    print(f"{result['case']:<20}{result['bars']:>10}{result['assets']:>8}"
+          f"{result['seconds'] * 1000:>14.2f}{result['peak_mb']:>12.1f}")
+
+
+# --- COMPARAISON ENTRE COMMITS ---
+def compare(results, baseline, threshold=1.2, min_seconds=1e-3):
+    """Affiche le ratio nouveau / ancien par cas -> liste des régressions (temps ou mémoire)"""
+    old = {(r["case"], r["bars"], r["assets"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nComparaison avec {baseline.get('commit')} ({baseline.get('date')})")
+    print(f"{'cas':<20}{'barres':>10}{'actifs':>8}{'temps':>10}{'mémoire':>10}")
+    for r in results:
+        ref = old.get((r["case"], r["bars"], r["assets"]))
+        if ref is None:
+            continue
+        time_ratio = r["seconds"] / ref["seconds"] if ref["seconds"] else float("inf")
+        mem_ratio = r["peak_mb"] / ref["peak_mb"] if ref["peak_mb"] else 1.0
+        slower = time_ratio > threshold and r["seconds"] - ref["seconds"] > min_seconds
+        bigger = mem_ratio > threshold and r["peak_mb"] - ref["peak_mb"] > 1
+        flag = "  ⚠️ régression" if slower or bigger else ""
+        print(f"{r['case']:<20}{r['bars']:>10}{r['assets']:>8}{time_ratio:>9.2f}x{mem_ratio:>9.2f}x{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--assets", type=int, nargs="+", default=[2, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Ne lancer que les cas dont le nom contient ces motifs")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS, help="Taille max (barres x actifs) des cas multi-actifs")
+    parser.add_argument("--output", help="Fichier JSON (défaut : benchmarks/results/<date>_<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="Résultats d'un commit précédent")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Ratio à partir duquel un cas est une régression")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    now = datetime.now()
+    print(f"{'cas':<20}{'barres':>10}{'actifs':>8}{'temps (ms)':>14}{'pic (Mo)':>12}")
+    results = run_cases(args.bars, args.assets, args.repeat, args.only, args.max_cells)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{now:%Y%m%d-%H%M%S}_{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "date": now.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✅ Résultats : {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} régression(s) au-delà de x{args.threshold}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
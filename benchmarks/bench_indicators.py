@@ -0,0 +1,80 @@
+"""Compare les indicateurs NumPy (modules/indicators.py) aux versions pandas d'origine de quant_a.
+
+Usage : python benchmarks/bench_indicators.py [--sizes 10000 100000 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import gbm_paths
+from modules import indicators
+
+
+# --- VERSIONS PANDAS (code d'origine de quant_a.run) ---
+def pandas_sma(close, window):
+    return close.rolling(window=window).mean()
+
+
+def pandas_rsi(close, rsi_period):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def pandas_wilder_rsi(close, rsi_period):
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / rsi_period, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / rsi_period, adjust=False).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def pandas_bollinger(close, window, std_dev):
+    rolling_mean = close.rolling(window=window).mean()
+    rolling_std = close.rolling(window=window).std()
+    return rolling_mean + (rolling_std * std_dev), rolling_mean - (rolling_std * std_dev)
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'indicateur':<12}{'barres':>10}{'pandas (ms)':>14}{'numpy (ms)':>14}{'gain':>8}")
+    for size in args.sizes:
+        values = gbm_paths(size)[:, 0]
+        close = pd.Series(values)
+        out = np.empty(size)
+        out2, out3 = np.empty(size), np.empty(size)
+
+        cases = [
+            ("SMA(50)", lambda: pandas_sma(close, 50), lambda: indicators.sma(values, 50, out=out)),
+            ("RSI(14)", lambda: pandas_rsi(close, 14), lambda: indicators.rsi(values, 14, out=out)),
+            ("RSI Wilder", lambda: pandas_wilder_rsi(close, 14), lambda: indicators.rsi(values, 14, "wilder", out=out)),
+            ("Bollinger", lambda: pandas_bollinger(close, 20, 2.0),
+             lambda: indicators.bollinger(values, 20, 2.0, out_mid=out, out_upper=out2, out_lower=out3)),
+        ]
+        for name, pandas_func, numpy_func in cases:
+            t_pandas = best_time(pandas_func, args.repeat)
+            t_numpy = best_time(numpy_func, args.repeat)
+            print(f"{name:<12}{size:>10}{t_pandas * 1000:>14.2f}{t_numpy * 1000:>14.2f}{t_pandas / t_numpy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
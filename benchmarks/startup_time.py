@@ -0,0 +1,112 @@
+"""Démarrage à froid de la page d'accueil et du rapport quotidien : temps, mémoire résidente, modules lourds chargés.
+
+Chaque mesure tourne dans un nouvel interpréteur. --eager pré-importe scikit-learn, Plotly et yfinance
+(comportement avant les imports différés) pour comparer.
+
+Usage : python benchmarks/startup_time.py [--repeat 5] [--eager] [--output FICHIER.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.synthetic import gbm_ohlcv
+
+HEAVY_MODULES = ["sklearn", "plotly", "yfinance"]
+EAGER_IMPORTS = "import sklearn.linear_model, plotly.express, plotly.graph_objects, yfinance\n"
+
+# Code exécuté dans l'interpréteur enfant : le scénario, puis une ligne JSON de mesures
+_REPORT = """
+import json, resource, sys
+print(json.dumps({
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % HEAVY_MODULES
+
+SCENARIOS = {
+    # Page d'accueil rendue par le harnais de test Streamlit (cotations désactivées : pas de réseau)
+    "home": """
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+at.run()
+assert not at.exception, at.exception
+""",
+    # Rapport quotidien sur des fichiers locaux
+    "cron": """
+import daily_report
+daily_report.main(["--offline", {data!r}, "--data-dir", {store!r}, "--output-dir", {out!r},
+                   "--no-archive", "--tickers-file", {tickers!r}])
+""",
+}
+
+
+def _write_fixtures(directory, n_tickers=20, n_bars=750):
+    """Fichiers Parquet synthétiques pour le rapport hors-ligne"""
+    os.makedirs(os.path.join(directory, "prices"), exist_ok=True)
+    tickers = [f"SYN{i:02d}" for i in range(n_tickers)]
+    for i, ticker in enumerate(tickers):
+        gbm_ohlcv(n_bars, freq="B", seed=i).to_parquet(os.path.join(directory, "prices", f"{ticker}.parquet"))
+    with open(os.path.join(directory, "tickers.txt"), "w") as f:
+        f.write("\n".join(tickers))
+
+
+def run_scenario(name, workdir, eager=False):
+    """Un démarrage dans un nouveau processus -> {seconds, rss_mb, heavy}"""
+    code = SCENARIOS[name].format(
+        data=os.path.join(workdir, "prices"), store=os.path.join(workdir, "store"),
+        out=os.path.join(workdir, "out"), tickers=os.path.join(workdir, "tickers.txt"),
+    )
+    env = dict(
+        os.environ, QUANT_LIVE_SYMBOLS="", QUANT_DATA_DIR=os.path.join(workdir, "app_data"),
+        QUANT_REPORT_DB=os.path.join(workdir, "reports.db"), PYTHONDONTWRITEBYTECODE="1",
+    )
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", (EAGER_IMPORTS if eager else "") + code + _REPORT],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Échec du scénario {name} :\n{proc.stderr[-2000:]}")
+    return {"seconds": seconds, **json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--eager", action="store_true", help="Mesurer aussi avec les imports lourds au démarrage")
+    parser.add_argument("--output", help="Enregistrer les mesures en JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        _write_fixtures(workdir)
+        print(f"{'scénario':<16}{'temps médian (s)':>18}{'RSS max (Mo)':>15}  modules lourds")
+        for name in args.scenarios:
+            for eager in ([False, True] if args.eager else [False]):
+                runs = [run_scenario(name, workdir, eager) for _ in range(args.repeat)]
+                label = name + (" (eager)" if eager else "")
+                result = {
+                    "scenario": label,
+                    "seconds": statistics.median(r["seconds"] for r in runs),
+                    "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+                    "heavy": runs[-1]["heavy"],
+                }
+                results.append(result)
+                print(f"{label:<16}{result['seconds']:>18.2f}{result['rss_mb']:>15.0f}  {', '.join(result['heavy']) or '-'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
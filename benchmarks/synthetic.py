@@ -0,0 +1,50 @@
+"""Données de marché synthétiques et déterministes (mouvement brownien géométrique) pour les benchmarks.
+
+Exemple : gbm_ohlcv(100_000, seed=1) ; gbm_close(1000, n_assets=50)
+"""
+import numpy as np
+import pandas as pd
+
+ANNUAL_DRIFT = 0.05
+ANNUAL_VOL = 0.20
+
+
+def _index(n_bars, freq, start):
+    return pd.date_range(start, periods=n_bars, freq=freq, name="Date")
+
+
+def gbm_paths(n_bars, n_assets=1, drift=ANNUAL_DRIFT, vol=ANNUAL_VOL, periods_per_year=252, s0=100.0, seed=42):
+    """Trajectoires de prix (n_bars x n_assets) ; même graine -> mêmes prix"""
+    rng = np.random.default_rng(seed)
+    dt = 1 / periods_per_year
+    # Volatilités légèrement différentes par actif et un facteur commun (corrélations non nulles)
+    vols = vol * rng.uniform(0.5, 1.5, n_assets)
+    common = rng.standard_normal((n_bars, 1))
+    shocks = 0.5 * common + np.sqrt(0.75) * rng.standard_normal((n_bars, n_assets))
+    log_returns = (drift - vols ** 2 / 2) * dt + vols * np.sqrt(dt) * shocks
+    log_returns[0] = 0.0
+    return s0 * np.exp(np.cumsum(log_returns, axis=0))
+
+
+def gbm_close(n_bars, n_assets=2, freq="h", start="2000-01-03", seed=42, **kwargs):
+    """Clôtures de plusieurs actifs (colonnes ASSET000...), comme MarketDataStore.get_close"""
+    paths = gbm_paths(n_bars, n_assets, seed=seed, **kwargs)
+    columns = [f"ASSET{i:03d}" for i in range(n_assets)]
+    return pd.DataFrame(paths, index=_index(n_bars, freq, start), columns=columns)
+
+
+def gbm_ohlcv(n_bars, freq="h", start="2000-01-03", seed=42, **kwargs):
+    """Série OHLCV d'un actif au format du store (colonnes Open/High/Low/Close/Volume, index 'Date')"""
+    close = gbm_paths(n_bars, 1, seed=seed, **kwargs)[:, 0]
+    rng = np.random.default_rng(seed + 1)
+    open_ = np.empty(n_bars)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * np.exp(rng.normal(0, 0.002, n_bars - 1))  # Petit écart d'ouverture
+    spread = np.abs(rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(12, 0.5, n_bars).round()
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=_index(n_bars, freq, start),
+    )
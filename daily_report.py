@@ -1,34 +1,87 @@
-import yfinance as yf
+import argparse
+import os
 from datetime import datetime
 
-def generate_report():
-    ticker = "BTC-USD"
-    data = yf.Ticker(ticker)
-    hist = data.history(period="1d")
-    
-    if not hist.empty:
-        open_price = hist['Open'].iloc[0]
-        close_price = hist['Close'].iloc[0]
-        # Calcul de la volatilité simple (High - Low)
-        volatility = hist['High'].iloc[0] - hist['Low'].iloc[0]
-        
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"rapport_{date_str}.txt"
-        
-        content = f"""RAPPORT QUOTIDIEN - {date_str}
--------------------------------
-Actif         : {ticker}
-Ouverture     : {open_price:.2f} $
-Clôture       : {close_price:.2f} $
-Volatilité    : {volatility:.2f} $
--------------------------------
-Généré automatiquement par Cron.
-"""
-        with open(filename, "w") as f:
-            f.write(content)
-        print(f"✅ Rapport généré : {filename}")
-    else:
+from modules.batch import read_tickers
+from modules import profiling
+from modules.market_data import get_store, open_store
+from modules.report import build_report, format_summary, write_table
+from modules.report_store import DEFAULT_COMPACT_DAYS, DEFAULT_KEEP_DAYS, DEFAULT_REPORT_DB, ReportStore
+
+DEFAULT_WATCHLIST = "watchlist.txt"
+
+
+def generate_report(tickers=None, store=None, output_dir=None, fmt="csv", period="2y", date_str=None,
+                    db=DEFAULT_REPORT_DB, keep_days=DEFAULT_KEEP_DAYS, compact_days=DEFAULT_COMPACT_DAYS):
+    """Rapport du jour archivé dans `db` (rétention appliquée) ; rapport_DATE.<fmt> + .txt seulement dans `output_dir`"""
+    if tickers is None:
+        tickers = read_tickers(DEFAULT_WATCHLIST) if os.path.exists(DEFAULT_WATCHLIST) else ["BTC-USD"]
+    store = get_store() if store is None else store
+    date_str = datetime.now().strftime("%Y-%m-%d") if date_str is None else date_str
+    if output_dir is None and db is None:
+        output_dir = "."  # Sans archive, les fichiers sont la seule sortie
+    work_dir = output_dir if output_dir is not None else (os.path.dirname(db) or ".")
+    os.makedirs(work_dir, exist_ok=True)
+
+    # Fichier partiel : relancer le script après une interruption reprend les symboles restants
+    partial = os.path.join(work_dir, f".rapport_{date_str}.partial.jsonl")
+    table = build_report(tickers, store, partial, period)
+    if table["error"].notna().all():
         print("❌ Erreur : Impossible de récupérer les données.")
+        return None
+
+    summary = format_summary(table, date_str)
+    outputs = []
+    if output_dir is not None:
+        structured = os.path.join(output_dir, f"rapport_{date_str}.{fmt}")
+        write_table(table, structured)
+        filename = os.path.join(output_dir, f"rapport_{date_str}.txt")
+        with open(filename, "w") as f:
+            f.write(summary)
+        outputs += [filename, structured]
+    if db is not None:
+        archive = ReportStore(db)
+        archive.add_report(date_str, table, summary)
+        deleted, compacted = archive.prune(keep_days, compact_days)
+        outputs.append(f"{db} ({deleted} supprimés, {compacted} compactés)")
+    os.remove(partial)
+    print(f"✅ Rapport généré : {' + '.join(outputs)} ({len(table)} symboles)")
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rapport quotidien de la watchlist (cron)")
+    parser.add_argument("tickers", nargs="*", help="Symboles (défaut : watchlist.txt, sinon BTC-USD)")
+    parser.add_argument("--tickers-file", help="Fichier texte avec un symbole par ligne")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet", "json"], help="Format du rapport structuré")
+    parser.add_argument("--output-dir", help="Écrire aussi rapport_DATE.<format> et .txt dans ce dossier (défaut : archive seule, dossier courant avec --no-archive)")
+    parser.add_argument("--period", default="2y", help="Historique utilisé pour les signaux et le risque")
+    parser.add_argument("--date", help="Date du rapport (défaut : aujourd'hui)")
+    parser.add_argument("--db", default=DEFAULT_REPORT_DB, help="Archive SQLite des rapports")
+    parser.add_argument("--no-archive", action="store_true", help="Ne pas ajouter le rapport à l'archive")
+    parser.add_argument("--keep-days", type=int, default=DEFAULT_KEEP_DAYS, help="Supprimer de l'archive les rapports de plus de N jours")
+    parser.add_argument("--compact-days", type=int, default=DEFAULT_COMPACT_DAYS, help="Ne garder que les chiffres des rapports de plus de N jours")
+    parser.add_argument("--data-dir", help="Dossier du store local (défaut : data/)")
+    parser.add_argument("--offline", metavar="DIR", help="Lire les prix depuis un dossier de fichiers CSV/Parquet (store temporaire sans --data-dir)")
+    parser.add_argument("--profile", metavar="JSON", help="Temps par étape + trace Chrome (chrome://tracing) dans ce fichier")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        tickers += read_tickers(args.tickers_file)
+
+    store = open_store(args.data_dir, args.offline)
+
+    if args.profile:
+        profiling.start()
+    generate_report(tickers or None, store, args.output_dir, args.format, args.period, args.date,
+                    None if args.no_archive else args.db, args.keep_days, args.compact_days)
+    if args.profile:
+        trace = profiling.stop()
+        trace.save_chrome(args.profile)
+        print(trace.breakdown().to_string(index=False, float_format="%.1f"))
+        print(f"⏱ Trace : {args.profile}")
+
 
 if __name__ == "__main__":
-    generate_report()
\ No newline at end of file
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import glob
+import os
+
+from modules.report_store import DEFAULT_REPORT_DB, ReportStore, parse_text_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importe les rapport_*.txt dans l'archive SQLite et applique la rétention")
+    parser.add_argument("paths", nargs="*", default=["."], help="Fichiers ou dossiers contenant des rapport_*.txt")
+    parser.add_argument("--db", default=DEFAULT_REPORT_DB, help="Fichier SQLite de l'archive")
+    parser.add_argument("--remove", action="store_true", help="Supprimer les fichiers une fois importés")
+    parser.add_argument("--keep-days", type=int, help="Supprimer les rapports de plus de N jours")
+    parser.add_argument("--compact-days", type=int, help="Ne garder que les chiffres des rapports de plus de N jours")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files += sorted(glob.glob(os.path.join(path, "rapport_*.txt"))) if os.path.isdir(path) else [path]
+
+    store = ReportStore(args.db)
+    imported = 0
+    for path in files:
+        try:
+            date_str, table = parse_text_report(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path} ignoré : {e}")
+            continue
+        with open(path, "r") as f:
+            store.add_report(date_str, table, f.read())
+        imported += 1
+        if args.remove:
+            base = path[:-len(".txt")]
+            for ext in (".txt", ".csv", ".parquet", ".json"):
+                if os.path.exists(base + ext):
+                    os.remove(base + ext)
+
+    deleted, compacted = store.prune(args.keep_days, args.compact_days)
+    print(f"✅ {imported} rapports importés dans {args.db} ({deleted} supprimés, {compacted} compactés)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from modules.execution import ExecutionModel, execution_metrics
+from modules.expressions import compile_expression
+from modules.profiling import span, timed
+
+
+# --- MÉTRIQUES ---
+def calculate_metrics(daily_returns, periods_per_year=252):
+    """Calcule le Sharpe Ratio et le Max Drawdown"""
+    # Les NaN (1re ligne des rendements) sont ignorés, comme avec pandas
+    returns = np.asarray(daily_returns, dtype="float64")
+    returns = returns[~np.isnan(returns)]
+    if len(returns) < 2:
+        return 0, 0.0
+
+    # Sharpe (Hypothèse: 252 jours de trading, taux sans risque ~0 pour simplifier)
+    std = returns.std(ddof=1)
+    if std == 0:
+        sharpe = 0
+    else:
+        sharpe = (returns.mean() / std) * np.sqrt(periods_per_year)
+
+    # Max Drawdown
+    cumulative = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(cumulative)
+    drawdown = (cumulative - peak) / peak
+    max_drawdown = drawdown.min() * 100 # En pourcentage
+
+    return sharpe, max_drawdown
+
+
+# --- STRATÉGIES (indicateurs + signaux, sans affichage) ---
+# Chaque stratégie est une expression (modules.expressions) : `expression` donne la condition d'achat,
+# `outputs` les séries affichées ; les paramètres de la dataclass sont les noms utilisables dans le texte.
+class _Expression:
+    expression = "true"
+    outputs = {}
+
+    def compute(self, close):
+        return compile_expression(self.expression, self.outputs, **asdict(self)).evaluate(close)
+
+
+@dataclass
+class GoldenCross(_Expression):
+    """ACHAT si Moyenne Courte > Moyenne Longue"""
+    short_window: int = 20
+    long_window: int = 50
+    name = "golden_cross"
+    expression = "sma(close, short_window) > sma(close, long_window)"
+    outputs = {"SMA_Short": "sma(close, short_window)", "SMA_Long": "sma(close, long_window)"}
+
+
+@dataclass
+class RSIStrategy(_Expression):
+    """Investi tant que le RSI reste sous le seuil de surachat"""
+    rsi_period: int = 14
+    overbought: float = 70
+    oversold: float = 30
+    smoothing: str = "simple"  # 'simple' (moyennes mobiles) ou 'wilder'
+    name = "rsi"
+    expression = "rsi(close, rsi_period, smoothing) < overbought" # Simplifié
+    outputs = {"RSI": "rsi(close, rsi_period, smoothing)"}
+
+
+@dataclass
+class BollingerBands(_Expression):
+    """Investi tant que le prix reste au-dessus de la bande basse"""
+    window: int = 20
+    std_dev: float = 2.0
+    name = "bollinger"
+    expression = "close > bb_lower(close, window, std_dev)"
+    outputs = {"Upper": "bb_upper(close, window, std_dev)", "Lower": "bb_lower(close, window, std_dev)"}
+
+
+@dataclass
+class BuyAndHold(_Expression):
+    """Toujours investi (référence)"""
+    name = "buy_hold"
+
+
+@dataclass
+class ExpressionStrategy:
+    """Condition libre, ex. 'sma(close, 20) > sma(close, 50) and rsi(close, 14) < 70'"""
+    expression: str = "sma(close, 20) > sma(close, 50) and rsi(close, 14) < 70"
+    name = "expression"
+
+    def compute(self, close):
+        return compile_expression(self.expression).evaluate(close)
+
+
+STRATEGIES = {
+    "golden_cross": GoldenCross,
+    "rsi": RSIStrategy,
+    "bollinger": BollingerBands,
+    "buy_hold": BuyAndHold,
+    "expression": ExpressionStrategy,
+}
+
+
+def make_strategy(name, **params):
+    """Instancie une stratégie à partir de son nom (ex: make_strategy('rsi', rsi_period=10))"""
+    if name not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue : {name} (choix : {', '.join(STRATEGIES)})")
+    return STRATEGIES[name](**params)
+
+
+# --- BACKTEST ---
+@dataclass
+class BacktestResult:
+    market_returns: np.ndarray
+    strategy_returns: np.ndarray
+    equity: np.ndarray
+    buy_hold: np.ndarray
+    metrics: dict
+    position: np.ndarray = None   # Exposition détenue pendant chaque barre
+    traded: np.ndarray = None     # Montant échangé (fraction du capital) à la clôture précédente
+    costs: np.ndarray = None      # Frais payés ($)
+
+
+@timed("backtest")
+def backtest(prices, signals, capital=10000, periods_per_year=252, execution=None):
+    """Backtest : le signal de la veille décide de l'exposition du jour (tout-ou-rien et sans frais par défaut)"""
+    prices = np.asarray(prices, dtype="float64")
+    signals = np.asarray(signals, dtype="float64")
+    execution = ExecutionModel() if execution is None else execution
+
+    market_returns = np.full(len(prices), np.nan)
+    market_returns[1:] = prices[1:] / prices[:-1] - 1
+    strategy_returns, equity, position, traded, costs = execution.run(market_returns, signals, capital, periods_per_year)
+    gross_final = capital * np.nancumprod(1 + market_returns * position)[-1]
+    buy_hold = capital * np.nancumprod(1 + market_returns)
+
+    with span("metrics"):
+        sharpe, max_drawdown = calculate_metrics(strategy_returns, periods_per_year)
+        bh_sharpe, bh_max_drawdown = calculate_metrics(market_returns, periods_per_year)
+    return_pct = (equity[-1] - capital) / capital * 100
+    bh_return_pct = (buy_hold[-1] - capital) / capital * 100
+
+    metrics = {
+        "final_value": equity[-1],
+        "return_pct": return_pct,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "bh_final_value": buy_hold[-1],
+        "bh_return_pct": bh_return_pct,
+        "bh_sharpe": bh_sharpe,
+        "bh_max_drawdown": bh_max_drawdown,
+        "alpha": return_pct - bh_return_pct,
+        **execution_metrics(traded, costs, gross_final, equity[-1], capital, periods_per_year),
+    }
+    return BacktestResult(market_returns, strategy_returns, equity, buy_hold, metrics, position, traded, costs)
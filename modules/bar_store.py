@@ -0,0 +1,239 @@
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from modules.profiling import timed
+
+try:
+    import fcntl  # Verrou entre processus (absent sous Windows : seul le renommage protège alors les lecteurs)
+except ImportError:
+    fcntl = None
+
+# Stockage en colonnes des barres intraday : un fichier binaire brut par colonne (timestamp int64 en ns,
+# prix et volume float32) dans <root>/<intervalle>/<symbole>/. Les lectures ouvrent les fichiers en
+# memmap et ne renvoient que la plage demandée (recherche dichotomique sur les dates) : seule cette plage
+# est ensuite copiée, par to_frame() puis en float64 par les indicateurs. Les écritures sont exclusives
+# (verrou par symbole) ; les nouvelles barres sont ajoutées en fin de fichier, et une barre déjà stockée
+# n'est jamais modifiée en place (nouveaux fichiers puis renommage) : un lecteur ne voit pas d'écriture partielle.
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+COLUMN_DTYPES = {"timestamp": np.dtype("int64"), **{c: np.dtype("float32") for c in PRICE_COLUMNS}}
+RESAMPLE_CHUNK = 2_000_000  # Barres fines lues par bloc pendant l'agrégation
+PPY_SAMPLE = 100_000        # Dernières barres utilisées pour estimer le nombre de barres par an
+
+_INTERVAL_RE = re.compile(r"^(\d+)(m|h|d)$")
+_UNIT_NS = {"m": 60 * 10**9, "h": 3600 * 10**9, "d": 86400 * 10**9}
+DAY_NS = _UNIT_NS["d"]
+
+
+# --- INTERVALLES ---
+def interval_ns(interval):
+    """Durée d'une barre en nanosecondes ('1m', '15m', '1h', '60m', '1d'...)"""
+    match = _INTERVAL_RE.match(interval)
+    if match is None:
+        raise ValueError(f"Intervalle non pris en charge : {interval} (minutes, heures ou jours)")
+    return int(match.group(1)) * _UNIT_NS[match.group(2)]
+
+
+def is_intraday(interval):
+    """Vrai pour les barres de moins d'un jour"""
+    match = _INTERVAL_RE.match(interval)
+    return match is not None and match.group(2) != "d"
+
+
+def periods_per_year(index, interval="1d"):
+    """Barres par an : 252 en journalier, sinon barres par jour observées x jours de cotation (252, ou 365 avec week-ends)"""
+    if not is_intraday(interval) or len(index) == 0:
+        return 252
+    ts = np.asarray(index[-PPY_SAMPLE:], dtype="datetime64[ns]").view("int64")
+    days = ts // DAY_NS
+    # Médiane des barres par jour : les journées partielles (début et fin d'échantillon) ne biaisent pas l'estimation
+    bars_per_day = np.median(np.diff(np.concatenate([[0], np.flatnonzero(np.diff(days)) + 1, [len(days)]])))
+    trades_weekends = ((days + 3) % 7 >= 5).any()  # Le 1er janvier 1970 est un jeudi
+    return round(bars_per_day * (365 if trades_weekends else 252))
+
+
+def _ns(date):
+    return pd.Timestamp(date).value
+
+
+# --- CONVERSIONS ---
+def empty_bars(columns=PRICE_COLUMNS):
+    return {name: np.empty(0, dtype=COLUMN_DTYPES[name]) for name in ["timestamp", *columns]}
+
+
+def from_frame(df):
+    """DataFrame OHLCV (index de dates) -> colonnes aux types du stockage"""
+    bars = {"timestamp": np.asarray(pd.DatetimeIndex(df.index), dtype="datetime64[ns]").view("int64")}
+    for name in PRICE_COLUMNS:
+        values = df[name].to_numpy() if name in df.columns else np.full(len(df), np.nan)
+        bars[name] = values.astype(COLUMN_DTYPES[name])
+    return bars
+
+
+def to_frame(bars):
+    """Colonnes -> DataFrame OHLCV indexé par 'Date' (copie de la plage, en float32)"""
+    index = pd.DatetimeIndex(np.asarray(bars["timestamp"]).view("datetime64[ns]"), name="Date")
+    return pd.DataFrame({name: bars[name] for name in bars if name != "timestamp"}, index=index)
+
+
+# --- AGRÉGATION ---
+def resample(bars, interval, chunk_rows=RESAMPLE_CHUNK):
+    """Barres plus longues (premier / max / min / dernier / somme), calculées bloc par bloc sur les colonnes fines"""
+    step = interval_ns(interval)
+    ts = bars["timestamp"]
+    n = len(ts)
+    parts = {name: [] for name in bars}
+    start = 0
+    while start < n:
+        stop = min(start + chunk_rows, n)
+        if stop < n:
+            # Fin de bloc sur une frontière de barre agrégée (une barre n'est jamais coupée en deux)
+            boundary = ts[stop] // step * step
+            cut = int(np.searchsorted(ts[start:stop], boundary))
+            stop = start + cut if cut else int(np.searchsorted(ts, ts[start] // step * step + step))
+        bucket = np.asarray(ts[start:stop]) // step
+        firsts = np.concatenate([[0], np.flatnonzero(np.diff(bucket)) + 1])
+        lasts = np.append(firsts[1:], len(bucket)) - 1
+        parts["timestamp"].append(bucket[firsts] * step)
+        for name in bars:
+            if name == "timestamp":
+                continue
+            values = bars[name][start:stop]
+            if name == "Open":
+                parts[name].append(np.asarray(values[firsts]))
+            elif name == "Close":
+                parts[name].append(np.asarray(values[lasts]))
+            elif name == "High":
+                parts[name].append(np.fmax.reduceat(values, firsts))
+            elif name == "Low":
+                parts[name].append(np.fmin.reduceat(values, firsts))
+            else:
+                parts[name].append(np.add.reduceat(np.nan_to_num(values), firsts, dtype="float64").astype(values.dtype))
+        start = stop
+    if n == 0:
+        return {name: np.empty(0, dtype=COLUMN_DTYPES.get(name, "float32")) for name in bars}
+    return {name: np.concatenate(chunks) for name, chunks in parts.items()}
+
+
+# --- STOCKAGE ---
+class BarStore:
+    """Colonnes de barres sur disque, lues en memmap (un dossier par symbole et intervalle)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _dir(self, ticker, interval):
+        from modules.market_data import safe_name  # Import local : market_data importe ce module
+        return os.path.join(self.root, interval, safe_name(ticker))
+
+    def _file(self, directory, name):
+        return os.path.join(directory, name + ".bin")
+
+    def length(self, ticker, interval):
+        """Barres complètes stockées (la plus courte des colonnes : le timestamp est écrit en dernier)"""
+        directory = self._dir(ticker, interval)
+        sizes = []
+        for name, dtype in COLUMN_DTYPES.items():
+            path = self._file(directory, name)
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // dtype.itemsize)
+        return min(sizes)
+
+    def _column(self, directory, name, n):
+        return np.memmap(self._file(directory, name), dtype=COLUMN_DTYPES[name], mode="r", shape=(n,))
+
+    @timed("data.read_bars")
+    def read(self, ticker, interval, start=None, end=None, columns=PRICE_COLUMNS):
+        """Barres de [start, end] -> {'timestamp', colonnes...} : vues memmap, rien n'est lu hors de la plage"""
+        n = self.length(ticker, interval)
+        if n == 0:
+            return empty_bars(columns)
+        directory = self._dir(ticker, interval)
+        ts = self._column(directory, "timestamp", n)
+        lo = 0 if start is None else int(np.searchsorted(ts, _ns(start), side="left"))
+        hi = n if end is None else int(np.searchsorted(ts, _ns(end), side="right"))
+        bars = {"timestamp": ts[lo:hi]}
+        for name in columns:
+            bars[name] = self._column(directory, name, n)[lo:hi]
+        return bars
+
+    def last_timestamp(self, ticker, interval):
+        """Date de la dernière barre stockée (None si aucune)"""
+        n = self.length(ticker, interval)
+        if n == 0:
+            return None
+        return pd.Timestamp(int(self._column(self._dir(ticker, interval), "timestamp", n)[-1]))
+
+    @contextmanager
+    def _locked(self, directory):
+        """Un seul écrivain à la fois par symbole et intervalle (processus et threads)"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _replace(self, directory, bars):
+        # Fichier temporaire unique par colonne puis renommage ; le timestamp en dernier (voir length)
+        for name in [*PRICE_COLUMNS, "timestamp"]:
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(np.ascontiguousarray(bars[name], dtype=COLUMN_DTYPES[name]).tobytes())
+                os.replace(tmp, self._file(directory, name))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+
+    @timed("data.write_bars")
+    def write(self, ticker, interval, bars):
+        """Remplace toutes les barres (fichiers temporaires puis renommage : les lecteurs gardent l'ancienne version)"""
+        directory = self._dir(ticker, interval)
+        with self._locked(directory):
+            self._replace(directory, bars)
+
+    def append(self, ticker, interval, df):
+        """Ajoute un DataFrame OHLCV trié : les barres stockées à partir de sa première date sont remplacées"""
+        if df.empty:
+            return self.length(ticker, interval)
+        new = from_frame(df)
+        directory = self._dir(ticker, interval)
+        with self._locked(directory):
+            n = self.length(ticker, interval)
+            keep = n
+            if n:
+                ts = self._column(directory, "timestamp", n)
+                keep, last = int(np.searchsorted(ts, new["timestamp"][0], side="left")), int(ts[-1])
+                del ts
+                if keep + len(new["timestamp"]) < n or new["timestamp"][-1] < last:
+                    # Cas rare (trou comblé au milieu de l'historique) : fusion complète et réécriture
+                    merged = pd.concat([to_frame(self.read(ticker, interval)), df])
+                    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                    self._replace(directory, from_frame(merged))
+                    return len(merged)
+            if keep < n:
+                # Barres déjà stockées remplacées (dernière barre complétée) : nouvelles colonnes puis renommage
+                stored = self.read(ticker, interval)
+                self._replace(directory, {
+                    name: np.concatenate([stored[name][:keep], new[name]]) for name in ["timestamp", *PRICE_COLUMNS]
+                })
+                return keep + len(new["timestamp"])
+
+            # Ajout pur en fin de fichier : les barres existantes ne bougent pas, le timestamp est écrit en dernier
+            for name in [*PRICE_COLUMNS, "timestamp"]:
+                path = self._file(directory, name)
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    f.seek(n * COLUMN_DTYPES[name].itemsize)
+                    f.write(new[name].tobytes())
+            return n + len(new["timestamp"])
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+
+import numpy as np
+
+from modules.backtest import backtest
+
+# Colonnes fixes du fichier de résultats (écrit au fil de l'eau)
+RESULT_COLUMNS = [
+    "ticker", "strategy", "params", "bars", "start", "end", "signal",
+    "final_value", "return_pct", "sharpe", "max_drawdown",
+    "bh_final_value", "bh_return_pct", "bh_sharpe", "bh_max_drawdown", "alpha",
+    "n_trades", "turnover", "total_costs", "cost_drag", "error",
+]
+
+
+# --- BACKTEST PAR LOT (sans affichage) ---
+def _backtest_row(ticker, close, start, end, strategy, capital, execution=None):
+    """Backtest d'une série de clôtures -> une ligne de résultats"""
+    row = {"ticker": ticker, "strategy": strategy.name, "params": json.dumps(asdict(strategy))}
+    signals, _ = strategy.compute(close)
+    result = backtest(close, signals, capital, execution=execution)
+    row.update(
+        bars=len(close),
+        start=start,
+        end=end,
+        signal=int(signals[-1]),
+        **{k: float(v) for k, v in result.metrics.items()},
+    )
+    return row
+
+
+def backtest_ticker(store, ticker, strategy, period="2y", capital=10000, execution=None):
+    """Backtest d'un symbole lu depuis le store -> une ligne de résultats"""
+    data = store.get_history(ticker, period=period)
+    if data.empty:
+        return {"ticker": ticker, "strategy": strategy.name, "error": "Aucune donnée"}
+    return _backtest_row(
+        ticker, data["Close"].values, str(data.index[0].date()), str(data.index[-1].date()), strategy, capital, execution
+    )
+
+
+def run_batch(tickers, strategies, store, period="2y", capital=10000, execution=None):
+    """Backtest en série d'une liste de symboles ; une erreur sur un symbole n'arrête pas le lot"""
+    rows = []
+    for ticker in tickers:
+        for strategy in strategies:
+            try:
+                rows.append(backtest_ticker(store, ticker, strategy, period, capital, execution))
+            except Exception as e:
+                rows.append({"ticker": ticker, "strategy": strategy.name, "error": str(e)})
+    return rows
+
+
+# --- EXÉCUTION PARALLÈLE (pool de processus + prix en mémoire partagée) ---
+def pack_prices(store, tickers, period, path):
+    """Concatène les clôtures de tous les symboles dans un seul .npy (lu en memmap par les workers)"""
+    layout, missing, arrays = [], [], []
+    offset = 0
+    for ticker in tickers:
+        try:
+            data = store.get_history(ticker, period=period)
+        except Exception as e:
+            missing.append((ticker, str(e)))
+            continue
+        if data.empty:
+            missing.append((ticker, "Aucune donnée"))
+            continue
+        close = data["Close"].to_numpy(dtype="float64")
+        arrays.append(close)
+        layout.append((ticker, offset, offset + len(close), str(data.index[0].date()), str(data.index[-1].date())))
+        offset += len(close)
+
+    prices = np.lib.format.open_memmap(path, mode="w+", dtype="float64", shape=(offset,))
+    for (_, start, stop, _, _), close in zip(layout, arrays):
+        prices[start:stop] = close
+    prices.flush()
+    del prices
+    return layout, missing
+
+
+_shared_prices = None
+
+
+def _init_worker(path):
+    """Chaque worker ouvre le fichier de prix une seule fois, en lecture seule (aucune copie picklée)"""
+    global _shared_prices
+    _shared_prices = np.load(path, mmap_mode="r")
+
+
+def _run_chunk(chunk, strategies, capital, execution=None):
+    rows = []
+    for ticker, start, stop, first_date, last_date in chunk:
+        close = _shared_prices[start:stop]
+        for strategy in strategies:
+            try:
+                rows.append(_backtest_row(ticker, close, first_date, last_date, strategy, capital, execution))
+            except Exception as e:
+                rows.append({"ticker": ticker, "strategy": strategy.name, "error": str(e)})
+    return rows
+
+
+def run_parallel(tickers, strategies, store, output, period="2y", capital=10000, workers=None, chunk_size=50,
+                 execution=None):
+    """Répartit les symboles sur un ProcessPoolExecutor et écrit chaque lot de résultats dès qu'il est prêt"""
+    count = 0
+    with tempfile.TemporaryDirectory() as tmp, ResultWriter(output) as writer:
+        path = os.path.join(tmp, "prices.npy")
+        layout, missing = pack_prices(store, tickers, period, path)
+        for ticker, error in missing:
+            for strategy in strategies:
+                writer.write({"ticker": ticker, "strategy": strategy.name, "error": error})
+                count += 1
+
+        chunks = [layout[i:i + chunk_size] for i in range(0, len(layout), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as executor:
+            futures = [executor.submit(_run_chunk, chunk, strategies, capital, execution) for chunk in chunks]
+            for future in as_completed(futures):
+                for row in future.result():
+                    writer.write(row)
+                    count += 1
+    return count
+
+
+# --- ÉCRITURE DES RÉSULTATS ---
+class ResultWriter:
+    """Écrit les lignes au fil de l'eau en CSV ou JSON Lines (.json : écrit à la fermeture)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+
+    def __enter__(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = None if self.path.endswith(".json") else open(self.path, "w", newline="")
+        if self.path.endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+            self.csv.writeheader()
+        return self
+
+    def write(self, row):
+        if self.file is None:
+            self.rows.append(row)
+            return
+        if self.path.endswith(".csv"):
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def __exit__(self, *exc):
+        if self.file is None:
+            with open(self.path, "w") as f:
+                json.dump(self.rows, f, indent=2)
+        else:
+            self.file.close()
+
+
+def write_results(rows, path):
+    """Écrit les résultats en CSV, JSON ou JSON Lines selon l'extension du fichier"""
+    with ResultWriter(path) as writer:
+        for row in rows:
+            writer.write(row)
+
+
+def read_tickers(path):
+    """Liste de symboles depuis un fichier texte (un par ligne, # pour les commentaires)"""
+    with open(path, "r") as f:
+        lines = (line.split("#")[0].strip() for line in f)
+        return [line for line in lines if line]
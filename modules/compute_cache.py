@@ -0,0 +1,334 @@
+import dataclasses
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from modules.profiling import span
+
+# Cache de calculs partagé par toutes les sessions du processus : clé = empreinte des données
+# + fonction (nom et code) + paramètres + version des sources de modules/, éviction LRU sous un
+# budget mémoire, copie optionnelle sur disque.
+# Les valeurs renvoyées sont partagées : les appelants ne doivent pas les modifier en place.
+
+DEFAULT_MAX_MB = int(os.environ.get("QUANT_CACHE_MB", "256"))
+DEFAULT_CACHE_DIR = os.environ.get("QUANT_CACHE_DIR")  # Persistance disque désactivée si absent
+DEFAULT_DISK_MB = int(os.environ.get("QUANT_CACHE_DISK_MB", "2048"))  # Budget des fichiers .pkl
+
+
+def _code_version():
+    """Empreinte des sources de modules/ : un déploiement qui change le code change toutes les clés"""
+    h = hashlib.blake2b(digest_size=8)
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".py"):
+            with open(os.path.join(folder, name), "rb") as f:
+                h.update(name.encode())
+                h.update(f.read())
+    return h.hexdigest()
+
+
+CODE_VERSION = _code_version()
+
+
+# --- EMPREINTES ---
+def _update(h, obj):
+    """Ajoute un objet (tableaux, DataFrames, dataclasses, conteneurs...) au hachage"""
+    if isinstance(obj, np.ndarray):
+        h.update(f"nd{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).view(np.uint8).data if obj.dtype != object else pickle.dumps(obj))
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(f"pd{type(obj).__name__}{obj.shape}".encode())
+        h.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().data)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Stratégies, ExecutionModel... : le type et les paramètres
+        h.update(type(obj).__qualname__.encode())
+        for field in dataclasses.fields(obj):
+            _update(h, getattr(obj, field.name))
+    elif obj is None or isinstance(obj, (str, int, float, bool, np.generic)):
+        h.update(f"{type(obj).__name__}:{obj!r}".encode())
+    elif isinstance(obj, (set, frozenset)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in sorted(obj, key=repr):  # Ordre d'itération variable d'un processus à l'autre
+            _update(h, item)
+    elif isinstance(obj, types.CodeType):
+        # Corps de la fonction : une modification du code change la clé
+        h.update(obj.co_code)
+        h.update(repr(obj.co_names).encode())
+        _update(h, obj.co_consts)  # Fonctions imbriquées (lambdas, compréhensions) comprises
+    elif callable(obj):
+        _update(h, getattr(obj, "__self__", None))  # Méthode liée : l'instance fait partie de la clé
+        h.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}".encode())
+        code = getattr(inspect.unwrap(obj), "__code__", None)  # Sous les décorateurs (@timed...)
+        if code is not None:
+            _update(h, code)
+    else:
+        h.update(pickle.dumps(obj))
+
+
+def fingerprint(*parts):
+    """Empreinte stable (hexadécimale) d'un ensemble de données et de paramètres"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(h, part)
+    return h.hexdigest()
+
+
+def _sizeof(obj):
+    """Estimation de la mémoire occupée par une valeur (octets)"""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_sizeof(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_sizeof(k) + _sizeof(v) for k, v in obj.items())
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return sum(_sizeof(getattr(obj, field.name)) for field in dataclasses.fields(obj))
+    if obj is None or isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+        return sys.getsizeof(obj)
+    try:
+        return len(pickle.dumps(obj))  # Modèles scikit-learn et autres objets
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+# --- CACHE ---
+class ComputeCache:
+    """LRU borné en mémoire, thread-safe (sessions Streamlit), avec copie disque optionnelle"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 2**20, cache_dir=DEFAULT_CACHE_DIR,
+                 max_disk_bytes=DEFAULT_DISK_MB * 2**20):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # clé -> (valeur, taille)
+        self.nbytes = 0
+        self.disk_bytes = 0
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+        self.recording = None  # Ensemble des clés utilisées, pendant record_keys()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _disk_files(self):
+        """Fichiers .pkl du dossier -> [(date de dernier accès, taille, chemin)]"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Supprimé entre-temps par un autre processus
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _load(self, key):
+        path = self._disk_path(key) if self.cache_dir else None
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # Date de modification = dernier accès : l'éviction disque est LRU
+            return value
+        except Exception:
+            return None  # Fichier corrompu, écrit par une autre version ou supprimé : on recalcule
+
+    def _save(self, key, value):
+        path = self._disk_path(key)
+        # Fichier temporaire unique : plusieurs processus peuvent écrire la même clé en même temps
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp)
+            try:
+                replaced = os.path.getsize(path)  # Clé réécrite : l'ancien fichier ne compte plus
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return  # La persistance est facultative (disque plein, objet non sérialisable...)
+        with self.lock:
+            self.disk_bytes += size - replaced
+            over_budget = self.disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprime les fichiers les moins récemment utilisés jusqu'à revenir sous le budget disque"""
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self.lock:
+            self.disk_bytes = total  # Recompté depuis le dossier (partagé avec d'autres processus)
+
+    def _insert(self, key, value):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return  # Trop gros pour le budget : jamais mis en cache
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def call(self, namespace, func, *args, **kwargs):
+        """func(*args, **kwargs) mémoïsé par (namespace, fonction, données, paramètres)"""
+        with span("cache.lookup"):
+            key = f"{namespace}-{fingerprint(CODE_VERSION, func, args, kwargs)}"
+        with self.lock:
+            if self.recording is not None:
+                self.recording.add(key)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+
+        value = self._load(key)
+        if value is not None:
+            with self.lock:
+                self.disk_hits += 1
+            self._insert(key, value)
+            return value
+
+        # Calcul hors verrou : deux sessions peuvent calculer la même clé, la dernière écriture gagne
+        with self.lock:
+            self.misses += 1
+        value = func(*args, **kwargs)
+        self._insert(key, value)
+        if self.cache_dir:
+            self._save(key, value)
+        return value
+
+    @contextmanager
+    def record_keys(self):
+        """Clés lues ou calculées dans le bloc (fichiers disque dont dépend une vue précalculée)"""
+        keys = set()
+        with self.lock:
+            self.recording = keys
+        try:
+            yield keys
+        finally:
+            with self.lock:
+                self.recording = None
+
+    def remove(self, keys):
+        """Supprime des clés de la mémoire et du disque -> nombre de fichiers supprimés"""
+        removed = 0
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.nbytes -= self.entries.pop(key)[1]
+        for key in keys:
+            if not self.cache_dir:
+                break
+            try:
+                size = os.path.getsize(self._disk_path(key))
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                continue
+            removed += 1
+            with self.lock:
+                self.disk_bytes -= size
+        return removed
+
+    def memoize(self, namespace):
+        """Décorateur : @cache.memoize('indicateurs')"""
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                return self.call(namespace, func, *args, **kwargs)
+            wrapper.__wrapped__ = func
+            wrapper.__name__, wrapper.__doc__ = func.__name__, func.__doc__
+            return wrapper
+        return decorator
+
+    def stats(self):
+        """Compteurs pour dimensionner le cache"""
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "mb": self.nbytes / 2**20,
+                "max_mb": self.max_bytes / 2**20,
+                "disk_mb": self.disk_bytes / 2**20,
+            }
+
+    def clear(self, disk=False):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+        if disk and self.cache_dir:
+            for _, _, path in self._disk_files():
+                os.remove(path)
+            with self.lock:
+                self.disk_bytes = 0
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Cache partagé par toutes les sessions du processus"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ComputeCache()
+    return _default_cache
+
+
+def set_cache(cache):
+    """Remplace le cache partagé (scripts : dossier de persistance choisi en ligne de commande)"""
+    global _default_cache
+    _default_cache = cache
+
+
+def cached(namespace, func, *args, **kwargs):
+    """Raccourci : get_cache().call(...)"""
+    return get_cache().call(namespace, func, *args, **kwargs)
@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+
+# Réduction des séries avant construction des graphiques : au plus `max_points` points par graphique
+# (LTTB par défaut, min/max par paquets en option), en gardant toujours les points marqués (achats /
+# ventes) pour que les marqueurs restent posés sur la courbe. Au-delà de WEBGL_THRESHOLD points
+# affichés, les courbes passent en Scattergl (rendu WebGL).
+
+CHART_POINTS = int(os.environ.get("QUANT_CHART_POINTS", "2000"))  # 0 = pas de réduction
+WEBGL_THRESHOLD = 5000
+
+
+# --- ALGORITHMES (renvoient des positions triées) ---
+def lttb(y, n_out):
+    """Largest-Triangle-Three-Buckets : garde le point qui forme le plus grand triangle avec ses voisins"""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Paquets des points intérieurs (le premier et le dernier point sont toujours gardés)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    x = np.arange(n, dtype="float64")
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # Le « paquet suivant » du dernier paquet est le dernier point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        xa, ya = x[a], y[a]
+        area = np.abs((xa - mean_x[i]) * (y[lo:hi] - ya) - (xa - x[lo:hi]) * (mean_y[i] - ya))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(y, n_out):
+    """Min et max de chaque paquet : conserve exactement l'enveloppe (pics, creux)"""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    n_buckets = max(1, n_out // 2)
+    if n_out >= n:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(blocks), axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    lows = offsets + np.nanargmin(blocks[valid], axis=1)
+    highs = offsets + np.nanargmax(blocks[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+# --- POINT D'ENTRÉE ---
+def downsample_indices(y, max_points=CHART_POINTS, method="lttb", keep=None):
+    """Positions à afficher pour une série (NaN ignorés, positions `keep` toujours incluses)"""
+    y = np.asarray(y, dtype="float64")
+    if not max_points or len(y) <= max_points:
+        return np.arange(len(y))
+    valid = np.flatnonzero(~np.isnan(y))
+    picked = valid[METHODS[method](y[valid], max_points)]
+    if keep is not None and len(keep):
+        picked = np.union1d(picked, np.asarray(keep, dtype=np.int64))
+    return picked
+
+
+def shared_indices(series, max_points=CHART_POINTS, method="lttb", keep=None):
+    """Positions communes à plusieurs séries d'un même graphique (budget partagé entre les séries)"""
+    series = [np.asarray(s, dtype="float64") for s in series]
+    if not max_points or len(series[0]) <= max_points:
+        return np.arange(len(series[0]))
+    budget = max(3, max_points // len(series))
+    picked = [downsample_indices(s, budget, method) for s in series]
+    if keep is not None:
+        picked.append(np.asarray(keep, dtype=np.int64))
+    return np.unique(np.concatenate(picked))
+
+
+def scatter(x, y, **kwargs):
+    """go.Scatter, ou go.Scattergl au-delà de WEBGL_THRESHOLD points"""
+    import plotly.graph_objects as go  # Import différé : ce module est aussi chargé par la page d'accueil
+    trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, **kwargs)
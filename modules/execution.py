@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules import indicators
+
+# Modèle d'exécution : frais proportionnels (commission + slippage en points de base), frais fixes
+# par ordre et taille de position fractionnaire (ciblage de volatilité). Tout est vectorisé sur le
+# tableau de signaux (1-D, ou 2-D temps x combinaisons pour les grid search).
+# Convention du backtest : l'exposition décidée à la clôture t-1 est détenue pendant la barre t.
+
+
+@dataclass
+class ExecutionModel:
+    commission_bps: float = 0.0   # Commission, en bps du montant échangé
+    slippage_bps: float = 0.0     # Glissement de prix, en bps du montant échangé
+    fixed_fee: float = 0.0        # Frais fixes par ordre ($)
+    target_vol: float = None      # Volatilité annualisée visée (None = position pleine 0/1)
+    vol_window: int = 20          # Fenêtre de la volatilité réalisée
+    max_leverage: float = 1.0     # Exposition maximale avec le ciblage de volatilité
+    rebalance: str = "entry"      # 'entry' : taille fixée à l'entrée ; 'daily' : réajustée chaque jour
+
+    @property
+    def cost_rate(self):
+        return (self.commission_bps + self.slippage_bps) / 10_000
+
+    def exposure(self, signals, market_returns, periods_per_year=252):
+        """Exposition cible (fraction du capital) à chaque clôture"""
+        signals = np.asarray(signals, dtype="float64")
+        if self.target_vol is None:
+            return signals
+        # Volatilité réalisée connue à la clôture t (rendements jusqu'à t inclus)
+        vol = indicators.rolling_std(np.nan_to_num(market_returns), self.vol_window) * np.sqrt(periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            size = np.minimum(self.target_vol / vol, self.max_leverage)  # NaN tant que la vol n'est pas définie
+        defined = ~np.isnan(size)
+        size = np.nan_to_num(size)
+        # Taille 1-D (un actif) diffusée sur les colonnes de signaux, ou 2-D (un actif par colonne)
+        if size.ndim < signals.ndim:
+            size, defined = size[:, None], defined[:, None]
+        if self.rebalance == "daily":
+            return signals * size
+        if self.rebalance != "entry":
+            raise ValueError(f"Mode de rééquilibrage inconnu : {self.rebalance}")
+
+        # Taille de la dernière entrée en position, propagée tant que le signal reste actif. Une position
+        # ouverte pendant le préchauffage de la vol est dimensionnée à la 1re clôture où la vol est connue
+        previous = np.zeros_like(signals)
+        previous[1:] = signals[:-1]
+        warmed_up = np.zeros(np.broadcast_shapes(defined.shape, signals.shape), dtype=bool)
+        warmed_up[1:] = defined[1:] & ~defined[:-1]
+        entries = (signals > 0) & ((previous <= 0) | warmed_up)
+        steps = np.arange(len(signals)).reshape((-1,) + (1,) * (signals.ndim - 1))
+        last_entry = np.maximum.accumulate(np.where(entries, steps, 0), axis=0)
+        if size.ndim == 2:
+            return signals * np.take_along_axis(np.broadcast_to(size, signals.shape), last_entry, axis=0)
+        return signals * size[last_entry]
+
+    def _holdings(self, target):
+        """Position détenue pendant t (décidée en t-1) et montant échangé à la clôture t-1"""
+        position = np.empty(target.shape)
+        position[0] = np.nan
+        position[1:] = target[:-1]
+        traded = np.zeros(target.shape)
+        if len(target) > 1:
+            traded[1] = np.abs(target[0])
+            np.subtract(target[1:-1], target[:-2], out=traded[2:])
+            np.abs(traded[2:], out=traded[2:])
+        return position, traded
+
+    def _net(self, market_returns, position, traded, capital):
+        """Rendements nets de frais -> (rendements, capital si frais fixes sinon None)"""
+        if market_returns.ndim < position.ndim:
+            market_returns = market_returns[:, None]
+        net = market_returns * position
+        if self.cost_rate:
+            net -= self.cost_rate * traded
+        if not self.fixed_fee:
+            return net, None
+        # E_t = a_t E_(t-1) - b_t  =>  E_t = G_t (E_0 - somme b_s / G_s), G = produit cumulé des a
+        cumulative = np.cumprod(1 + np.nan_to_num(net), axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            equity = cumulative * (capital - np.cumsum(self.fixed_fee * (traded > 0) / cumulative, axis=0))
+            net[1:] = equity[1:] / equity[:-1] - 1
+        return net, equity
+
+    def net_returns(self, market_returns, signals, capital=10000, periods_per_year=252):
+        """Rendements nets seuls (chemin rapide des grid search, signaux 1-D ou 2-D)"""
+        market_returns = np.asarray(market_returns, dtype="float64")
+        target = self.exposure(signals, market_returns, periods_per_year)
+        return self._net(market_returns, *self._holdings(target), capital)[0]
+
+    def run(self, market_returns, signals, capital=10000, periods_per_year=252):
+        """Rendements nets, capital, exposition détenue, rotation et frais ($) de chaque barre"""
+        market_returns = np.asarray(market_returns, dtype="float64")
+        target = self.exposure(signals, market_returns, periods_per_year)
+        position, traded = self._holdings(target)
+        net, equity = self._net(market_returns, position, traded, capital)
+        if equity is None:
+            equity = capital * np.nancumprod(1 + net, axis=0)
+
+        previous = np.empty_like(equity)
+        previous[0] = capital
+        previous[1:] = equity[:-1]
+        costs = previous * self.cost_rate * traded + self.fixed_fee * (traded > 0)
+        return net, equity, position, traded, costs
+
+
+def execution_metrics(traded, costs, gross_final, net_final, capital=10000, periods_per_year=252):
+    """Nombre d'ordres, rotation annualisée (x capital) et coût total (en points de rendement)"""
+    years = max(len(traded) - 1, 1) / periods_per_year
+    return {
+        "n_trades": int(np.count_nonzero(traded)),
+        "turnover": float(np.sum(traded) / years),
+        "total_costs": float(np.sum(costs)),
+        "cost_drag": float((gross_final - net_final) / capital * 100),
+    }
+
+
+def trade_ledger(result, prices, index=None):
+    """Journal des ordres d'un BacktestResult : date, sens, exposition avant / après, montant, frais"""
+    prices = np.asarray(prices, dtype="float64")
+    index = pd.RangeIndex(len(prices)) if index is None else index
+    executed = np.flatnonzero(result.traded) - 1  # Ordre passé à la clôture de la barre précédente
+    before = np.nan_to_num(result.position[executed])
+    after = result.position[executed + 1]
+    return pd.DataFrame({
+        "Date": index[executed],
+        "Sens": np.where(after > before, "Achat", "Vente"),
+        "Exposition avant": before,
+        "Exposition après": after,
+        "Prix": prices[executed],
+        "Montant ($)": result.equity[executed] * result.traded[executed + 1],
+        "Frais ($)": result.costs[executed + 1],
+    })
@@ -0,0 +1,388 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from modules import indicators
+
+# Langage de stratégies : une condition sur les clôtures, ex. "sma(close, 20) > sma(close, 50) and rsi(close, 14) < 70".
+# Le texte est analysé une fois (compile_expression, mis en cache) en un graphe d'opérations où chaque
+# sous-expression identique n'apparaît qu'une fois (la même moyenne mobile utilisée deux fois est calculée
+# une fois). L'évaluation parcourt le graphe dans l'ordre et écrit chaque résultat dans un tampon préalloué
+# (argument `out` de modules.indicators et des ufuncs NumPy) ; un tampon est réutilisé dès que son
+# dernier consommateur a été calculé. Les clôtures peuvent être 1-D ou 2-D (un actif par colonne).
+#
+#   Valeurs      close, nombres, paramètres nommés, x[n] (valeur n barres avant)
+#   Indicateurs  sma(x, n), std(x, n), rsi(x, n[, "wilder"]), bb_mid / bb_upper / bb_lower(x, n, k),
+#                highest(x, n), lowest(x, n)
+#   Calcul       + - * /, comparaisons < <= > >= == !=
+#   Conditions   and, or, not, true, false, cross_above(a, b), cross_below(a, b)
+
+NUMBER, BOOL, TEXT = "nombre", "condition", "texte"
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+)|([A-Za-z_]\w*)|(\"[^\"]*\"|'[^']*')|(<=|>=|==|!=|[-+*/<>()\[\],]))")
+_COMPARISONS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal, "==": np.equal, "!=": np.not_equal}
+_ARITHMETIC = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+_LITERAL_OPS = {
+    "+": lambda a, b: a + b, "-": lambda a, b: a - b, "*": lambda a, b: a * b, "/": lambda a, b: a / b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b, ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b, "==": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+
+
+# --- ANALYSE ---
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f"Caractère inattendu à la position {pos} : {text[pos:pos + 10]!r}")
+        number, name, string, op = match.groups()
+        if number is not None:
+            tokens.append(("number", float(number), match.start(1)))
+        elif name is not None:
+            tokens.append(("name", name, match.start(2)))
+        elif string is not None:
+            tokens.append(("string", string[1:-1], match.start(3)))
+        else:
+            tokens.append(("op", op, match.start(4)))
+        pos = match.end()
+    tokens.append(("end", None, len(text)))
+    return tokens
+
+
+class _Builder:
+    """Analyseur descendant qui construit directement le graphe dédupliqué"""
+
+    def __init__(self, text, params):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.params = params
+        self.nodes = [("close", (), ())]  # Nœud 0 : les clôtures
+        self.kinds = [NUMBER]
+        self.ids = {self.nodes[0]: 0}
+
+    # Les opérandes sont soit des nœuds (int), soit des littéraux (float / bool / str) : ("lit", valeur)
+    def node(self, op, inputs=(), params=(), kind=NUMBER):
+        key = (op, tuple(inputs), tuple(params))
+        if key not in self.ids:
+            self.ids[key] = len(self.nodes)
+            self.nodes.append(key)
+            self.kinds.append(kind)
+        return self.ids[key]
+
+    def kind(self, operand):
+        if isinstance(operand, int):
+            return self.kinds[operand]
+        value = operand[1]
+        return TEXT if isinstance(value, str) else BOOL if isinstance(value, bool) else NUMBER
+
+    def expect_kind(self, operand, kind, context):
+        if self.kind(operand) != kind:
+            raise ValueError(f"{context} : type {kind} attendu, {self.kind(operand)} obtenu")
+
+    # Lecture des jetons
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def accept(self, kind, value=None):
+        token = self.tokens[self.pos]
+        if token[0] == kind and (value is None or token[1] == value):
+            self.pos += 1
+            return token
+        return None
+
+    def expect(self, kind, value=None):
+        token = self.accept(kind, value)
+        if token is None:
+            found = self.peek()
+            wanted = value if value is not None else kind
+            raise ValueError(f"'{wanted}' attendu à la position {found[2]}, trouvé : {found[1] if found[1] is not None else 'fin'}")
+        return token
+
+    # Grammaire : or > and > not > comparaison > somme > produit > unaire > valeur[n]
+    def parse(self):
+        result = self.parse_or()
+        self.expect("end")
+        return result
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.accept("name", "or"):
+            left = self.logical("or", left, self.parse_and())
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+        while self.accept("name", "and"):
+            left = self.logical("and", left, self.parse_not())
+        return left
+
+    def parse_not(self):
+        if self.accept("name", "not"):
+            operand = self.parse_not()
+            self.expect_kind(operand, BOOL, "not")
+            if not isinstance(operand, int):
+                return ("lit", not operand[1])
+            return self.node("not", (operand,), kind=BOOL)
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left = self.parse_sum()
+        token = self.peek()
+        if token[0] == "op" and token[1] in _COMPARISONS:
+            self.pos += 1
+            return self.compare(token[1], left, self.parse_sum())
+        return left
+
+    def parse_sum(self):
+        left = self.parse_product()
+        while self.peek()[0] == "op" and self.peek()[1] in "+-":
+            left = self.arithmetic(self.tokens[self.pos][1], left, self.advance_and(self.parse_product))
+        return left
+
+    def parse_product(self):
+        left = self.parse_unary()
+        while self.peek()[0] == "op" and self.peek()[1] in "*/":
+            left = self.arithmetic(self.tokens[self.pos][1], left, self.advance_and(self.parse_unary))
+        return left
+
+    def advance_and(self, parse):
+        self.pos += 1
+        return parse()
+
+    def parse_unary(self):
+        if self.accept("op", "-"):
+            operand = self.parse_unary()
+            self.expect_kind(operand, NUMBER, "-")
+            return ("lit", -operand[1]) if not isinstance(operand, int) else self.node("neg", (operand,))
+        value = self.parse_atom()
+        while self.accept("op", "["):
+            bars = self.window(self.parse_sum(), "[n]", minimum=0)
+            self.expect("op", "]")
+            value = self.lag(value, bars)
+        return value
+
+    def parse_atom(self):
+        token = self.peek()
+        self.pos += 1
+        if token[0] == "number":
+            return ("lit", token[1])
+        if token[0] == "string":
+            return ("lit", token[1])
+        if token[0] == "op" and token[1] == "(":
+            value = self.parse_or()
+            self.expect("op", ")")
+            return value
+        if token[0] == "name":
+            name = token[1]
+            if self.accept("op", "("):
+                args = []
+                if not self.accept("op", ")"):
+                    args.append(self.parse_or())
+                    while self.accept("op", ","):
+                        args.append(self.parse_or())
+                    self.expect("op", ")")
+                return self.call(name, args)
+            if name == "close":
+                return 0
+            if name in ("true", "false"):
+                return ("lit", name == "true")
+            if name in self.params:
+                value = self.params[name]
+                return ("lit", value if isinstance(value, (str, bool)) else float(value))
+            raise ValueError(f"Nom inconnu : {name} (position {token[2]})")
+        raise ValueError(f"Valeur attendue à la position {token[2]}, trouvé : {token[1] if token[1] is not None else 'fin'}")
+
+    # Construction des nœuds (les opérations entre littéraux sont calculées tout de suite)
+    def literal(self, operand, context):
+        if isinstance(operand, int):
+            raise ValueError(f"{context} : une constante est attendue, pas une série")
+        return operand[1]
+
+    def window(self, operand, context, minimum=1):
+        value = self.literal(operand, context)
+        if isinstance(value, (str, bool)) or value != int(value) or value < minimum:
+            raise ValueError(f"{context} : entier >= {minimum} attendu, obtenu {value!r}")
+        return int(value)
+
+    def arithmetic(self, op, left, right):
+        self.expect_kind(left, NUMBER, op)
+        self.expect_kind(right, NUMBER, op)
+        if not isinstance(left, int) and not isinstance(right, int):
+            return ("lit", _LITERAL_OPS[op](left[1], right[1]))
+        return self.node(op, (left, right))
+
+    def compare(self, op, left, right):
+        self.expect_kind(left, NUMBER, op)
+        self.expect_kind(right, NUMBER, op)
+        if not isinstance(left, int) and not isinstance(right, int):
+            return ("lit", bool(_LITERAL_OPS[op](left[1], right[1])))
+        return self.node(op, (left, right), kind=BOOL)
+
+    def logical(self, op, left, right):
+        self.expect_kind(left, BOOL, op)
+        self.expect_kind(right, BOOL, op)
+        for constant, other in ((left, right), (right, left)):
+            if not isinstance(constant, int):
+                # true and x = x, false and x = false, true or x = true, false or x = x
+                return other if constant[1] == (op == "and") else constant
+        return self.node(op, tuple(sorted((left, right))), kind=BOOL)  # Commutatif : a and b == b and a
+
+    def lag(self, value, bars):
+        if bars == 0 or not isinstance(value, int):
+            return value
+        return self.node("lag", (value,), (bars,), kind=self.kind(value))
+
+    def call(self, name, args):
+        def arity(*counts):
+            if len(args) not in counts:
+                raise ValueError(f"{name}() attend {' ou '.join(map(str, counts))} arguments, {len(args)} reçus")
+
+        def series(i):
+            self.expect_kind(args[i], NUMBER, f"{name}()")
+            return args[i] if isinstance(args[i], int) else self.node("const", (), (float(args[i][1]),))
+
+        if name in ("sma", "std", "highest", "lowest"):
+            arity(2)
+            return self.node(name, (series(0),), (self.window(args[1], f"{name}() fenêtre", 2 if name == "std" else 1),))
+        if name == "rsi":
+            arity(2, 3)
+            method = self.literal(args[2], "rsi() lissage") if len(args) == 3 else "simple"
+            if method not in ("simple", "wilder"):
+                raise ValueError(f"Lissage RSI inconnu : {method}")
+            return self.node("rsi", (series(0),), (self.window(args[1], "rsi() période"), method))
+        if name in ("bb_mid", "bb_upper", "bb_lower"):
+            # Décomposées en sma et std : partagées avec les autres bandes et les autres indicateurs
+            arity(3)
+            window = self.window(args[1], f"{name}() fenêtre", 2)
+            mid = self.node("sma", (series(0),), (window,))
+            if name == "bb_mid":
+                return mid
+            width = self.arithmetic("*", args[2], self.node("std", (series(0),), (window,)))
+            return self.arithmetic("+" if name == "bb_upper" else "-", mid, width)
+        if name in ("cross_above", "cross_below"):
+            # a croise b à la hausse : a > b maintenant et a <= b à la barre précédente
+            arity(2)
+            a, b = args
+            now, before = (">", "<=") if name == "cross_above" else ("<", ">=")
+            return self.logical("and", self.compare(now, a, b), self.compare(before, self.lag(a, 1), self.lag(b, 1)))
+        raise ValueError(f"Fonction inconnue : {name}()")
+
+
+# --- ÉVALUATION ---
+def _kernel(op, params, inputs, out):
+    """Calcule un nœud dans `out` (les entrées sont des tableaux ou des scalaires)"""
+    if op in _ARITHMETIC:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _ARITHMETIC[op](*inputs, out=out)
+    elif op in _COMPARISONS:
+        with np.errstate(invalid="ignore"):
+            _COMPARISONS[op](*inputs, out=out)
+    elif op == "and":
+        np.logical_and(*inputs, out=out)
+    elif op == "or":
+        np.logical_or(*inputs, out=out)
+    elif op == "not":
+        np.logical_not(*inputs, out=out)
+    elif op == "neg":
+        np.negative(*inputs, out=out)
+    elif op == "const":
+        out.fill(params[0])
+    elif op == "sma":
+        indicators.sma(inputs[0], params[0], out=out)
+    elif op == "std":
+        indicators.rolling_std(inputs[0], params[0], out=out)
+    elif op == "rsi":
+        indicators.rsi(inputs[0], params[0], method=params[1], out=out)
+    elif op == "lag":
+        bars = params[0]
+        out[:bars] = np.nan if out.dtype == np.float64 else False
+        out[bars:] = inputs[0][:max(len(out) - bars, 0)]
+    elif op in ("highest", "lowest"):
+        window = params[0]
+        out[:window - 1] = np.nan
+        if window <= len(out):
+            view = np.lib.stride_tricks.sliding_window_view(inputs[0], window, axis=0)
+            (np.max if op == "highest" else np.min)(view, axis=-1, out=out[window - 1:])
+    else:
+        raise ValueError(f"Opération inconnue : {op}")
+
+
+@dataclass(frozen=True)
+class Program:
+    """Graphe compilé : nœuds dans l'ordre de calcul, condition finale et séries nommées à renvoyer"""
+    nodes: tuple
+    kinds: tuple
+    result: object
+    outputs: tuple  # ((nom, nœud ou littéral), ...)
+
+    def evaluate(self, close):
+        """(signaux 0/1 en int64, {nom: série}) : même format que compute() des stratégies"""
+        close = np.ascontiguousarray(close, dtype="float64")
+        keep = {operand for _, operand in self.outputs if isinstance(operand, int)}
+        if isinstance(self.result, int):
+            keep.add(self.result)
+        # Dernier consommateur de chaque nœud : son tampon est rendu au pool juste après
+        last_use = {}
+        for i, (_, inputs, _) in enumerate(self.nodes):
+            for operand in inputs:
+                if isinstance(operand, int):
+                    last_use[operand] = i
+
+        values = [close] + [None] * (len(self.nodes) - 1)
+        pools = {NUMBER: [], BOOL: []}
+        for i in range(1, len(self.nodes)):
+            op, inputs, params = self.nodes[i]
+            kind = self.kinds[i]
+            if pools[kind]:
+                out = pools[kind].pop()
+            else:
+                out = np.empty(close.shape, dtype="float64" if kind == NUMBER else bool)
+            _kernel(op, params, [values[x] if isinstance(x, int) else x[1] for x in inputs], out)
+            values[i] = out
+            for operand in set(inputs):
+                if isinstance(operand, int) and operand and last_use[operand] == i and operand not in keep:
+                    pools[self.kinds[operand]].append(values[operand])
+                    values[operand] = None
+
+        if isinstance(self.result, int):
+            signals = values[self.result].astype("int64")
+        else:
+            signals = np.full(close.shape, int(self.result[1]), dtype="int64")
+        series = {}
+        for name, operand in self.outputs:
+            if not isinstance(operand, int):
+                series[name] = np.full(close.shape, float(operand[1]))
+            else:
+                # Les clôtures ne sont jamais renvoyées telles quelles : l'appelant peut modifier la série
+                series[name] = values[operand].copy() if operand == 0 else values[operand]
+        return signals, series
+
+
+@lru_cache(maxsize=256)
+def _compile(expression, outputs, params):
+    params = dict(params)
+    builder = _Builder(expression, params)
+    result = builder.parse()
+    builder.expect_kind(result, BOOL, "Expression")
+    named = []
+    for name, text in outputs:
+        # Même graphe que la condition : les séries affichées ne sont pas recalculées
+        builder.tokens, builder.pos = _tokenize(text), 0
+        operand = builder.parse()
+        builder.expect_kind(operand, NUMBER, name)
+        named.append((name, operand))
+    return Program(tuple(builder.nodes), tuple(builder.kinds), result, tuple(named))
+
+
+def compile_expression(expression, outputs=None, **params):
+    """Analyse (une fois par texte et paramètres) une condition et des séries nommées à afficher"""
+    return _compile(expression, tuple((outputs or {}).items()), tuple(sorted(params.items())))
+
+
+def evaluate(expression, close, outputs=None, **params):
+    """Signaux (et séries nommées) d'une expression sur des clôtures 1-D ou 2-D"""
+    return compile_expression(expression, outputs, **params).evaluate(close)
@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules import indicators
+
+# Prévision du rendement sur `horizon` barres à partir de variables calculées en une passe vectorisée
+# (rendements retardés, volatilité glissante, indicateurs). Les modèles sont comparés par validation
+# croisée temporelle (plis successifs, écart de `horizon` barres entre entraînement et test pour que
+# les cibles ne se chevauchent pas) ; les intervalles de prévision viennent des erreurs hors échantillon.
+
+LAGS = 5
+MOMENTUM_WINDOWS = (5, 21, 63)
+VOL_WINDOWS = (21, 63)
+N_SPLITS = 5
+MIN_TRAIN = 120  # Lignes (variables + cible connues) minimum pour entraîner un modèle
+
+MODEL_LABELS = {
+    "naive": "Dérive historique (référence)",
+    "linear": "Régression linéaire",
+    "ridge": "Ridge",
+    "ar": "Autorégressif (AR)",
+    "gbr": "Gradient Boosting",
+}
+
+
+# --- VARIABLES ---
+def make_features(close, lags=LAGS):
+    """Variables explicatives connues à la clôture de chaque barre (une ligne par date)"""
+    close = pd.Series(close, dtype="float64")
+    values = close.to_numpy()
+    log_close = np.log(values)
+    returns = np.full(len(values), np.nan)
+    returns[1:] = np.diff(log_close)
+
+    columns = {}
+    for lag in range(lags):
+        columns[f"ret_lag{lag + 1}"] = np.concatenate([np.full(lag, np.nan), returns[:len(returns) - lag]])
+    for window in MOMENTUM_WINDOWS:
+        columns[f"mom_{window}"] = np.concatenate([np.full(window, np.nan), log_close[window:] - log_close[:-window]])
+    for window in VOL_WINDOWS:
+        # Calcul à partir de la 2e barre : le NaN initial se propagerait dans les sommes cumulées
+        columns[f"vol_{window}"] = np.concatenate([[np.nan], indicators.rolling_std(returns[1:], window)])
+    columns["rsi_14"] = indicators.rsi(values, 14) / 100
+    columns["sma50_gap"] = values / indicators.sma(values, 50) - 1
+    mid, upper, lower = indicators.bollinger(values, 20, 2.0)
+    width = upper - lower
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Bandes de largeur nulle (prix inchangé sur la fenêtre, fréquent en intraday) : milieu de bande
+        columns["bollinger_b"] = np.where(width == 0, 0.5, (values - lower) / width)
+    return pd.DataFrame(columns, index=close.index)
+
+
+def make_target(close, horizon):
+    """Rendement logarithmique des `horizon` barres suivantes (NaN en fin d'historique)"""
+    log_close = np.log(pd.Series(close, dtype="float64").to_numpy())
+    target = np.full(len(log_close), np.nan)
+    target[:-horizon] = log_close[horizon:] - log_close[:-horizon]
+    return pd.Series(target, index=close.index if isinstance(close, pd.Series) else None, name=f"ret_{horizon}")
+
+
+# --- MODÈLES ---
+class NaiveDrift:
+    """Référence : le rendement moyen observé sur l'échantillon d'entraînement"""
+
+    def fit(self, X, y):
+        self.mean_ = float(np.mean(y))
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+
+def make_model(name):
+    """Estimateur scikit-learn (ou compatible) non entraîné"""
+    # Import différé : scikit-learn n'est chargé que si une prévision est demandée
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if name == "naive":
+        return NaiveDrift()
+    if name in ("linear", "ar"):
+        return LinearRegression()
+    if name == "ridge":
+        return make_pipeline(StandardScaler(), Ridge(alpha=10.0))
+    if name == "gbr":
+        return HistGradientBoostingRegressor(max_iter=200, learning_rate=0.05, max_leaf_nodes=15, min_samples_leaf=40)
+    raise ValueError(f"Modèle inconnu : {name} (choix : {', '.join(MODEL_LABELS)})")
+
+
+def _columns(name, features):
+    """Variables utilisées par un modèle (AR : uniquement les rendements retardés)"""
+    if name == "ar":
+        return [c for c in features.columns if c.startswith("ret_lag")]
+    return list(features.columns)
+
+
+def _dataset(close, horizon):
+    """(variables, cible) sur les lignes complètes + variables de la dernière barre"""
+    features = make_features(close)
+    target = make_target(close, horizon)
+    complete = features.notna().all(axis=1).to_numpy()
+    train = complete & target.notna().to_numpy()
+    if train.sum() < MIN_TRAIN:
+        raise ValueError(f"Historique insuffisant pour une prévision à {horizon} barres ({train.sum()} lignes utilisables)")
+    return features[train], target.to_numpy()[train], features.iloc[[-1]]
+
+
+def _splits(n_rows, horizon, n_splits=N_SPLITS):
+    """Plis temporels (train, test) avec un écart de `horizon` barres"""
+    from sklearn.model_selection import TimeSeriesSplit
+    return TimeSeriesSplit(n_splits=n_splits, gap=horizon).split(np.arange(n_rows))
+
+
+def cross_validate(close, horizon=30, models=tuple(MODEL_LABELS), n_splits=N_SPLITS):
+    """Erreurs hors échantillon de chaque modèle -> (tableau des scores, {modèle: résidus})"""
+    X, y, _ = _dataset(close, horizon)
+    rows, residuals = [], {}
+    for name in models:
+        columns = _columns(name, X)
+        predictions, actual = [], []
+        for train, test in _splits(len(y), horizon, n_splits):
+            model = make_model(name).fit(X.iloc[train][columns], y[train])
+            predictions.append(model.predict(X.iloc[test][columns]))
+            actual.append(y[test])
+        predictions, actual = np.concatenate(predictions), np.concatenate(actual)
+        errors = actual - predictions
+        residuals[name] = errors
+        rows.append({
+            "model": name,
+            "rmse": float(np.sqrt(np.mean(errors ** 2))),
+            "mae": float(np.mean(np.abs(errors))),
+            "hit_rate": float(np.mean(np.sign(predictions) == np.sign(actual))),
+        })
+    scores = pd.DataFrame(rows).set_index("model")
+    scores["skill_vs_naive"] = 1 - scores["rmse"] / scores.loc["naive", "rmse"] if "naive" in scores.index else np.nan
+    return scores.sort_values("rmse"), residuals
+
+
+# --- PRÉVISION ---
+@dataclass
+class Forecast:
+    model: str
+    horizon: int
+    expected_return: float  # Rendement logarithmique prévu sur l'horizon
+    path: pd.DataFrame      # Prix prévu et intervalle (colonnes forecast / lower / upper) par date future
+    scores: pd.DataFrame    # Erreurs hors échantillon du modèle choisi
+
+    @property
+    def price(self):
+        return float(self.path["forecast"].iloc[-1])
+
+
+def future_dates(index, horizon):
+    """Dates des `horizon` prochaines barres (pas médian en intraday, jours ouvrés si l'historique n'a pas de week-ends)"""
+    index = pd.DatetimeIndex(index)
+    step = pd.Series(index[-100:]).diff().median()
+    if step < pd.Timedelta(days=1):
+        return pd.date_range(index[-1] + step, periods=horizon, freq=step)
+    trades_weekends = (index.dayofweek >= 5).any()
+    return pd.date_range(index[-1] + pd.Timedelta(days=1), periods=horizon, freq="D" if trades_weekends else "B")
+
+
+def forecast(close, model="ridge", horizon=30, level=0.9, n_splits=N_SPLITS):
+    """Prix prévu à chaque barre de l'horizon, avec un intervalle tiré des erreurs hors échantillon"""
+    close = pd.Series(close, dtype="float64")
+    X, y, last = _dataset(close, horizon)
+    scores, residuals = cross_validate(close, horizon, (model,), n_splits)
+    columns = _columns(model, X)
+    fitted = make_model(model).fit(X[columns], y)
+    expected = float(fitted.predict(last[columns])[0])
+
+    # Trajectoire : dérive constante jusqu'à l'horizon, intervalle élargi en racine du temps
+    low_q, high_q = np.quantile(residuals[model], [(1 - level) / 2, (1 + level) / 2])
+    step = np.arange(1, horizon + 1) / horizon
+    last_price = close.iloc[-1]
+    path = pd.DataFrame({
+        "forecast": last_price * np.exp(expected * step),
+        "lower": last_price * np.exp(expected * step + low_q * np.sqrt(step)),
+        "upper": last_price * np.exp(expected * step + high_q * np.sqrt(step)),
+    }, index=future_dates(close.index, horizon))
+    return Forecast(model, horizon, expected, path, scores)
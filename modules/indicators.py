@@ -0,0 +1,192 @@
+import numpy as np
+
+# Indicateurs techniques sur tableaux NumPy float64 (1-D, ou 2-D avec le temps en axe 0).
+# Pas d'objet pandas intermédiaire : chaque fonction accepte un tableau de sortie `out` préalloué.
+# Valeurs manquantes : comme rolling(window) de pandas, une fenêtre qui contient un NaN donne NaN.
+
+
+# --- OUTILS INTERNES ---
+def _as_float(x):
+    return np.ascontiguousarray(x, dtype="float64")
+
+
+def _output(x, out):
+    return np.empty_like(x) if out is None else out
+
+
+def _window_sums(x, window, buffer=None):
+    """Sommes glissantes de `window` valeurs via somme cumulée (données recentrées pour la précision)"""
+    reference = np.array(x[0])  # Copie : `buffer` peut être `x`
+    csum = np.subtract(x, reference, out=buffer)
+    np.cumsum(csum, axis=0, out=csum)
+    sums = csum[window - 1:].copy()
+    sums[1:] -= csum[:-window]
+    return sums, reference * window
+
+
+def _fill_missing(x):
+    """NaN remplacés par la dernière valeur connue (sommes glissantes exploitables) -> (valeurs, masque ou None)"""
+    missing = np.isnan(x)
+    if not missing.any():
+        return x, None
+    steps = np.arange(len(x)).reshape((-1,) + (1,) * (x.ndim - 1))
+    last = np.maximum.accumulate(np.where(missing, 0, steps), axis=0)
+    filled = np.take_along_axis(x, np.broadcast_to(last, x.shape), axis=0) if x.ndim == 2 else x[last]
+    # NaN de tête : 1re valeur connue de la colonne (0 si la colonne est vide)
+    first = np.take_along_axis(x, np.argmax(~missing, axis=0)[None], axis=0)[0] if x.ndim == 2 else x[np.argmax(~missing)]
+    filled = np.where(np.isnan(filled), np.nan_to_num(first), filled)
+    return filled, missing
+
+
+def _windows_with_missing(missing, window):
+    """Fenêtres (fin en t >= window-1) qui contiennent au moins un NaN, comme rolling(min_periods=window)"""
+    counts = np.cumsum(missing, axis=0, dtype=np.int64)
+    in_window = counts[window - 1:].copy()
+    in_window[1:] -= counts[:-window]
+    return in_window > 0
+
+
+# --- MOYENNE MOBILE ---
+def sma(x, window, out=None):
+    """Moyenne mobile simple (NaN tant que la fenêtre n'est pas pleine, comme rolling().mean())"""
+    x = _as_float(x)
+    out = _output(x, out)
+    if window > len(x):
+        out[:] = np.nan
+        return out
+    x, missing = _fill_missing(x)
+    sums, shift = _window_sums(x, window)
+    np.add(sums, shift, out=sums)
+    np.divide(sums, window, out=out[window - 1:])
+    out[:window - 1] = np.nan
+    if missing is not None:
+        out[window - 1:][_windows_with_missing(missing, window)] = np.nan
+    return out
+
+
+# --- ÉCART-TYPE GLISSANT ---
+STD_BLOCK = 4096  # Longueur des blocs recentrés de rolling_std
+
+
+def rolling_std(x, window, ddof=1, out=None):
+    """Écart-type glissant en une passe (sommes des écarts à une référence locale, ddof=1 comme pandas)"""
+    x = _as_float(x)
+    out = _output(x, out)
+    if window > len(x) or window <= ddof:
+        out[:] = np.nan
+        return out
+    out[:window - 1] = np.nan
+    x, missing = _fill_missing(x)
+
+    # Algorithme "shifted data" par blocs : sur chaque bloc on travaille sur x - K, avec K la
+    # moyenne locale, ce qui évite l'annulation catastrophique de S2 - S1² sur les longues séries
+    block = max(STD_BLOCK, 4 * window)
+    for start in range(window - 1, len(x), block):
+        stop = min(start + block, len(x))
+        centered = x[start - window + 1:stop] - x[start - window + 1:start + 1].mean(axis=0)
+        s1, shift = _window_sums(centered, window)
+        s1 += shift
+        np.square(centered, out=centered)
+        s2, shift = _window_sums(centered, window, buffer=centered)
+        s2 += shift
+        # var = (S2 - S1² / n) / (n - ddof)
+        np.square(s1, out=s1)
+        np.divide(s1, window, out=s1)
+        np.subtract(s2, s1, out=s2)
+        np.maximum(s2, 0.0, out=s2)
+        np.divide(s2, window - ddof, out=s2)
+        np.sqrt(s2, out=out[start:stop])
+    if missing is not None:
+        out[window - 1:][_windows_with_missing(missing, window)] = np.nan
+    return out
+
+
+# --- LISSAGE EXPONENTIEL (RÉCURRENCE PAR BLOCS) ---
+def _exp_smooth(x, alpha, initial, out):
+    """y[t] = (1 - alpha) * y[t-1] + alpha * x[t], vectorisé par blocs (forme fermée de la récurrence)"""
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[:] = x
+        return out
+    # Taille de bloc telle que decay**-block reste loin de l'overflow (<= 1e100)
+    block = max(1, int(100 * np.log(10) / -np.log(decay)))
+    steps = np.arange(block, dtype="float64")
+    growth = decay ** -steps            # decay^-k
+    decays = decay ** (steps + 1)       # decay^(j+1)
+    if x.ndim == 2:
+        growth, decays = growth[:, None], decays[:, None]
+
+    previous = initial
+    for start in range(0, len(x), block):
+        chunk = x[start:start + block]
+        n = len(chunk)
+        target = out[start:start + n]
+        # y[s+j] = decay^(j+1) * y[s-1] + alpha * decay^j * sum_{k<=j} x[s+k] * decay^-k
+        np.multiply(chunk, growth[:n], out=target)
+        np.cumsum(target, axis=0, out=target)
+        target *= alpha / decay
+        target += previous
+        target *= decays[:n]
+        previous = target[-1].copy()
+    return out
+
+
+def wilder_smooth(x, period, out=None):
+    """Lissage de Wilder (alpha = 1/period), initialisé par la moyenne simple des `period` premières valeurs"""
+    x = _as_float(x)
+    out = _output(x, out)
+    if period > len(x):
+        out[:] = np.nan
+        return out
+    seed = x[:period].mean(axis=0)  # Avant toute écriture : `out` peut être `x`
+    out[:period - 1] = np.nan
+    out[period - 1] = seed
+    _exp_smooth(x[period:], 1.0 / period, seed, out[period:])
+    return out
+
+
+# --- RSI ---
+def rsi(close, period=14, method="simple", out=None):
+    """RSI à partir des clôtures : 'simple' (moyennes mobiles, comme quant_a) ou 'wilder'"""
+    close = _as_float(close)
+    out = _output(close, out)
+
+    # Variations : la 1re, et celles autour d'une clôture manquante, valent 0 (comme delta.where(...)
+    # qui remplace les NaN) ; fmax ignore les NaN
+    gain = np.empty_like(close)
+    gain[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=gain[1:])
+    loss = np.negative(gain)
+    np.fmax(gain, 0.0, out=gain)
+    np.fmax(loss, 0.0, out=loss)
+
+    if method == "simple":
+        sma(gain, period, out=gain)
+        sma(loss, period, out=loss)
+    elif method == "wilder":
+        # Wilder démarre sur les `period` premières variations réelles (on ignore la 1re ligne)
+        gain[0] = loss[0] = np.nan
+        wilder_smooth(gain[1:], period, out=gain[1:])
+        wilder_smooth(loss[1:], period, out=loss[1:])
+    else:
+        raise ValueError(f"Lissage RSI inconnu : {method}")
+
+    # RSI = 100 - 100 / (1 + gain / loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(gain, loss, out=out)
+    out += 1.0
+    np.divide(100.0, out, out=out)
+    np.subtract(100.0, out, out=out)
+    return out
+
+
+# --- BANDES DE BOLLINGER ---
+def bollinger(close, window=20, num_std=2.0, out_mid=None, out_upper=None, out_lower=None):
+    """Bandes de Bollinger -> (moyenne, bande haute, bande basse)"""
+    close = _as_float(close)
+    mid = sma(close, window, out=out_mid)
+    upper = rolling_std(close, window, out=out_upper)
+    upper *= num_std
+    lower = np.subtract(mid, upper, out=_output(close, out_lower))
+    upper += mid
+    return mid, upper, lower
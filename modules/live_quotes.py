@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+# Cotations en direct pour la page d'accueil : pool de threads borné, délai maximum par symbole,
+# une seule requête en vol par symbole (partagée entre les sessions) et cache "stale-while-revalidate" :
+# une valeur en cache est toujours servie immédiatement, le rafraîchissement se fait en arrière-plan.
+
+DEFAULT_TTL = 30        # Secondes avant de relancer une requête
+DEFAULT_TIMEOUT = 3.0   # Attente max d'un symbole jamais chargé
+DEFAULT_WORKERS = 8
+
+
+@dataclass
+class Quote:
+    symbol: str
+    price: float = None
+    change_pct: float = None
+    fetched_at: float = None
+    stale: bool = False
+    error: str = None
+
+
+# --- SOURCES DE COTATIONS ---
+class StoreQuoteSource:
+    """Dernières clôtures depuis le store de marché (fin d'historique téléchargée si besoin)"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def fetch(self, symbol):
+        """-> (dernier prix, clôture précédente)"""
+        hist = self.store.get_history(symbol, period="5d", max_age=0)
+        if len(hist) < 2:
+            raise ValueError("Aucune donnée")
+        return float(hist["Close"].iloc[-1]), float(hist["Close"].iloc[-2])
+
+
+class MockQuoteSource:
+    """Source locale pour les tests : prix fixes, latence et erreurs simulées"""
+
+    def __init__(self, prices, delay=0.0, failing=()):
+        self.prices = prices          # {symbole: (prix, clôture précédente)}
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = 0
+
+    def fetch(self, symbol):
+        self.calls += 1
+        time.sleep(self.delay)
+        if symbol in self.failing or symbol not in self.prices:
+            raise ValueError(f"Cotation indisponible : {symbol}")
+        return self.prices[symbol]
+
+
+# --- SERVICE ---
+class QuoteService:
+    """Cotations concurrentes avec coalescence des requêtes et cache stale-while-revalidate"""
+
+    def __init__(self, source, ttl=DEFAULT_TTL, timeout=DEFAULT_TIMEOUT, max_workers=DEFAULT_WORKERS):
+        self.source = source
+        self.ttl = ttl
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quotes")
+        self.lock = threading.Lock()
+        self.cache = {}      # symbole -> Quote
+        self.in_flight = {}  # symbole -> Future (une seule requête par symbole)
+
+    def _fetch(self, symbol):
+        price, previous = self.source.fetch(symbol)
+        return Quote(symbol, price, (price - previous) / previous * 100, time.time())
+
+    def _store(self, symbol, future):
+        with self.lock:
+            self.in_flight.pop(symbol, None)
+            if future.exception() is None:
+                self.cache[symbol] = future.result()
+            elif symbol in self.cache:
+                self.cache[symbol].error = str(future.exception())  # On garde le dernier prix connu
+
+    def refresh(self, symbol):
+        """Lance (ou rejoint) la requête en vol pour un symbole -> Future"""
+        with self.lock:
+            future = self.in_flight.get(symbol)
+            if future is None:
+                future = self.executor.submit(self._fetch, symbol)
+                self.in_flight[symbol] = future
+                future.add_done_callback(lambda f, s=symbol: self._store(s, f))
+            return future
+
+    def get_quotes(self, symbols, timeout=None):
+        """Cotations de plusieurs symboles ; n'attend (au plus `timeout`) que ceux jamais chargés"""
+        timeout = self.timeout if timeout is None else timeout
+        now = time.time()
+        pending = {}
+        for symbol in dict.fromkeys(symbols):
+            with self.lock:
+                cached = self.cache.get(symbol)
+            if cached is None:
+                pending[symbol] = self.refresh(symbol)
+            elif now - cached.fetched_at > self.ttl:
+                self.refresh(symbol)  # Servi tel quel, rafraîchi en arrière-plan
+
+        # Toutes les requêtes partent en parallèle : le délai s'applique à chaque symbole, pas à la somme
+        if pending:
+            wait(pending.values(), timeout=timeout)
+
+        quotes = []
+        for symbol in symbols:
+            with self.lock:
+                cached = self.cache.get(symbol)
+            if cached is not None:
+                quotes.append(Quote(**{**cached.__dict__, "stale": now - cached.fetched_at > self.ttl}))
+                continue
+            future = pending.get(symbol)
+            if future is None or not future.done():
+                quotes.append(Quote(symbol, error="Délai dépassé"))
+            elif future.exception() is not None:
+                quotes.append(Quote(symbol, error=str(future.exception())))
+            else:
+                quotes.append(future.result())  # Terminé, callback de mise en cache pas encore exécuté
+        return quotes
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
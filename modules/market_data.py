@@ -0,0 +1,338 @@
+import json
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+from modules.bar_store import BarStore, is_intraday, resample, to_frame
+from modules.profiling import timed
+
+# --- CONFIGURATION ---
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+DEFAULT_DATA_DIR = os.environ.get("QUANT_DATA_DIR", "data")
+DEFAULT_MAX_AGE = 15 * 60  # Secondes avant de redemander la fin de l'historique
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+# Limites Yahoo en intraday : profondeur d'historique disponible et durée max d'une requête (jours)
+INTRADAY_LOOKBACK = {"1m": 29, "2m": 59, "5m": 59, "15m": 59, "30m": 59, "60m": 729, "90m": 59, "1h": 729}
+INTRADAY_MAX_REQUEST = {"1m": 7}
+
+
+# --- FONCTIONS UTILITAIRES ---
+def period_start(period, now=None):
+    """Convertit une période Yahoo ('2y', '6mo', 'max'...) en date de début (None = tout l'historique)"""
+    if period == "max":
+        return None
+    now = pd.Timestamp.now().normalize() if now is None else pd.Timestamp(now)
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    match = _PERIOD_RE.match(period)
+    if match is None:
+        raise ValueError(f"Période inconnue : {period}")
+    value, unit = int(match.group(1)), match.group(2)
+    return now - pd.DateOffset(**{_PERIOD_UNITS[unit]: value})
+
+
+def safe_name(ticker):
+    """Nom de fichier sûr pour un symbole (ex: 'EURUSD=X', '^GSPC')"""
+    return re.sub(r"[^A-Za-z0-9._=^-]", "_", ticker)
+
+
+def normalize_ohlcv(data):
+    """Met un DataFrame de prix au format commun : colonnes OHLCV, index 'Date' trié sans fuseau"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+
+    df = data.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df[[c for c in OHLCV_COLUMNS if c in df.columns]].astype("float64")
+
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    df.index = index.rename("Date")
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df
+
+
+# --- FOURNISSEURS DE DONNÉES ---
+class YahooProvider:
+    """Fournisseur par défaut : Yahoo Finance"""
+
+    @timed("data.download")
+    def download(self, ticker, start=None, interval="1d"):
+        import yfinance as yf  # Import différé : inutile tant que le cache disque suffit
+        if interval in INTRADAY_LOOKBACK:
+            return self._download_intraday(yf, ticker, start, interval)
+        if start is None:
+            data = yf.download(ticker, period="max", interval=interval, progress=False)
+        else:
+            data = yf.download(ticker, start=start, interval=interval, progress=False)
+        return normalize_ohlcv(data)
+
+    def _download_intraday(self, yf, ticker, start, interval):
+        """Historique intraday dans la limite de profondeur Yahoo, par requêtes de durée autorisée"""
+        now = pd.Timestamp.now().floor("min")
+        earliest = now - pd.Timedelta(days=INTRADAY_LOOKBACK[interval])
+        start = earliest if start is None else max(pd.Timestamp(start), earliest)
+        step = pd.Timedelta(days=INTRADAY_MAX_REQUEST.get(interval, INTRADAY_LOOKBACK[interval]))
+        chunks = []
+        while start < now:
+            end = min(start + step, now + pd.Timedelta(minutes=1))
+            chunks.append(normalize_ohlcv(yf.download(ticker, start=start, end=end, interval=interval, progress=False)))
+            start = end
+        data = pd.concat(chunks) if chunks else normalize_ohlcv(None)
+        return data[~data.index.duplicated(keep="last")].sort_index()
+
+    @timed("data.download")
+    def download_many(self, tickers, start=None, interval="1d"):
+        """Un seul appel Yahoo pour tous les symboles -> {symbole: DataFrame}"""
+        import yfinance as yf
+        kwargs = {"period": "max"} if start is None else {"start": start}
+        data = yf.download(list(tickers), interval=interval, group_by="ticker", threads=True, progress=False, **kwargs)
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {tickers[0]: normalize_ohlcv(data)} if len(tickers) == 1 else {}
+        available = set(data.columns.get_level_values(0))
+        return {
+            ticker: normalize_ohlcv(data[ticker].dropna(how="all"))
+            for ticker in tickers if ticker in available
+        }
+
+
+class LocalProvider:
+    """Fournisseur hors-ligne : lit des fichiers <symbole>.csv / .parquet d'un dossier (tests, fixtures)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @timed("data.download")
+    def download(self, ticker, start=None, interval="1d"):
+        base = os.path.join(self.directory, safe_name(ticker))
+        if os.path.exists(base + ".parquet"):
+            data = pd.read_parquet(base + ".parquet")
+        elif os.path.exists(base + ".csv"):
+            data = pd.read_csv(base + ".csv", index_col=0, parse_dates=True)
+        else:
+            return normalize_ohlcv(None)
+
+        data = normalize_ohlcv(data)
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        return data
+
+    def download_many(self, tickers, start=None, interval="1d"):
+        return {ticker: self.download(ticker, start, interval) for ticker in tickers}
+
+
+# --- STOCKAGE LOCAL ---
+class MarketDataStore:
+    """Cache disque (un fichier Parquet par symbole et intervalle, colonnes memmap en intraday) avec rafraîchissement incrémental"""
+
+    def __init__(self, root=DEFAULT_DATA_DIR, provider=None, max_age=DEFAULT_MAX_AGE):
+        self.root = root
+        self.provider = provider if provider is not None else YahooProvider()
+        self.max_age = max_age
+        self.bars = BarStore(os.path.join(root, "bars"))
+
+    def _path(self, ticker, interval, ext):
+        return os.path.join(self.root, interval, safe_name(ticker) + ext)
+
+    @timed("data.read_cache")
+    def load(self, ticker, interval="1d"):
+        """Historique stocké sur disque (None si absent)"""
+        path = self._path(ticker, interval, ".parquet")
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def _read_meta(self, ticker, interval):
+        path = self._path(ticker, interval, ".json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _replace(path, write):
+        """Écriture atomique : fichier temporaire unique dans le même dossier, puis renommage"""
+        # Plusieurs sessions Streamlit (ou processus) peuvent lire et écrire le même symbole en même temps
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _write_meta(self, ticker, interval, meta):
+        os.makedirs(os.path.join(self.root, interval), exist_ok=True)
+        self._replace(self._path(ticker, interval, ".json"), lambda f: f.write(json.dumps(meta).encode()))
+
+    @timed("data.write_cache")
+    def _save(self, ticker, interval, df, meta):
+        os.makedirs(os.path.join(self.root, interval), exist_ok=True)
+        self._replace(self._path(ticker, interval, ".parquet"), df.to_parquet)
+        self._write_meta(ticker, interval, meta)
+
+    @staticmethod
+    def _covers(meta, start):
+        covered_from = meta.get("covered_from")
+        if covered_from is None:
+            return False
+        if covered_from == "max":
+            return True
+        return start is not None and pd.Timestamp(covered_from) <= start
+
+    def _refresh_bars(self, ticker, interval, max_age):
+        """Ajoute aux colonnes intraday les barres publiées depuis la dernière barre stockée"""
+        meta = self._read_meta(ticker, interval)
+        if time.time() - meta.get("fetched_at", 0) <= max_age:
+            return
+        last = self.bars.last_timestamp(ticker, interval)
+        try:
+            fresh = self.provider.download(ticker, start=last, interval=interval)
+        except Exception:
+            if last is None:
+                raise
+            return  # Réseau indisponible : on sert la version disque
+        self.bars.append(ticker, interval, fresh)
+        self._write_meta(ticker, interval, {"fetched_at": time.time()})
+
+    def get_bars(self, ticker, interval="1m", start=None, end=None, columns=OHLCV_COLUMNS, source=None, max_age=None):
+        """Barres intraday {'timestamp', colonnes...} en memmap, ou agrégées depuis l'intervalle stocké `source`"""
+        max_age = self.max_age if max_age is None else max_age
+        stored = source or interval
+        self._refresh_bars(ticker, stored, max_age)
+        bars = self.bars.read(ticker, stored, start, end, columns)
+        return bars if stored == interval else resample(bars, interval)
+
+    def get_history(self, ticker, period="2y", interval="1d", max_age=None, source=None):
+        """Historique OHLCV : disque d'abord, puis seulement les barres manquantes depuis le fournisseur"""
+        max_age = self.max_age if max_age is None else max_age
+        start = period_start(period)
+        if is_intraday(interval) or source is not None:
+            return to_frame(self.get_bars(ticker, interval, start, source=source, max_age=max_age))
+        cached = self.load(ticker, interval)
+        meta = self._read_meta(ticker, interval)
+
+        if cached is None or cached.empty or not self._covers(meta, start):
+            # Premier accès (ou période plus longue que celle stockée) : téléchargement complet
+            fresh = self.provider.download(ticker, start=start, interval=interval)
+            data = fresh if cached is None else pd.concat([cached, fresh])
+            meta = {"covered_from": "max" if start is None else start.isoformat(), "fetched_at": time.time()}
+            fetched = not data.empty
+        elif time.time() - meta.get("fetched_at", 0) > max_age:
+            # Rafraîchissement : on repart de la dernière barre stockée (elle peut être incomplète)
+            try:
+                tail = self.provider.download(ticker, start=cached.index[-1], interval=interval)
+            except Exception:
+                tail = None
+            if tail is None:
+                data, fetched = cached, False  # Réseau indisponible : version disque, nouvel essai au prochain appel
+            else:
+                data = pd.concat([cached, tail])
+                meta["fetched_at"] = time.time()
+                fetched = True
+        else:
+            data, fetched = cached, False
+
+        if fetched:
+            data = data[~data.index.duplicated(keep="last")].sort_index()
+            self._save(ticker, interval, data, meta)
+
+        if start is not None:
+            data = data[data.index >= start]
+        return data
+
+    def _download_many(self, tickers, start, interval):
+        """Téléchargement groupé si le fournisseur le permet, sinon symbole par symbole"""
+        if hasattr(self.provider, "download_many"):
+            return self.provider.download_many(tickers, start=start, interval=interval)
+        return {ticker: self.provider.download(ticker, start=start, interval=interval) for ticker in tickers}
+
+    def get_many(self, tickers, period="2y", interval="1d", max_age=None):
+        """Historique de plusieurs symboles : un appel groupé pour les absents, un autre pour les fins à rafraîchir"""
+        max_age = self.max_age if max_age is None else max_age
+        if is_intraday(interval):
+            return {ticker: self.get_history(ticker, period, interval, max_age) for ticker in tickers}
+        start = period_start(period)
+        cached = {ticker: self.load(ticker, interval) for ticker in tickers}
+        metas = {ticker: self._read_meta(ticker, interval) for ticker in tickers}
+
+        missing = [t for t in tickers if cached[t] is None or cached[t].empty or not self._covers(metas[t], start)]
+        stale = [t for t in tickers if t not in missing and time.time() - metas[t].get("fetched_at", 0) > max_age]
+
+        fresh = {}
+        if missing:
+            try:
+                fresh = self._download_many(missing, start, interval)
+            except Exception:
+                fresh = {}  # Les symboles absents du résultat sont renvoyés vides
+        tails = {}
+        if stale:
+            # Une seule requête depuis la plus ancienne dernière barre stockée
+            tail_start = min(cached[t].index[-1] for t in stale)
+            try:
+                tails = self._download_many(stale, tail_start, interval)
+            except Exception:
+                tails = {}  # Réseau indisponible : on sert la version disque
+
+        result = {}
+        for ticker in tickers:
+            data, meta = cached[ticker], metas[ticker]
+            if ticker in missing:
+                new = fresh.get(ticker)
+                if new is None or new.empty:
+                    result[ticker] = normalize_ohlcv(None) if data is None else data
+                    continue
+                data = new if data is None else pd.concat([data, new])
+                meta = {"covered_from": "max" if start is None else start.isoformat(), "fetched_at": time.time()}
+            elif ticker in stale:
+                tail = tails.get(ticker)
+                if tail is None:
+                    # Échec du rafraîchissement : version disque, fetched_at inchangé (nouvel essai au prochain appel)
+                    result[ticker] = data if start is None else data[data.index >= start]
+                    continue
+                data = pd.concat([data, tail])
+                meta["fetched_at"] = time.time()
+            if ticker in missing or ticker in stale:
+                data = data[~data.index.duplicated(keep="last")].sort_index()
+                self._save(ticker, interval, data, meta)
+            result[ticker] = data if start is None else data[data.index >= start]
+        return result
+
+    def get_close(self, tickers, period="2y", interval="1d", max_age=None, source=None):
+        """Prix de clôture de plusieurs symboles, alignés sur les mêmes dates"""
+        return pd.DataFrame({
+            ticker: self.get_history(ticker, period, interval, max_age, source)["Close"]
+            for ticker in tickers
+        })
+
+
+_default_store = None
+
+
+def get_store():
+    """Store partagé par l'application et les scripts"""
+    global _default_store
+    if _default_store is None:
+        _default_store = MarketDataStore()
+    return _default_store
+
+
+def open_store(data_dir=None, offline=None):
+    """Store des scripts (--data-dir / --offline) ; hors ligne sans dossier : dossier temporaire, jamais data/"""
+    if not data_dir and not offline:
+        return get_store()
+    if offline and not data_dir:
+        # Les prix de test ne doivent pas se retrouver dans le store de production
+        data_dir = tempfile.mkdtemp(prefix="quant_offline_")
+    return MarketDataStore(data_dir, provider=LocalProvider(offline) if offline else None)
@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Simulation Monte Carlo de la valeur du portefeuille (poids constants, rééquilibrage quotidien).
+# Les chemins sont générés par lots de taille fixe ; on ne garde que des histogrammes de la
+# log-richesse (un par jour + un pour l'horizon final), donc la mémoire ne dépend pas du nombre de chemins.
+
+BAND_BINS = 512           # Résolution des histogrammes journaliers (bandes de percentiles)
+TERMINAL_BINS = 20_000    # Résolution de l'histogramme final (VaR / CVaR)
+BATCH_MEMORY = 64 * 1024 * 1024  # Octets max de tirages par lot (modèle normal multivarié)
+
+
+@dataclass
+class MonteCarloResult:
+    bands: pd.DataFrame      # Capital par jour (lignes) et percentile (colonnes)
+    var: float               # Value at Risk en % du capital (perte positive)
+    cvar: float              # Expected Shortfall en % du capital
+    prob_loss: float         # Probabilité de finir sous le capital initial
+    expected_value: float    # Capital final moyen
+    n_paths: int
+
+
+# --- GÉNÉRATION D'UN LOT ---
+def _batch_log_growth(model, size, horizon, rng):
+    """Log-rendements cumulés du portefeuille pour `size` chemins -> matrice (chemins x jours)"""
+    if model["method"] == "bootstrap":
+        # Tirage de jours historiques entiers : conserve les corrélations entre actifs
+        daily = model["portfolio_returns"][rng.integers(0, len(model["portfolio_returns"]), (size, horizon))]
+    else:
+        # Normale multivariée : r = mu + L z (Cholesky), projetée directement sur les poids :
+        # w'(mu + L z) = w'mu + (L'w)'z, sans matérialiser les rendements de chaque actif
+        shocks = rng.standard_normal((size, horizon, len(model["loading"])))
+        daily = shocks @ model["loading"] + model["drift"]
+    np.log1p(np.maximum(daily, -0.999999), out=daily)
+    return np.cumsum(daily, axis=1, out=daily)
+
+
+def _histograms(log_growth, edges):
+    """Compte les chemins par (jour, case) et par case finale"""
+    band_lo, band_width, term_lo, term_width = edges
+    horizon = log_growth.shape[1]
+    bins = np.clip(((log_growth - band_lo) / band_width).astype(np.int64), 0, BAND_BINS - 1)
+    bins += np.arange(horizon) * BAND_BINS
+    band_counts = np.bincount(bins.ravel(), minlength=horizon * BAND_BINS).reshape(horizon, BAND_BINS)
+
+    final = log_growth[:, -1]
+    term_bins = np.clip(((final - term_lo) / term_width).astype(np.int64), 0, TERMINAL_BINS - 1)
+    term_counts = np.bincount(term_bins, minlength=TERMINAL_BINS)
+    return band_counts, term_counts, int(np.sum(final < 0)), float(np.sum(np.expm1(final)))
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _run_batch(task):
+    seed, size, horizon, edges = task
+    model = _worker_model
+    log_growth = _batch_log_growth(model, size, horizon, np.random.default_rng(seed))
+    return _histograms(log_growth, edges)
+
+
+# --- STATISTIQUES À PARTIR DES HISTOGRAMMES ---
+def _merge(partials, horizon):
+    """Additionne les histogrammes et compteurs des lots"""
+    band_counts = np.zeros((horizon, BAND_BINS), dtype=np.int64)
+    term_counts = np.zeros(TERMINAL_BINS, dtype=np.int64)
+    n_loss, sum_return = 0, 0.0
+    for bands, terminal, losses, total in partials:
+        band_counts += bands
+        term_counts += terminal
+        n_loss += losses
+        sum_return += total
+    return band_counts, term_counts, n_loss, sum_return
+
+
+def _quantiles(counts, lo, width, probs):
+    """Quantiles (interpolés dans la case) d'un ou plusieurs histogrammes (dernier axe = cases)"""
+    cumulative = np.cumsum(counts, axis=-1)
+    total = cumulative[..., -1:]
+    out = []
+    for p in probs:
+        target = p * total
+        idx = np.minimum((cumulative < target).sum(axis=-1, keepdims=True), counts.shape[-1] - 1)
+        before = np.take_along_axis(cumulative, idx, -1) - np.take_along_axis(counts, idx, -1)
+        inside = np.take_along_axis(counts, idx, -1)
+        frac = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.5)
+        out.append((lo + (idx + frac) * width)[..., 0])
+    return out
+
+
+def _model(returns, weights, method):
+    returns = np.asarray(returns, dtype="float64")
+    weights = np.asarray(weights, dtype="float64")
+    if method == "bootstrap":
+        return {"method": method, "portfolio_returns": returns @ weights}
+    if method == "normal":
+        cov = np.cov(returns, rowvar=False)
+        # Petit jitter sur la diagonale si la covariance est numériquement semi-définie
+        jitter = 1e-12 * np.trace(cov) / len(cov)
+        cholesky = np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        return {"method": method, "drift": returns.mean(axis=0) @ weights, "loading": cholesky.T @ weights}
+    raise ValueError(f"Méthode Monte Carlo inconnue : {method}")
+
+
+# --- POINT D'ENTRÉE ---
+def simulate(returns, weights, horizon=252, n_paths=100_000, method="bootstrap", batch_size=10_000,
+             seed=0, workers=1, initial_capital=10000, alpha=0.05, percentiles=(5, 25, 50, 75, 95)):
+    """Simule `n_paths` trajectoires sur `horizon` jours -> bandes de percentiles, VaR, CVaR, P(perte)"""
+    model = _model(returns, weights, method)
+    n_assets = np.asarray(returns).shape[1]
+    if method == "normal":
+        batch_size = max(1, min(batch_size, BATCH_MEMORY // (8 * horizon * n_assets)))
+
+    # Graines indépendantes par lot : résultat identique quel que soit le nombre de workers
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+
+    # Lot pilote : fixe les bornes des histogrammes (avec une marge de 50%)
+    pilot = _batch_log_growth(model, min(batch_size, 2_000), horizon, np.random.default_rng(seeds[-1]))
+    band_lo, band_hi = pilot.min(), pilot.max()
+    term_lo, term_hi = pilot[:, -1].min(), pilot[:, -1].max()
+    band_margin = max(0.5 * (band_hi - band_lo), 1e-6)
+    term_margin = max(0.5 * (term_hi - term_lo), 1e-6)
+    band_lo, band_hi = min(band_lo, 0.0) - band_margin, max(band_hi, 0.0) + band_margin
+    term_lo, term_hi = term_lo - term_margin, term_hi + term_margin
+    edges = (band_lo, (band_hi - band_lo) / BAND_BINS, term_lo, (term_hi - term_lo) / TERMINAL_BINS)
+
+    tasks = [(s, size, horizon, edges) for s, size in zip(seeds, sizes)]
+    if workers == 1:
+        _init_worker(model)
+        band_counts, term_counts, n_loss, sum_return = _merge(map(_run_batch, tasks), horizon)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as executor:
+            band_counts, term_counts, n_loss, sum_return = _merge(executor.map(_run_batch, tasks), horizon)
+
+    # Bandes de percentiles (jour 0 = capital initial)
+    levels = _quantiles(band_counts, edges[0], edges[1], [p / 100 for p in percentiles])
+    bands = pd.DataFrame(
+        {f"p{p}": initial_capital * np.exp(np.concatenate([[0.0], level])) for p, level in zip(percentiles, levels)}
+    )
+    bands.index.name = "Jour"
+
+    # VaR / CVaR sur le rendement final
+    centers = np.expm1(term_lo + (np.arange(TERMINAL_BINS) + 0.5) * edges[3])
+    var_log = _quantiles(term_counts, term_lo, edges[3], [alpha])[0]
+    var_return = float(np.expm1(var_log))
+    tail = centers <= var_return
+    tail_count = term_counts[tail].sum()
+    cvar_return = float((term_counts[tail] * centers[tail]).sum() / tail_count) if tail_count else var_return
+
+    return MonteCarloResult(
+        bands=bands,
+        var=-var_return * 100,
+        cvar=-cvar_return * 100,
+        prob_loss=n_loss / n_paths,
+        expected_value=initial_capital * (1 + sum_return / n_paths),
+        n_paths=n_paths,
+    )
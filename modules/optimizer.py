@@ -0,0 +1,233 @@
+import numpy as np
+import pandas as pd
+
+# Allocation de portefeuille : la covariance est calculée une fois, puis réutilisée par tous les solveurs.
+# Contraintes : long-only avec bornes par actif (lower <= w <= upper, somme des poids = 1).
+
+FRONTIER_MEMORY = 64 * 1024 * 1024  # Octets max par lot de portefeuilles aléatoires
+FRONTIER_TOL = 1e-8  # Précision des points de la frontière (affichage), plus lâche que les allocations
+
+
+# --- ESTIMATION ---
+def covariance(returns, shrinkage=True, periods_per_year=252):
+    """Covariance annualisée, avec shrinkage de Ledoit-Wolf vers l'identité -> (matrice, intensité)"""
+    x = np.asarray(returns, dtype="float64")
+    x = x - x.mean(axis=0)
+    n_obs, n_assets = x.shape
+    sample = x.T @ x / n_obs
+    if not shrinkage:
+        return sample * periods_per_year, 0.0
+
+    target = np.trace(sample) / n_assets
+    d2 = np.sum((sample - target * np.eye(n_assets)) ** 2)
+    # b² = (1/T²) * somme_t ||x_t x_t' - S||² = (moyenne_t |x_t|⁴ - ||S||²) / T
+    b2 = (np.mean(np.sum(x ** 2, axis=1) ** 2) - np.sum(sample ** 2)) / n_obs
+    intensity = 0.0 if d2 == 0 else min(max(b2, 0.0), d2) / d2
+    shrunk = (1 - intensity) * sample
+    shrunk[np.diag_indices(n_assets)] += intensity * target
+    return shrunk * periods_per_year, intensity
+
+
+def estimate(returns, shrinkage=True, periods_per_year=252):
+    """Rendements moyens annualisés et covariance (à calculer une seule fois par jeu de données)"""
+    mu = np.asarray(returns, dtype="float64").mean(axis=0) * periods_per_year
+    cov, _ = covariance(returns, shrinkage, periods_per_year)
+    return mu, cov
+
+
+# --- CONTRAINTES ---
+def _bounds(n_assets, lower, upper):
+    lower = np.broadcast_to(np.asarray(lower, dtype="float64"), (n_assets,))
+    upper = np.broadcast_to(np.asarray(upper, dtype="float64"), (n_assets,))
+    if lower.sum() > 1 + 1e-9 or upper.sum() < 1 - 1e-9 or np.any(lower > upper):
+        raise ValueError("Contraintes de poids impossibles (somme des bornes incompatible avec 100%)")
+    return lower, upper
+
+
+def project(v, lower=0.0, upper=1.0):
+    """Projection (ligne par ligne) sur {somme = 1, lower <= w <= upper}, par dichotomie sur le décalage"""
+    v = np.asarray(v, dtype="float64")
+    lower, upper = _bounds(v.shape[-1], lower, upper)
+    lo = (v - upper).min(axis=-1, keepdims=True)
+    hi = (v - lower).max(axis=-1, keepdims=True)
+    for _ in range(60):
+        tau = (lo + hi) / 2
+        too_big = np.clip(v - tau, lower, upper).sum(axis=-1, keepdims=True) > 1
+        lo = np.where(too_big, tau, lo)
+        hi = np.where(too_big, hi, tau)
+    return np.clip(v - (lo + hi) / 2, lower, upper)
+
+
+# --- SOLVEURS ---
+def _step(cov):
+    """Pas du gradient : 1 / constante de Lipschitz de w'Σw (calculé une fois par covariance)"""
+    return 1.0 / (2 * np.linalg.eigvalsh(cov)[-1])
+
+
+def _solve_qp(cov, mu, risk_aversion_inv, lower, upper, start=None, step=None, max_iter=5000, tol=1e-10):
+    """min w'Σw - λ μ'w sous contraintes, par gradient projeté accéléré (FISTA)"""
+    step = _step(cov) if step is None else step
+    w = project(np.full(len(mu), 1 / len(mu)) if start is None else start, lower, upper)
+    y, t = w.copy(), 1.0
+    for _ in range(max_iter):
+        grad = 2 * cov @ y - risk_aversion_inv * mu
+        w_next = project(y - step * grad, lower, upper)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + ((t - 1) / t_next) * (w_next - w)
+        if np.sum((w_next - w) ** 2) < tol:
+            return w_next
+        w, t = w_next, t_next
+    return w
+
+
+def portfolio_stats(weights, mu, cov, risk_free=0.0):
+    """(rendement, volatilité, Sharpe) annualisés d'un ou plusieurs portefeuilles (lignes)"""
+    weights = np.asarray(weights, dtype="float64")
+    ret = weights @ mu
+    vol = np.sqrt(np.maximum(np.sum((weights @ cov) * weights, axis=-1), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, (ret - risk_free) / vol, 0.0)
+    return ret, vol, sharpe
+
+
+def min_variance(mu, cov, lower=0.0, upper=1.0):
+    """Portefeuille de variance minimale"""
+    return _solve_qp(cov, mu, 0.0, lower, upper)
+
+
+def _max_excess(excess, lower, upper):
+    """Plus grand rendement excédentaire atteignable sous contraintes (remplissage glouton depuis les bornes basses)"""
+    w, budget = lower.copy(), 1 - lower.sum()
+    for i in np.argsort(-excess):
+        add = min(upper[i] - lower[i], budget)
+        w[i] += add
+        budget -= add
+    return excess @ w
+
+
+def max_sharpe(mu, cov, lower=0.0, upper=1.0, risk_free=0.0, max_iter=20000, tol=1e-8):
+    """Portefeuille tangent en une seule résolution : min y'Σy sous (μ - rf)'y = 1, puis w = y / somme(y).
+    Si aucun portefeuille n'a un rendement excédentaire positif, renvoie le minimum de variance : un Sharpe
+    négatif s'améliore quand la volatilité augmente et ne classe plus les portefeuilles."""
+    n_assets = len(mu)
+    lower, upper = _bounds(n_assets, lower, upper)
+    excess = np.asarray(mu, dtype="float64") - risk_free
+    if _max_excess(excess, lower, upper) <= 0:
+        return min_variance(mu, cov, lower, upper)
+
+    # Forme homogène (y = κw, κ = somme(y) >= 0) : les bornes deviennent lower·κ <= y <= upper·κ, soit G y >= 0
+    # avec G = [1' ; I - lower 1' ; upper 1' - I (actifs plafonnés)]. Une borne haute implicite (déjà garantie
+    # par les autres bornes basses) est omise. G n'est jamais formée : ses produits coûtent O(n)
+    capped = np.flatnonzero(upper < 1 - (lower.sum() - lower))
+    capped_upper = upper[capped]
+
+    def g(y):
+        total = y.sum()
+        return np.concatenate([[total], y - lower * total, capped_upper * total - y[capped]])
+
+    def g_t(v):
+        free, caps = v[1:n_assets + 1], v[n_assets + 1:]
+        out = free + (v[0] - lower @ free + capped_upper @ caps)
+        out[capped] -= caps
+        return out
+
+    ones = np.ones(n_assets)
+    floors = np.eye(n_assets) - np.outer(lower, ones)
+    gram = np.outer(ones, ones) + floors.T @ floors
+    if len(capped):
+        caps = np.outer(capped_upper, ones) - np.eye(n_assets)[capped]
+        gram += caps.T @ caps
+
+    # ADMM sur z = G y >= 0 : le système linéaire (2Σ + ρG'G) est inversé une fois pour toutes
+    rho = 10 * np.trace(cov) / n_assets
+    system = np.linalg.inv(2 * cov + rho * gram)
+    direction = system @ excess
+    direction /= excess @ direction
+    z, u = np.zeros(1 + n_assets + len(capped)), np.zeros(1 + n_assets + len(capped))
+    for _ in range(max_iter):
+        y = system @ (rho * g_t(z - u))
+        y += (1 - excess @ y) * direction  # Contrainte (μ - rf)'y = 1
+        gy = g(y)
+        z_prev = z
+        z = np.maximum(gy + u, 0.0)
+        u += gy - z
+        scale = max(1.0, np.abs(y).max())
+        if np.abs(gy - z).max() < tol * scale and np.abs(z - z_prev).max() < tol * scale:
+            break
+    # Le résidu d'ADMM peut laisser y légèrement hors des bornes : projection exacte (somme = 1)
+    return project(y / y.sum(), lower, upper)
+
+
+def risk_parity(cov, lower=0.0, upper=1.0, budget=None, max_iter=500, tol=1e-10):
+    """Parité de risque (contributions égales) par descente coordonnée cyclique, puis bornes"""
+    n_assets = len(cov)
+    budget = np.full(n_assets, 1 / n_assets) if budget is None else np.asarray(budget, dtype="float64")
+    diag = np.diag(cov)
+    y = 1 / np.sqrt(diag)
+    y /= y.sum()
+    cov_y = cov @ y
+    for _ in range(max_iter):
+        previous = y.copy()
+        for i in range(n_assets):
+            # Minimise 0.5 y'Σy - Σ b log(y) en y_i (racine positive du trinôme)
+            others = cov_y[i] - diag[i] * y[i]
+            new = (-others + np.sqrt(others ** 2 + 4 * diag[i] * budget[i])) / (2 * diag[i])
+            cov_y += cov[:, i] * (new - y[i])
+            y[i] = new
+        if np.sum((y - previous) ** 2) < tol * np.sum(y ** 2):
+            break
+    return project(y / y.sum(), lower, upper)
+
+
+# --- FRONTIÈRE EFFICIENTE ---
+def efficient_frontier(mu, cov, n_points=30, lower=0.0, upper=1.0, tol=FRONTIER_TOL):
+    """Points (rendement, volatilité) de la frontière, du minimum de variance au rendement maximal"""
+    points, w, step = [], None, _step(cov)
+    for log_lam in np.linspace(-12, 8, n_points):
+        w = _solve_qp(cov, mu, np.exp(log_lam), lower, upper, start=w, step=step, tol=tol)
+        ret, vol, _ = portfolio_stats(w, mu, cov)
+        points.append((ret, vol))
+    return pd.DataFrame(points, columns=["return", "volatility"]).drop_duplicates().sort_values("volatility")
+
+
+def random_portfolios(mu, cov, n_portfolios=50_000, lower=0.0, upper=1.0, risk_free=0.0, seed=0,
+                      memory=FRONTIER_MEMORY):
+    """Nuage de portefeuilles aléatoires évalués par lots (produit matriciel), mémoire bornée"""
+    n_assets = len(mu)
+    rng = np.random.default_rng(seed)
+    batch = max(1, memory // (3 * 8 * n_assets))
+    constrained = np.any(np.asarray(lower) > 0) or np.any(np.asarray(upper) < 1)
+
+    results = np.empty((n_portfolios, 3))
+    best = {"sharpe": (-np.inf, None), "volatility": (np.inf, None)}
+    for start in range(0, n_portfolios, batch):
+        size = min(batch, n_portfolios - start)
+        weights = rng.dirichlet(np.ones(n_assets), size=size)
+        if constrained:
+            weights = project(weights, lower, upper)
+        ret, vol, sharpe = portfolio_stats(weights, mu, cov, risk_free)
+        results[start:start + size] = np.column_stack([ret, vol, sharpe])
+
+        i, j = np.argmax(sharpe), np.argmin(vol)
+        if sharpe[i] > best["sharpe"][0]:
+            best["sharpe"] = (sharpe[i], weights[i].copy())
+        if vol[j] < best["volatility"][0]:
+            best["volatility"] = (vol[j], weights[j].copy())
+
+    cloud = pd.DataFrame(results, columns=["return", "volatility", "sharpe"])
+    return cloud, best["sharpe"][1], best["volatility"][1]
+
+
+# --- POINT D'ENTRÉE ---
+ALLOCATIONS = {
+    "min_variance": lambda mu, cov, lower, upper: min_variance(mu, cov, lower, upper),
+    "max_sharpe": lambda mu, cov, lower, upper: max_sharpe(mu, cov, lower, upper),
+    "risk_parity": lambda mu, cov, lower, upper: risk_parity(cov, lower, upper),
+}
+
+
+def optimize(returns, method, lower=0.0, upper=1.0, shrinkage=True):
+    """Poids optimaux {actif: poids} pour une méthode de ALLOCATIONS"""
+    mu, cov = estimate(returns, shrinkage)
+    weights = ALLOCATIONS[method](mu, cov, lower, upper)
+    return dict(zip(returns.columns, weights))
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules.execution import ExecutionModel
+
+
+# --- CALCULS PORTEFEUILLE (sans affichage) ---
+def normalize_weights(weights_input):
+    """Ramène les poids saisis à un total de 100% (répartition équitable si tout est à 0)"""
+    total = sum(weights_input.values())
+    if total == 0:
+        return {k: 1 / len(weights_input) for k in weights_input}
+    return {k: v / total for k, v in weights_input.items()}
+
+
+def simulate_portfolio(prices, weights, initial_capital=10000):
+    """Rendements journaliers du portefeuille et capital cumulé (portefeuille + actifs seuls)"""
+    returns = prices.pct_change().dropna()
+    portfolio_returns = returns.dot(pd.Series(weights))
+    portfolio_cumulative = (1 + portfolio_returns).cumprod() * initial_capital
+    assets_cumulative = (1 + returns).cumprod() * initial_capital
+    return returns, portfolio_returns, portfolio_cumulative, assets_cumulative
+
+
+def portfolio_metrics(portfolio_returns, portfolio_cumulative, initial_capital=10000, periods_per_year=252):
+    """Rendement global, volatilité annualisée et Sharpe du portefeuille"""
+    total_return = (portfolio_cumulative.iloc[-1] / initial_capital) - 1
+    std = portfolio_returns.std()
+    annual_vol = std * np.sqrt(periods_per_year)
+    sharpe = (portfolio_returns.mean() / std) * np.sqrt(periods_per_year) if std != 0 else 0
+    return {"total_return": total_return, "annual_vol": annual_vol, "sharpe": sharpe}
+
+
+# --- BACKTEST AVEC RÉÉQUILIBRAGE ---
+# Entre deux rééquilibrages, chaque ligne détenue suit son propre actif (les poids dérivent) : les
+# avoirs d'un segment sont le produit cumulé des rendements depuis le dernier rééquilibrage, calculé
+# en bloc pour tous les actifs. Aux dates de rééquilibrage on revient aux poids cibles, frais déduits.
+# Le portefeuille est constitué à la clôture de la 1re barre ; pas d'ordre sur la dernière barre.
+
+REBALANCE_FREQUENCIES = {"weekly": "W", "monthly": "M", "quarterly": "Q"}
+REBALANCE_MODES = ("none", "daily", *REBALANCE_FREQUENCIES, "threshold")
+THRESHOLD_LOOKAHEAD = 256  # Barres examinées par bloc pour trouver le prochain dépassement de seuil
+
+
+@dataclass
+class PortfolioResult:
+    returns: pd.Series        # Rendements nets du portefeuille (à partir de la 2e barre)
+    equity: pd.Series         # Capital net de frais à chaque clôture
+    holdings: pd.DataFrame    # Montant détenu par actif ($) à chaque clôture, après rééquilibrage
+    turnover: pd.Series       # Montant échangé à chaque clôture (fraction du capital)
+    costs: pd.Series          # Frais payés ($)
+    rebalances: pd.DatetimeIndex
+    metrics: dict
+
+    @property
+    def weights(self):
+        """Poids effectifs à chaque clôture"""
+        return self.holdings.div(self.holdings.sum(axis=1), axis=0)
+
+
+def rebalance_positions(index, rebalance):
+    """Positions des clôtures de rééquilibrage calendaire (dernière barre de chaque semaine / mois / trimestre)"""
+    if rebalance not in REBALANCE_FREQUENCIES:
+        raise ValueError(f"Fréquence de rééquilibrage inconnue : {rebalance} (choix : {', '.join(REBALANCE_FREQUENCIES)})")
+    periods = pd.DatetimeIndex(index).to_period(REBALANCE_FREQUENCIES[rebalance]).asi8
+    return np.flatnonzero(periods[1:] != periods[:-1])
+
+
+def _order_costs(execution, amounts, scale):
+    """Frais d'un rééquilibrage : proportionnels au montant échangé + fixes par actif traité"""
+    return execution.cost_rate * amounts.sum(axis=-1) + execution.fixed_fee * np.count_nonzero(amounts > 1e-12 * scale, axis=-1)
+
+
+def _daily(growth, target, capital, execution):
+    """Rééquilibrage à chaque clôture, en forme fermée : E_t = a_t E_(t-1) - b_t"""
+    gross = growth @ target                                   # w . G_t
+    drift = np.abs(target - target * growth / gross[:, None])  # Écart aux poids cibles avant l'ordre
+    drift[-1] = 0.0                                           # Pas d'ordre sur la dernière barre
+    a = gross * (1 - execution.cost_rate * drift.sum(axis=1))
+    b = execution.fixed_fee * np.count_nonzero(drift > 1e-12, axis=1)
+    start = capital - _order_costs(execution, target * capital, capital)
+    cumulative = np.cumprod(a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equity = cumulative * (start - np.cumsum(b / cumulative))
+    equity = np.concatenate([[start], equity])
+
+    holdings = target * equity[:, None]
+    holdings[-1] = target * growth[-1] * equity[-2]
+    turnover = np.concatenate([[target.sum()], drift.sum(axis=1)])
+    costs = np.concatenate([[capital - start], equity[:-1] * gross * execution.cost_rate * drift.sum(axis=1) + b])
+    return holdings, equity, turnover, costs
+
+
+def backtest_portfolio(prices, weights, initial_capital=10000, rebalance="monthly", threshold=0.05, execution=None,
+                       periods_per_year=252):
+    """Backtest multi-actifs : 'none' (dérive), 'daily', 'weekly' / 'monthly' / 'quarterly', ou 'threshold' (écart max > seuil)"""
+    if rebalance not in REBALANCE_MODES:
+        raise ValueError(f"Mode de rééquilibrage inconnu : {rebalance} (choix : {', '.join(REBALANCE_MODES)})")
+    execution = ExecutionModel() if execution is None else execution
+    assets = list(weights)
+    target = np.array([weights[a] for a in assets], dtype="float64")
+    values = prices[assets].to_numpy(dtype="float64")
+    growth = np.nan_to_num(values[1:] / values[:-1], nan=1.0)  # Facteur de croissance de la barre t-1 -> t
+    n_bars, last = len(values), len(values) - 1
+    if n_bars < 2:
+        raise ValueError("Historique insuffisant pour un backtest de portefeuille (2 barres minimum)")
+
+    if rebalance == "daily":
+        holdings, equity, turnover, costs = _daily(growth, target, initial_capital, execution)
+    else:
+        holdings = np.empty((n_bars, len(assets)))
+        turnover, costs = np.zeros(n_bars), np.zeros(n_bars)
+        # Constitution du portefeuille à la 1re clôture
+        costs[0] = _order_costs(execution, target * initial_capital, initial_capital)
+        turnover[0] = target.sum()
+        holdings[0] = target * (initial_capital - costs[0])
+        calendar = rebalance_positions(prices.index, rebalance) if rebalance in REBALANCE_FREQUENCIES else None
+
+        start = 0
+        while start < last:
+            if calendar is not None:
+                k = np.searchsorted(calendar, start, side="right")
+                stop = int(calendar[k]) if k < len(calendar) else last
+            else:
+                stop = last if rebalance == "none" else min(start + THRESHOLD_LOOKAHEAD, last)
+            block = holdings[start] * np.cumprod(growth[start:stop], axis=0)
+            trade = calendar is not None and stop < last
+            if rebalance == "threshold":
+                drift = np.abs(block / block.sum(axis=1, keepdims=True) - target).max(axis=1)
+                breach = np.flatnonzero(drift > threshold)
+                if len(breach):
+                    stop = start + 1 + int(breach[0])
+                    block = block[:breach[0] + 1]
+                    trade = stop < last
+            holdings[start + 1:stop + 1] = block
+
+            if trade:
+                # Retour aux poids cibles : frais calculés sur les ordres, déduits du capital avant répartition
+                value = block[-1].sum()
+                amounts = np.abs(target * value - block[-1])
+                costs[stop] = _order_costs(execution, amounts, value)
+                turnover[stop] = amounts.sum() / value
+                holdings[stop] = target * (value - costs[stop])
+            start = stop
+        equity = holdings.sum(axis=1)
+
+    index = prices.index
+    equity = pd.Series(equity, index=index, name="equity")
+    returns = equity.pct_change().iloc[1:]
+    traded_bars = np.flatnonzero(turnover[1:]) + 1
+    years = max(last, 1) / periods_per_year
+    metrics = {
+        "n_rebalances": len(traded_bars),
+        "annual_turnover": float(turnover[1:].sum() / years),
+        "total_costs": float(costs.sum()),
+        "cost_pct": float(costs.sum() / initial_capital * 100),
+    }
+    return PortfolioResult(
+        returns=returns,
+        equity=equity,
+        holdings=pd.DataFrame(holdings, index=index, columns=assets),
+        turnover=pd.Series(turnover, index=index, name="turnover"),
+        costs=pd.Series(costs, index=index, name="costs"),
+        rebalances=index[traded_bars],
+        metrics=metrics,
+    )
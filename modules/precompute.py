@@ -0,0 +1,223 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+from modules.backtest import backtest, make_strategy
+from modules.bar_store import periods_per_year
+from modules.compute_cache import CODE_VERSION, ComputeCache, cached, fingerprint, get_cache, set_cache
+from modules.execution import ExecutionModel
+from modules.forecasting import forecast
+from modules.optimizer import efficient_frontier, estimate, random_portfolios
+from modules.portfolio import backtest_portfolio, normalize_weights
+from modules.profiling import span
+from modules.rolling import rolling_stats
+
+# Précalcul des vues les plus consultées : chaque vue rejoue les appels cached() de sa page avec les
+# réglages par défaut (mêmes arguments, donc mêmes clés), dans le cache persistant (QUANT_CACHE_DIR).
+# Une page ouverte avec ces réglages lit alors ses résultats sur disque au lieu de les calculer.
+# L'état de chaque vue (empreinte des données et du code, date de calcul, durée, erreur, clés du
+# cache utilisées) est gardé dans precompute_state.json : une vue dont les données et le code n'ont
+# pas changé n'est pas recalculée, et les fichiers que plus aucune vue n'utilise sont supprimés.
+
+STATE_FILE = "precompute_state.json"
+
+
+# --- VUES ---
+@dataclass
+class AnalysisView:
+    """Market Analyst : symbole + stratégie (valeurs par défaut = réglages par défaut de la page)"""
+    ticker: str = "BTC-USD"
+    period: str = "2y"
+    interval: str = "1d"
+    source: str = None
+    strategy: str = "golden_cross"
+    params: dict = field(default_factory=dict)
+    capital: int = 10000
+    model: str = "ridge"
+    horizon: int = 30
+    level: int = 90  # Intervalle de confiance (%)
+
+    @property
+    def id(self):
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"quant_a {self.ticker} {self.period} {self.interval} {self.strategy}({params})"
+
+    def load(self, store):
+        return store.get_history(self.ticker, period=self.period, interval=self.interval, source=self.source)
+
+    def compute(self, data):
+        """Indicateurs, backtest et prévision, comme quant_a.run()"""
+        if data.empty:
+            raise ValueError("Aucune donnée")
+        close = data["Close"]
+        ppy = periods_per_year(data.index, self.interval)
+        strategy = make_strategy(self.strategy, **self.params)
+        signals, _ = cached("indicators", strategy.compute, close.values)
+        cached("backtest", backtest, close.values, signals, self.capital, ppy, ExecutionModel())
+        cached("forecast", forecast, close, self.model, self.horizon, self.level / 100)
+
+
+@dataclass
+class PortfolioView:
+    """Portfolio Manager : panier à poids égaux (sliders par défaut) et analyses de la page"""
+    tickers: list = field(default_factory=lambda: ["BTC-USD", "AAPL", "GC=F"])
+    period: str = "2y"
+    interval: str = "1d"
+    source: str = None
+    rebalance: str = "monthly"
+    threshold: int = 5       # Seuil de dérive (points de %)
+    cost_bps: float = 0.0
+    capital: int = 10000
+    n_portfolios: int = 10000
+    rolling_window: int = 60
+
+    @property
+    def id(self):
+        return f"quant_b {'+'.join(self.tickers)} {self.period} {self.interval} {self.rebalance}"
+
+    def load(self, store):
+        data = store.get_close(self.tickers, period=self.period, interval=self.interval, source=self.source)
+        return data.ffill().dropna()
+
+    def compute(self, data):
+        """Backtest du portefeuille, corrélations, frontière efficiente et analyse glissante, comme quant_b.run()"""
+        if data.empty:
+            raise ValueError("Aucune donnée")
+        ppy = periods_per_year(data.index, self.interval)
+        weights = normalize_weights({ticker: 100 // len(self.tickers) for ticker in self.tickers})
+        returns = data.pct_change().dropna()
+        cached("portfolio", backtest_portfolio, data, weights, self.capital, self.rebalance, self.threshold / 100,
+               ExecutionModel(commission_bps=self.cost_bps), ppy)
+        cached("correlation", pd.DataFrame.corr, returns)
+        mu, cov = cached("estimate", estimate, returns, periods_per_year=ppy)
+        cached("random_portfolios", random_portfolios, mu, cov, self.n_portfolios)
+        cached("frontier", efficient_frontier, mu, cov)
+        cached("rolling", rolling_stats, returns, self.rolling_window, benchmark=returns.columns[0], periods_per_year=ppy)
+
+
+DEFAULT_VIEWS = [AnalysisView(), PortfolioView()]
+
+
+def load_views(path):
+    """Vues depuis un fichier JSON : {"analysis": [{...}], "portfolios": [{...}]}"""
+    with open(path, "r") as f:
+        config = json.load(f)
+    return ([AnalysisView(**item) for item in config.get("analysis", [])]
+            + [PortfolioView(**item) for item in config.get("portfolios", [])])
+
+
+# --- ÉTAT (fraîcheur par vue) ---
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}  # Fichier illisible : tout sera recalculé
+
+
+def save_state(state, path):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def state_table(state):
+    """État lisible : une ligne par vue, âge du calcul en heures"""
+    if not state:
+        return pd.DataFrame()
+    table = pd.DataFrame.from_dict(state, orient="index").reindex(
+        columns=["status", "last_bar", "computed_at", "seconds", "error"])
+    table["age_h"] = (time.time() - table["computed_at"]) / 3600
+    return table[["status", "last_bar", "age_h", "seconds", "error"]].sort_index()
+
+
+# --- CALCUL (processus du pool) ---
+def _init_worker(cache_dir, nice):
+    set_cache(ComputeCache(cache_dir=cache_dir))
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)  # Priorité basse : les requêtes de l'application passent avant
+
+
+def _compute(view, data):
+    """Calcule une vue -> (durée, erreur ou None, clés du cache) ; une erreur n'arrête pas les autres vues"""
+    start = time.perf_counter()
+    with get_cache().record_keys() as keys:
+        try:
+            view.compute(data)
+            error = None
+        except Exception as e:
+            error = str(e)
+    return time.perf_counter() - start, error, sorted(keys)
+
+
+def _referenced(state):
+    return {key for entry in state.values() for key in entry.get("keys", [])}
+
+
+def prune(state, views, previous_keys):
+    """Oublie les vues retirées et supprime les fichiers du cache qu'aucune vue actuelle n'utilise plus"""
+    current = {view.id for view in views}
+    for view_id in [view_id for view_id in state if view_id not in current]:
+        del state[view_id]
+    return get_cache().remove(previous_keys - _referenced(state))
+
+
+# --- ORDONNANCEMENT ---
+def run_precompute(views, store, cache_dir, workers=1, nice=10, force=False):
+    """Recalcule les vues dont les données ou le code ont changé -> {id de vue: 'calculé' / 'à jour' / 'erreur'}"""
+    state_path = os.path.join(cache_dir, STATE_FILE)
+    state = load_state(state_path)
+    previous_keys = _referenced(state)  # Fichiers écrits par les précalculs précédents
+    _init_worker(cache_dir, 0)
+
+    # 1. Données : rafraîchies ici, une fois par vue ; le pool ne fait que calculer
+    pending, outcome = [], {}
+    for view in views:
+        with span("precompute.data", view=view.id):
+            try:
+                data = view.load(store)
+            except Exception as e:
+                state[view.id] = {**state.get(view.id, {}), "status": "erreur", "error": str(e), "checked_at": time.time()}
+                outcome[view.id] = "erreur"
+                continue
+        inputs = fingerprint(CODE_VERSION, asdict(view), data)  # Un déploiement force le recalcul
+        previous = state.get(view.id, {})
+        if not force and previous.get("inputs") == inputs and previous.get("status") == "ok":
+            previous["checked_at"] = time.time()
+            outcome[view.id] = "à jour"
+            continue
+        last_bar = str(data.index[-1]) if len(data) else None
+        pending.append((view, data, inputs, last_bar))
+
+    # 2. Calculs : pool borné (ou ce processus si workers=1), état enregistré après chaque vue
+    def record(view, inputs, last_bar, seconds, error, keys):
+        state[view.id] = {
+            "inputs": inputs, "last_bar": last_bar, "computed_at": time.time(), "checked_at": time.time(),
+            "seconds": round(seconds, 3), "status": "ok" if error is None else "erreur", "error": error,
+            "keys": keys,
+        }
+        outcome[view.id] = "calculé" if error is None else "erreur"
+        save_state(state, state_path)
+
+    if workers == 1 or len(pending) <= 1:
+        for view, data, inputs, last_bar in pending:
+            with span("precompute.view", view=view.id):
+                record(view, inputs, last_bar, *_compute(view, data))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir, nice)) as pool:
+            futures = {pool.submit(_compute, view, data): (view, inputs, last_bar) for view, data, inputs, last_bar in pending}
+            for future in as_completed(futures):
+                record(*futures[future], *future.result())
+
+    # 3. Ménage : résultats des anciennes données, de l'ancien code ou des vues retirées
+    prune(state, views, previous_keys)
+    save_state(state, state_path)
+    return outcome
@@ -0,0 +1,128 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+# Chronométrage des étapes (téléchargement, nettoyage, indicateurs, backtest, graphiques...) :
+# `with span("indicators"):` n'enregistre rien tant qu'aucun enregistrement n'est actif dans le thread
+# courant (une lecture d'attribut thread-local), sinon ajoute un intervalle à la trace en cours.
+
+_NULL_SPAN = nullcontext()
+
+
+class _Local(threading.local):
+    trace = None  # Valeur par défaut dans chaque thread (pas d'AttributeError à intercepter)
+
+
+_local = _Local()
+
+
+# --- TRACE ---
+class Trace:
+    """Intervalles enregistrés pendant une exécution (une relance Streamlit, un rapport...)"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []   # (nom, début (s), durée (s), profondeur, temps des enfants (s), args)
+        self.stack = []    # Temps des enfants de chaque intervalle ouvert (pour le temps propre)
+        self.thread_id = threading.get_ident()
+
+    @contextmanager
+    def span(self, name, args=None):
+        start = time.perf_counter()
+        self.stack.append(0.0)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            children = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += duration
+            self.events.append((name, start - self.origin, duration, len(self.stack), children, args))
+
+    @property
+    def total(self):
+        """Durée de l'enregistrement (s)"""
+        return time.perf_counter() - self.origin if self.events else 0.0
+
+    def breakdown(self):
+        """Temps par étape : appels, temps total et temps propre (hors sous-étapes), triés par temps propre"""
+        columns = ["span", "calls", "total_ms", "self_ms", "share_pct"]
+        if not self.events:
+            return pd.DataFrame(columns=columns)
+        table = pd.DataFrame(
+            [(name, duration, duration - children) for name, _, duration, _, children, _ in self.events],
+            columns=["span", "total_ms", "self_ms"],
+        )
+        table = table.groupby("span").agg(calls=("total_ms", "size"), total_ms=("total_ms", "sum"), self_ms=("self_ms", "sum"))
+        table[["total_ms", "self_ms"]] *= 1000
+        table["share_pct"] = table["self_ms"] / table["self_ms"].sum() * 100
+        return table.sort_values("self_ms", ascending=False).reset_index()[columns]
+
+    def to_chrome(self):
+        """Trace au format Chrome (chrome://tracing, Perfetto, speedscope)"""
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": name, "ph": "X", "pid": pid, "tid": self.thread_id,
+                    "ts": round(start * 1e6, 3), "dur": round(duration * 1e6, 3), "args": args or {},
+                }
+                for name, start, duration, _, _, args in sorted(self.events, key=lambda e: e[1])
+            ],
+        }
+
+    def save_chrome(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f)
+
+
+# --- ENREGISTREMENT ---
+def start():
+    """Active l'enregistrement dans le thread courant (remplace une trace précédente) -> Trace"""
+    _local.trace = Trace()
+    return _local.trace
+
+
+def stop():
+    """Désactive l'enregistrement -> Trace terminée (None si rien n'était actif)"""
+    trace = _local.trace
+    _local.trace = None
+    return trace
+
+
+@contextmanager
+def record():
+    """with record() as trace: ... ; trace.breakdown()"""
+    trace = start()
+    try:
+        yield trace
+    finally:
+        stop()
+
+
+def span(name, **args):
+    """Intervalle chronométré ; quasi gratuit quand aucun enregistrement n'est actif"""
+    trace = _local.trace
+    if trace is None:
+        return _NULL_SPAN
+    return trace.span(name, args or None)
+
+
+def timed(name):
+    """Décorateur : chaque appel de la fonction devient un intervalle `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _local.trace
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,47 +1,63 @@
+import os
+
 import streamlit as st
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import numpy as np
-from sklearn.linear_model import LinearRegression
-from datetime import timedelta
-
-# --- FONCTIONS UTILITAIRES (MATHS QUANT) ---
-def calculate_metrics(daily_returns):
-    """Calcule le Sharpe Ratio et le Max Drawdown"""
-    # Sharpe (Hypothèse: 252 jours de trading, taux sans risque ~0 pour simplifier)
-    if daily_returns.std() == 0:
-        sharpe = 0
-    else:
-        sharpe = (daily_returns.mean() / daily_returns.std()) * np.sqrt(252)
-    
-    # Max Drawdown
-    cumulative = (1 + daily_returns).cumprod()
-    peak = cumulative.cummax()
-    drawdown = (cumulative - peak) / peak
-    max_drawdown = drawdown.min() * 100 # En pourcentage
-    
-    return sharpe, max_drawdown
+from modules.market_data import get_store
+from modules.bar_store import is_intraday, periods_per_year
+from modules.sweep import sweep, heatmap_table
+from modules.walk_forward import walk_forward
+from modules.backtest import GoldenCross, RSIStrategy, BollingerBands, BuyAndHold, ExpressionStrategy, backtest
+from modules.execution import ExecutionModel, trade_ledger
+from modules.forecasting import MODEL_LABELS, cross_validate, forecast
+from modules.compute_cache import cached
+from modules.profiling import span
+from modules.downsample import CHART_POINTS, downsample_indices, scatter, shared_indices
+
+# Stratégies optimisables par grid search (libellé UI -> clé de modules.sweep)
+SWEEP_STRATEGIES = {
+    "Moyennes Mobiles (Golden Cross)": "golden_cross",
+    "RSI (Surachat/Survente)": "rsi",
+    "Bandes de Bollinger": "bollinger",
+}
+
+# Processus du walk-forward lancé depuis la page : borné, le serveur Streamlit sert aussi les autres sessions
+WALK_FORWARD_WORKERS = min(4, os.cpu_count() or 1)
+
+# Taille des barres (libellé UI -> (intervalle, intervalle stocké à agréger ou None))
+BAR_INTERVALS = {
+    "1 jour": ("1d", None),
+    "1 heure": ("1h", None),
+    "15 min (agrégées depuis 1 min)": ("15m", "1m"),
+    "5 min": ("5m", None),
+    "1 min": ("1m", None),
+}
 
 def run():
     # 1. TITRE
     st.markdown('<div class="main-title">MARKET ANALYST</div>', unsafe_allow_html=True)
 
     # 2. INPUTS
-    col1, col2, col3 = st.columns([1, 1, 2])
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
     with col1:
         ticker = st.text_input("Symbole", "BTC-USD")
     with col2:
-        period = st.selectbox("Période", ["1y", "2y", "5y", "max"], index=1)
+        interval, source = BAR_INTERVALS[st.selectbox("Barres", list(BAR_INTERVALS))]
     with col3:
+        # En intraday, Yahoo limite la profondeur (30 jours en 1 min) : l'historique s'accumule sur disque
+        periods = ["5d", "1mo", "3mo", "max"] if is_intraday(interval) else ["1y", "2y", "5y", "max"]
+        period = st.selectbox("Période", periods, index=1)
+    with col4:
         strategy_type = st.selectbox(
             "💎 Choisir une Stratégie",
-            ["Moyennes Mobiles (Golden Cross)", "RSI (Surachat/Survente)", "Bandes de Bollinger", "Buy & Hold"]
+            ["Moyennes Mobiles (Golden Cross)", "RSI (Surachat/Survente)", "Bandes de Bollinger", "Expression personnalisée", "Buy & Hold"]
         )
 
     # 3. DONNÉES
     try:
-        data = yf.download(ticker, period=period, progress=False)
+        with span("data.fetch"):
+            data = get_store().get_history(ticker, period=period, interval=interval, source=source)
     except:
         st.error("Erreur de connexion.")
         return
@@ -51,12 +67,19 @@ def run():
         return
 
     # Nettoyage
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
-    df = data.copy()
-    if isinstance(df['Close'], pd.DataFrame):
-        df['Close'] = df['Close'].iloc[:, 0]
+    with span("clean"):
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        df = data.copy()
+        if isinstance(df['Close'], pd.DataFrame):
+            df['Close'] = df['Close'].iloc[:, 0]
     
+    # Annualisation selon la taille des barres (252 en journalier)
+    ppy = periods_per_year(df.index, interval)
+
+    # Points max par graphique (réglage de la barre latérale, 0 = tous)
+    max_points = st.session_state.get("chart_points", CHART_POINTS)
+
     # Initialisation Signal
     df['Signal'] = 0 
 
@@ -72,32 +95,35 @@ def run():
         short_window = c1.slider("Moyenne Courte", 5, 50, 20)
         long_window = c2.slider("Moyenne Longue", 50, 200, 50)
         
-        df['SMA_Short'] = df['Close'].rolling(window=short_window).mean()
-        df['SMA_Long'] = df['Close'].rolling(window=long_window).mean()
-        df['Signal'] = np.where(df['SMA_Short'] > df['SMA_Long'], 1, 0)
+        strategy = GoldenCross(short_window, long_window)
+        with span("indicators"):
+            signals, indicators = cached("indicators", strategy.compute, df['Close'].values)
+        df['SMA_Short'] = indicators['SMA_Short']
+        df['SMA_Long'] = indicators['SMA_Long']
+        df['Signal'] = signals
 
-        # Plot
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Prix', line=dict(color='white', width=1)))
-        fig.add_trace(go.Scatter(x=df.index, y=df['SMA_Short'], name='MA Court', line=dict(color='#00d2ff', width=1)))
-        fig.add_trace(go.Scatter(x=df.index, y=df['SMA_Long'], name='MA Long', line=dict(color='#e056fd', width=1)))
+        # Plot (colonne, nom, style)
+        lines = [
+            ('Close', 'Prix', dict(line=dict(color='white', width=1))),
+            ('SMA_Short', 'MA Court', dict(line=dict(color='#00d2ff', width=1))),
+            ('SMA_Long', 'MA Long', dict(line=dict(color='#e056fd', width=1))),
+        ]
 
     elif strategy_type == "RSI (Surachat/Survente)":
         st.info("ℹ️ RSI : Achat si < Seuil Bas, Vente si > Seuil Haut.")
-        c1, c2, c3 = st.columns(3)
+        c1, c2, c3, c4 = st.columns(4)
         rsi_period = c1.slider("Période", 5, 30, 14)
         overbought = c2.slider("Vente (>)", 50, 90, 70)
         oversold = c3.slider("Achat (<)", 10, 50, 30)
+        smoothing = c4.radio("Lissage", ["simple", "wilder"], horizontal=True)
 
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        df['Signal'] = np.where(df['RSI'] < overbought, 1, 0) # Simplifié
+        strategy = RSIStrategy(rsi_period, overbought, oversold, smoothing)
+        with span("indicators"):
+            signals, indicators = cached("indicators", strategy.compute, df['Close'].values)
+        df['RSI'] = indicators['RSI']
+        df['Signal'] = signals
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Prix', line=dict(color='white')))
+        lines = [('Close', 'Prix', dict(line=dict(color='white')))]
 
     elif strategy_type == "Bandes de Bollinger":
         st.info("ℹ️ Volatilité : Achat bas du range, Vente haut du range.")
@@ -105,39 +131,129 @@ def run():
         window = c1.slider("Période", 10, 50, 20)
         std_dev = c2.slider("Écart-Type", 1.0, 3.0, 2.0)
 
-        rolling_mean = df['Close'].rolling(window=window).mean()
-        rolling_std = df['Close'].rolling(window=window).std()
-        df['Upper'] = rolling_mean + (rolling_std * std_dev)
-        df['Lower'] = rolling_mean - (rolling_std * std_dev)
-        df['Signal'] = np.where(df['Close'] > df['Lower'], 1, 0)
+        strategy = BollingerBands(window, std_dev)
+        with span("indicators"):
+            signals, indicators = cached("indicators", strategy.compute, df['Close'].values)
+        df['Upper'] = indicators['Upper']
+        df['Lower'] = indicators['Lower']
+        df['Signal'] = signals
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Prix', line=dict(color='white')))
-        fig.add_trace(go.Scatter(x=df.index, y=df['Upper'], name='Haut', line=dict(color='rgba(255,100,100,0.3)')))
-        fig.add_trace(go.Scatter(x=df.index, y=df['Lower'], name='Bas', line=dict(color='rgba(100,255,100,0.3)'), fill='tonexty'))
+        lines = [
+            ('Close', 'Prix', dict(line=dict(color='white'))),
+            ('Upper', 'Haut', dict(line=dict(color='rgba(255,100,100,0.3)'))),
+            ('Lower', 'Bas', dict(line=dict(color='rgba(100,255,100,0.3)'), fill='tonexty')),
+        ]
+
+    elif strategy_type == "Expression personnalisée":
+        st.info("ℹ️ Condition d'achat libre : sma, std, rsi, bb_upper / bb_lower, highest / lowest, "
+                "cross_above / cross_below, close[n] (n barres avant), and / or / not.")
+        strategy = ExpressionStrategy(st.text_input("Condition d'achat", ExpressionStrategy().expression))
+        try:
+            with span("indicators"):
+                signals, _ = cached("indicators", strategy.compute, df['Close'].values)
+        except ValueError as e:
+            st.error(f"Expression invalide : {e}")
+            return
+        df['Signal'] = signals
+        lines = [('Close', 'Prix', dict(line=dict(color='#00d2ff')))]
 
     else: # Buy & Hold
-        df['Signal'] = 1
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Prix', line=dict(color='#00d2ff')))
+        strategy = BuyAndHold()
+        with span("indicators"):
+            df['Signal'], _ = cached("indicators", strategy.compute, df['Close'].values)
+        lines = [('Close', 'Prix', dict(line=dict(color='#00d2ff')))]
 
     # Ajout des marqueurs Achat/Vente sur le graphe (Visualisation "Superposée")
     # On détecte les changements de signal (0 -> 1 ou 1 -> 0)
-    df['Position_Change'] = df['Signal'].diff()
-    buys = df[df['Position_Change'] == 1]
-    sells = df[df['Position_Change'] == -1]
-
-    fig.add_trace(go.Scatter(
-        x=buys.index, y=buys['Close'], mode='markers', name='Achat 🟢',
-        marker=dict(symbol='triangle-up', color='#00ff00', size=12)
-    ))
-    fig.add_trace(go.Scatter(
-        x=sells.index, y=sells['Close'], mode='markers', name='Vente 🔴',
-        marker=dict(symbol='triangle-down', color='#ff0000', size=12)
-    ))
-
-    fig.update_layout(title="Analyse & Signaux", template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig, use_container_width=True)
+    with span("chart.signals"):
+        df['Position_Change'] = df['Signal'].diff()
+        buys = df[df['Position_Change'] == 1]
+        sells = df[df['Position_Change'] == -1]
+
+        # Courbes réduites à `max_points` points, les barres d'achat / vente sont toujours conservées
+        markers = np.flatnonzero(df['Position_Change'].fillna(0).to_numpy())
+        chart = df.iloc[shared_indices([df[col] for col, _, _ in lines], max_points, keep=markers)]
+        fig = go.Figure()
+        for col, name, style in lines:
+            fig.add_trace(scatter(chart.index, chart[col], name=name, **style))
+        fig.add_trace(go.Scatter(
+            x=buys.index, y=buys['Close'], mode='markers', name='Achat 🟢',
+            marker=dict(symbol='triangle-up', color='#00ff00', size=12)
+        ))
+        fig.add_trace(go.Scatter(
+            x=sells.index, y=sells['Close'], mode='markers', name='Vente 🔴',
+            marker=dict(symbol='triangle-down', color='#ff0000', size=12)
+        ))
+
+        fig.update_layout(title="Analyse & Signaux", template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Modèle d'exécution (utilisé par le grid search, le walk-forward et le backtest)
+    with st.expander("⚙️ Frais & Taille de Position"):
+        e1, e2, e3, e4 = st.columns(4)
+        commission_bps = e1.number_input("Commission (bps)", 0.0, 100.0, 0.0, step=1.0)
+        slippage_bps = e2.number_input("Slippage (bps)", 0.0, 100.0, 0.0, step=1.0)
+        fixed_fee = e3.number_input("Frais fixes / ordre ($)", 0.0, 100.0, 0.0, step=0.5)
+        target_vol = e4.slider("Volatilité cible (%, 0 = position pleine)", 0, 100, 0)
+    execution = ExecutionModel(commission_bps, slippage_bps, fixed_fee, target_vol / 100 if target_vol else None)
+
+    # Grid search : toutes les combinaisons des sliders évaluées d'un coup
+    if strategy_type in SWEEP_STRATEGIES:
+        with st.expander("🔬 Optimisation des paramètres (Grid Search)"):
+            st.write("Évalue toutes les combinaisons de paramètres en une passe vectorisée (capital 10 000 $).")
+            if st.button("LANCER LE GRID SEARCH"):
+                with span("sweep"):
+                    results = cached("sweep", sweep, df['Close'].values, SWEEP_STRATEGIES[strategy_type], execution=execution,
+                                     periods_per_year=ppy)
+                st.caption(f"{len(results)} combinaisons testées — classement par Sharpe")
+                st.dataframe(results.head(20), use_container_width=True)
+
+                pivot = heatmap_table(results, value="sharpe")
+                fig_heat = go.Figure(go.Heatmap(
+                    z=pivot.values, x=pivot.columns, y=pivot.index,
+                    colorscale='RdBu', zmid=0, colorbar=dict(title="Sharpe")
+                ))
+                fig_heat.update_layout(
+                    title="Sharpe par combinaison", xaxis_title=pivot.columns.name, yaxis_title=pivot.index.name,
+                    template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig_heat, use_container_width=True)
+
+        # Walk-forward : paramètres choisis sur le passé, évalués sur la période suivante
+        with st.expander("🔁 Walk-Forward (hors échantillon)"):
+            st.write("Ré-optimise les paramètres sur chaque fenêtre d'entraînement et enchaîne les périodes de test.")
+            c1, c2, c3 = st.columns(3)
+            unit = "barres" if is_intraday(interval) else "jours"
+            train_size = c1.slider(f"Entraînement ({unit})", 126, 756, 252, step=21)
+            test_size = c2.slider(f"Test ({unit})", 21, 252, 63, step=21)
+            anchored = c3.checkbox("Fenêtre ancrée (depuis le début)")
+
+            if st.button("LANCER LE WALK-FORWARD"):
+                try:
+                    with span("walk_forward"):
+                        wf = cached("walk_forward", walk_forward, df['Close'], SWEEP_STRATEGIES[strategy_type], train_size,
+                                    test_size, anchored, workers=WALK_FORWARD_WORKERS, periods_per_year=ppy, execution=execution)
+                except ValueError as e:
+                    st.warning(f"⚠️ {e}")
+                else:
+                    w1, w2, w3, w4 = st.columns(4)
+                    w1.metric("Hors échantillon", f"{wf.metrics['return_pct']:.2f} %", f"B&H {wf.metrics['bh_return_pct']:.2f} %")
+                    w2.metric("Sharpe OOS", f"{wf.metrics['sharpe']:.2f}", f"Marché {wf.metrics['bh_sharpe']:.2f}")
+                    w3.metric("Sharpe moyen (train)", f"{wf.metrics['mean_train_sharpe']:.2f}")
+                    w4.metric("Max Drawdown OOS", f"{wf.metrics['max_drawdown']:.2f} %", delta_color="inverse")
+
+                    idx = shared_indices([wf.equity, wf.buy_hold], max_points)
+                    fig_wf = go.Figure()
+                    fig_wf.add_trace(scatter(wf.equity.index[idx], wf.equity.iloc[idx], name='Walk-Forward', line=dict(color='#00d2ff', width=2)))
+                    fig_wf.add_trace(scatter(wf.buy_hold.index[idx], wf.buy_hold.iloc[idx], name='Buy & Hold', line=dict(color='gray', dash='dot')))
+                    for test_start in wf.folds['test_start']:
+                        fig_wf.add_vline(x=test_start, line=dict(color='rgba(255,255,255,0.1)', width=1))
+                    fig_wf.update_layout(
+                        title=f"Capital hors échantillon ({wf.metrics['n_folds']} fenêtres)",
+                        template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+                    )
+                    st.plotly_chart(fig_wf, use_container_width=True)
+                    st.dataframe(wf.folds, use_container_width=True)
 
     # ---------------------------------------------------------
     # 5. BACKTEST COMPLET AVEC MÉTRIQUES AVANCÉES
@@ -153,20 +269,20 @@ def run():
         run_test = st.button("LANCER SIMULATION")
 
     if run_test:
-        # Calculs Rendements
-        df['Market_Return'] = df['Close'].pct_change()
-        df['Strategy_Return'] = df['Market_Return'] * df['Signal'].shift(1)
+        # Calculs Rendements (moteur pur : modules/backtest.py, métriques comprises, mis en cache)
+        result = cached("backtest", backtest, df['Close'].values, df['Signal'].values, capital, ppy, execution)
+        df['Market_Return'] = result.market_returns
+        df['Strategy_Return'] = result.strategy_returns
+        df['Portfolio_Value'] = result.equity
+        df['Buy_Hold_Value'] = result.buy_hold
         
-        df['Portfolio_Value'] = capital * (1 + df['Strategy_Return']).cumprod()
-        df['Buy_Hold_Value'] = capital * (1 + df['Market_Return']).cumprod()
-        
-        # --- CALCUL DES MÉTRIQUES (Sharpe & Drawdown) ---
-        sharpe_strat, dd_strat = calculate_metrics(df['Strategy_Return'])
-        sharpe_bh, dd_bh = calculate_metrics(df['Market_Return'])
+        # --- MÉTRIQUES (Sharpe & Drawdown) ---
+        sharpe_strat, dd_strat = result.metrics['sharpe'], result.metrics['max_drawdown']
+        sharpe_bh, dd_bh = result.metrics['bh_sharpe'], result.metrics['bh_max_drawdown']
         
         # Performance Finale
-        perf_strat = ((df['Portfolio_Value'].iloc[-1] - capital) / capital) * 100
-        perf_bh = ((df['Buy_Hold_Value'].iloc[-1] - capital) / capital) * 100
+        perf_strat = result.metrics['return_pct']
+        perf_bh = result.metrics['bh_return_pct']
         
         # AFFICHAGE DES RÉSULTATS
         # Ligne 1 : Performance Financière
@@ -185,57 +301,82 @@ def run():
         risk3.metric("Sharpe Marché", f"{sharpe_bh:.2f}")
         risk4.metric("Max Drawdown Marché", f"{dd_bh:.2f} %", delta_color="inverse")
 
+        # Ligne 3 : Exécution (ordres, rotation, frais)
+        exec1, exec2, exec3, exec4 = st.columns(4)
+        exec1.metric("Nombre d'ordres", f"{result.metrics['n_trades']}")
+        exec2.metric("Rotation annuelle", f"{result.metrics['turnover']:.1f} x")
+        exec3.metric("Frais payés", f"{result.metrics['total_costs']:,.0f} $")
+        exec4.metric("Coût sur la perf.", f"{result.metrics['cost_drag']:.2f} %", delta_color="inverse")
+
         # Graphique Comparatif
-        fig_perf = go.Figure()
-        fig_perf.add_trace(go.Scatter(x=df.index, y=df['Portfolio_Value'], name='Stratégie', line=dict(color='#00d2ff', width=2)))
-        fig_perf.add_trace(go.Scatter(x=df.index, y=df['Buy_Hold_Value'], name='Buy & Hold', line=dict(color='gray', dash='dot')))
-        fig_perf.update_layout(title="Croissance du Capital", template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_perf, use_container_width=True)
+        with span("chart.backtest"):
+            chart = df.iloc[shared_indices([df['Portfolio_Value'], df['Buy_Hold_Value']], max_points)]
+            fig_perf = go.Figure()
+            fig_perf.add_trace(scatter(chart.index, chart['Portfolio_Value'], name='Stratégie', line=dict(color='#00d2ff', width=2)))
+            fig_perf.add_trace(scatter(chart.index, chart['Buy_Hold_Value'], name='Buy & Hold', line=dict(color='gray', dash='dot')))
+            fig_perf.update_layout(title="Croissance du Capital", template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+            st.plotly_chart(fig_perf, use_container_width=True)
+
+        with st.expander("📒 Journal des ordres"):
+            st.dataframe(trade_ledger(result, df['Close'].values, df.index), use_container_width=True)
 
     # ---------------------------------------------------------
     # 6. MACHINE LEARNING (PRÉDICTION)
     # ---------------------------------------------------------
     st.markdown("---")
     with st.expander(" Prédiction IA (Machine Learning)", expanded=True):
-        st.write("Modèle : Régression Linéaire Simple sur les 30 prochains jours.")
-        
-        # Préparation des données pour scikit-learn
-        df_ml = df.reset_index()
-        df_ml['Date_Ordinal'] = df_ml['Date'].apply(lambda x: x.toordinal())
-        
-        X = df_ml[['Date_Ordinal']]
-        y = df_ml['Close']
-        
-        # Entraînement
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        # Prédiction Futur
-        future_days = 30
-        last_date = df_ml['Date'].iloc[-1]
-        last_price = df_ml['Close'].iloc[-1] # On garde le dernier vrai prix
-        
-        future_dates = [last_date + timedelta(days=i) for i in range(1, future_days + 1)]
-        future_ordinals = [[d.toordinal()] for d in future_dates]
-        
-        future_preds = model.predict(future_ordinals)
-        
-        plot_dates = [last_date] + future_dates
-        plot_prices = [last_price] + list(future_preds)
-        
-        # Graphique de Prédiction
-        fig_ai = go.Figure()
-        fig_ai.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Historique', line=dict(color='gray')))
-        fig_ai.add_trace(go.Scatter(
-            x=plot_dates, y=plot_prices, # On utilise les listes fusionnées
-            name='Prédiction IA', 
-            line=dict(color='#F1C40F', width=3, dash='dash')
-        ))
-        
-        fig_ai.update_layout(title=f"Prédiction du prix : {ticker}", template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_ai, use_container_width=True)
+        st.write("Prévision du rendement à horizon fixe (rendements passés, volatilité, indicateurs), "
+                 "intervalle issu des erreurs hors échantillon (validation croisée temporelle).")
+        m1, m2, m3 = st.columns(3)
+        model_name = m1.selectbox("Modèle", list(MODEL_LABELS), index=list(MODEL_LABELS).index("ridge"),
+                                  format_func=MODEL_LABELS.get)
+        horizon = m2.slider("Horizon (barres)", 5, 90, 30)
+        level = m3.slider("Intervalle de confiance (%)", 50, 99, 90)
+
+        # Entraînement (partagé entre sessions tant que les données ne changent pas)
+        try:
+            with span("model.fit"):
+                fc = cached("forecast", forecast, df['Close'], model_name, horizon, level / 100)
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        # Graphique de Prédiction (dernier prix réel + trajectoire prévue)
+        with span("chart.prediction"):
+            last_date, current_price = df.index[-1], df['Close'].iloc[-1]
+            path = pd.concat([pd.DataFrame({'forecast': current_price, 'lower': current_price, 'upper': current_price},
+                                           index=[last_date]), fc.path])
+            fig_ai = go.Figure()
+            history = df['Close'].iloc[downsample_indices(df['Close'], max_points)]
+            fig_ai.add_trace(scatter(history.index, history, name='Historique', line=dict(color='gray')))
+            fig_ai.add_trace(go.Scatter(x=path.index, y=path['upper'], line=dict(width=0), showlegend=False))
+            fig_ai.add_trace(go.Scatter(
+                x=path.index, y=path['lower'], name=f'Intervalle {level} %', line=dict(width=0),
+                fill='tonexty', fillcolor='rgba(241,196,15,0.2)'
+            ))
+            fig_ai.add_trace(go.Scatter(
+                x=path.index, y=path['forecast'],
+                name='Prédiction IA', 
+                line=dict(color='#F1C40F', width=3, dash='dash')
+            ))
         
-        next_price = future_preds[-1]
-        current_price = df['Close'].iloc[-1]
-        trend = "Hausse 🚀" if next_price > current_price else "Baisse 📉"
-        st.info(f"D'après l'IA, la tendance est à la {trend}. Prix estimé dans 30 jours : {next_price:,.2f} $")
\ No newline at end of file
+            fig_ai.update_layout(title=f"Prédiction du prix : {ticker}", template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+            st.plotly_chart(fig_ai, use_container_width=True)
+
+        scores = fc.scores.iloc[0]
+        f1, f2, f3 = st.columns(3)
+        f1.metric("Prix estimé", f"{fc.price:,.2f} $", f"{(fc.price / current_price - 1) * 100:.2f} %")
+        f2.metric("Erreur RMSE (hors échantillon)", f"{scores['rmse'] * 100:.2f} %")
+        f3.metric("Bon sens de variation", f"{scores['hit_rate'] * 100:.0f} %")
+
+        trend = "Hausse 🚀" if fc.price > current_price else "Baisse 📉"
+        st.info(
+            f"D'après l'IA, la tendance est à la {trend}. Prix estimé dans {horizon} barres : {fc.price:,.2f} $ "
+            f"(intervalle {level} % : {fc.path['lower'].iloc[-1]:,.2f} $ – {fc.path['upper'].iloc[-1]:,.2f} $)"
+        )
+
+        # Comparaison de tous les modèles sur les mêmes plis (Gradient Boosting : quelques secondes)
+        if st.button("COMPARER LES MODÈLES"):
+            with span("model.cross_validation"):
+                cv_scores, _ = cached("forecast_cv", cross_validate, df['Close'], horizon)
+            st.dataframe(cv_scores.rename(index=MODEL_LABELS), use_container_width=True)
@@ -1,9 +1,44 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
+from modules.market_data import get_store
+from modules.bar_store import is_intraday, periods_per_year
+from modules.portfolio import normalize_weights, backtest_portfolio, portfolio_metrics
+from modules.execution import ExecutionModel
+from modules.optimizer import optimize, estimate, portfolio_stats, efficient_frontier, random_portfolios
+from modules.monte_carlo import simulate
+from modules.rolling import rolling_stats
+from modules.compute_cache import cached
+from modules.profiling import span
+from modules.downsample import CHART_POINTS, scatter, shared_indices
+
+# Méthodes d'allocation (libellé UI -> clé de modules.optimizer, None = sliders manuels)
+ALLOCATION_METHODS = {
+    "Manuelle": None,
+    "Variance Minimale": "min_variance",
+    "Sharpe Maximum": "max_sharpe",
+    "Parité de Risque": "risk_parity",
+}
+
+# Rééquilibrage du portefeuille (libellé UI -> mode de modules.portfolio.backtest_portfolio)
+REBALANCE_LABELS = {
+    "Quotidien (poids constants)": "daily",
+    "Hebdomadaire": "weekly",
+    "Mensuel": "monthly",
+    "Trimestriel": "quarterly",
+    "Sur seuil de dérive": "threshold",
+    "Aucun (dérive libre)": "none",
+}
+
+# Taille des barres (libellé UI -> (intervalle, intervalle stocké à agréger ou None))
+BAR_INTERVALS = {
+    "1 jour": ("1d", None),
+    "1 heure": ("1h", None),
+    "15 min (agrégées depuis 1 min)": ("15m", "1m"),
+    "5 min": ("5m", None),
+}
+
 
 def run():
     # 1. TITRE
@@ -21,21 +56,32 @@ def run():
         st.warning("⚠️ Sélectionne au moins 2 actifs.")
         return
 
+    c_bars, c_period = st.columns(2)
+    interval, source = BAR_INTERVALS[c_bars.selectbox("Barres", list(BAR_INTERVALS))]
+    periods = ["5d", "1mo", "3mo", "max"] if is_intraday(interval) else ["1y", "2y", "5y", "max"]
+    period = c_period.selectbox("Période", periods, index=1)
+    unit = "barres" if is_intraday(interval) else "jours"
+
     # 3. DONNÉES
     try:
-        data = yf.download(tickers, period="2y", interval="1d", progress=False)['Close']
+        with span("data.fetch"):
+            data = get_store().get_close(tickers, period=period, interval=interval, source=source)
     except Exception as e:
         st.error(f"Erreur téléchargement : {e}")
         return
 
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
-    data = data.ffill().dropna()
+    with span("clean"):
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        data = data.ffill().dropna()
 
     if data.empty:
         st.error("Pas de données.")
         return
 
+    # Annualisation selon la taille des barres (252 en journalier)
+    ppy = periods_per_year(data.index, interval)
+
     # ---------------------------------------------------------
     # 4. ALLOCATION INTELLIGENTE 
     # ---------------------------------------------------------
@@ -46,43 +92,58 @@ def run():
     col_sliders, col_pie = st.columns([2, 1])
 
     with col_sliders:
-        st.write("Définis l'importance de chaque actif :")
-        weights_input = {}
+        method = st.radio("Méthode d'allocation", list(ALLOCATION_METHODS), horizontal=True)
+
+        if ALLOCATION_METHODS[method] is None:
+            st.write("Définis l'importance de chaque actif :")
+            weights_input = {}
         
-        # On crée les sliders
-        for ticker in tickers:
-            weights_input[ticker] = st.slider(f"Poids {ticker}", 0, 100, 100 // len(tickers), key=ticker)
+            # On crée les sliders
+            for ticker in tickers:
+                weights_input[ticker] = st.slider(f"Poids {ticker}", 0, 100, 100 // len(tickers), key=ticker)
 
-        # Calcul du total saisi par l'utilisateur
-        total_input = sum(weights_input.values())
+            # Calcul du total saisi par l'utilisateur
+            total_input = sum(weights_input.values())
 
-        # Gestion du Total (Barre de progression & Alertes)
-        if total_input == 0:
-            st.error("Le total ne peut pas être 0%.")
-            normalized_weights = {k: 1/len(tickers) for k in tickers} # Fallback équitable
-        else:
-            # Calcul des VRAIS pourcentages (Normalisation)
-            normalized_weights = {k: v / total_input for k, v in weights_input.items()}
-            
-            # Barre de progression visuelle
-            bar_val = min(total_input / 100, 1.0) # Bloque la barre à 100% visuellement
-            bar_color = "red" if total_input != 100 else "green"
+            # Calcul des VRAIS pourcentages (Normalisation, répartition équitable si total nul)
+            normalized_weights = normalize_weights(weights_input)
+
+            # Gestion du Total (Barre de progression & Alertes)
+            if total_input == 0:
+                st.error("Le total ne peut pas être 0%.")
+            else:
+                # Barre de progression visuelle
+                bar_val = min(total_input / 100, 1.0) # Bloque la barre à 100% visuellement
+                bar_color = "red" if total_input != 100 else "green"
             
-            st.markdown(f"""
-                <style>
-                    .stProgress > div > div > div > div {{ background-color: {bar_color}; }}
-                </style>""", unsafe_allow_html=True)
+                st.markdown(f"""
+                    <style>
+                        .stProgress > div > div > div > div {{ background-color: {bar_color}; }}
+                    </style>""", unsafe_allow_html=True)
             
-            st.progress(bar_val)
+                st.progress(bar_val)
             
-            # Message d'état
-            if total_input == 100:
-                st.success(f"✅ Total parfait : {total_input}%")
-            elif total_input < 100:
-                st.warning(f"⚠️ Total : {total_input}% (Il reste {100-total_input}% non alloués)")
-            else:
-                st.error(f"⚠️ Total : {total_input}% (Dépassement de {total_input-100}%)")
-                st.caption(f"👉 Pas de panique : Le système a automatiquement rééquilibré vos choix à 100% (voir camembert).")
+                # Message d'état
+                if total_input == 100:
+                    st.success(f"✅ Total parfait : {total_input}%")
+                elif total_input < 100:
+                    st.warning(f"⚠️ Total : {total_input}% (Il reste {100-total_input}% non alloués)")
+                else:
+                    st.error(f"⚠️ Total : {total_input}% (Dépassement de {total_input-100}%)")
+                    st.caption(f"👉 Pas de panique : Le système a automatiquement rééquilibré vos choix à 100% (voir camembert).")
+        else:
+            st.write("Poids calculés par l'optimiseur (covariance avec shrinkage de Ledoit-Wolf) :")
+            c_min, c_max = st.columns(2)
+            min_weight = c_min.slider("Poids minimum (%)", 0, 100 // len(tickers), 0)
+            max_weight = c_max.slider("Poids maximum (%)", -(-100 // len(tickers)), 100, 100)
+            with span("optimizer"):
+                normalized_weights = cached(
+                    "optimizer", optimize, data.pct_change().dropna(), ALLOCATION_METHODS[method], min_weight / 100, max_weight / 100
+                )
+            st.dataframe(
+                pd.DataFrame({'Poids (%)': [w * 100 for w in normalized_weights.values()]}, index=list(normalized_weights)),
+                use_container_width=True
+            )
 
     # Affichage du Camembert (Répartition RÉELLE)
     with col_pie:
@@ -101,51 +162,190 @@ def run():
     # 5. CALCULS & GRAPHIQUES
     # ---------------------------------------------------------
     
-    # Rendements
-    returns = data.pct_change().dropna()
-    portfolio_returns = returns.dot(pd.Series(normalized_weights))
-    
+    # Rééquilibrage : les poids dérivent avec les prix entre deux dates de rééquilibrage
+    r1, r2, r3 = st.columns(3)
+    rebalance = REBALANCE_LABELS[r1.selectbox("Rééquilibrage", list(REBALANCE_LABELS), index=2)]
+    threshold = r2.slider("Seuil de dérive (points de %)", 1, 25, 5, disabled=rebalance != "threshold")
+    cost_bps = r3.number_input("Frais par ordre (bps)", 0.0, 100.0, 0.0, step=1.0)
+
+    # Rendements (moteur pur : modules/portfolio.py, mis en cache par données + poids + rééquilibrage)
     initial_capital = 10000
-    portfolio_cumulative = (1 + portfolio_returns).cumprod() * initial_capital
-    assets_cumulative = (1 + returns).cumprod() * initial_capital
+    with span("portfolio"):
+        returns = data.pct_change().dropna()
+        assets_cumulative = (1 + returns).cumprod() * initial_capital
+        result = cached(
+            "portfolio", backtest_portfolio, data, normalized_weights, initial_capital, rebalance, threshold / 100,
+            ExecutionModel(commission_bps=cost_bps), ppy
+        )
+        portfolio_returns, portfolio_cumulative = result.returns, result.equity.iloc[1:]
 
     # Graphique Performance
     st.markdown("---")
     st.subheader("📈 Simulation de Performance")
     
-    fig_perf = go.Figure()
-    # Actifs individuels
-    for ticker in tickers:
-        fig_perf.add_trace(go.Scatter(
-            x=assets_cumulative.index, y=assets_cumulative[ticker], 
-            name=ticker, line=dict(width=1, dash='dot'), opacity=0.5
+    max_points = st.session_state.get("chart_points", CHART_POINTS)  # Points max par graphique (0 = tous)
+    with span("chart.performance"):
+        # Dates communes réduites (budget partagé entre les actifs et le portefeuille)
+        idx = shared_indices([portfolio_cumulative] + [assets_cumulative[t] for t in tickers], max_points)
+        assets_chart, portfolio_chart = assets_cumulative.iloc[idx], portfolio_cumulative.iloc[idx]
+        fig_perf = go.Figure()
+        # Actifs individuels
+        for ticker in tickers:
+            fig_perf.add_trace(scatter(
+                assets_chart.index, assets_chart[ticker],
+                name=ticker, line=dict(width=1, dash='dot'), opacity=0.5
+            ))
+        # Portefeuille Global
+        fig_perf.add_trace(scatter(
+            portfolio_chart.index, portfolio_chart,
+            name='MON PORTEFEUILLE', line=dict(color='#00d2ff', width=4)
         ))
-    # Portefeuille Global
-    fig_perf.add_trace(go.Scatter(
-        x=portfolio_cumulative.index, y=portfolio_cumulative, 
-        name='MON PORTEFEUILLE', line=dict(color='#00d2ff', width=4)
-    ))
 
-    fig_perf.update_layout(title=f"Capital (Base {initial_capital}$)", template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig_perf, use_container_width=True)
+        fig_perf.update_layout(title=f"Capital (Base {initial_capital}$)", template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig_perf, use_container_width=True)
 
     # ---------------------------------------------------------
     # 6. ANALYSE RISQUE
     # ---------------------------------------------------------
     st.subheader("📊 Métriques de Risque")
     
-    total_return = (portfolio_cumulative.iloc[-1] / initial_capital) - 1
-    annual_vol = portfolio_returns.std() * np.sqrt(252)
-    sharpe = (portfolio_returns.mean() / portfolio_returns.std()) * np.sqrt(252) if portfolio_returns.std() != 0 else 0
+    with span("metrics"):
+        metrics = portfolio_metrics(portfolio_returns, portfolio_cumulative, initial_capital, ppy)
+    total_return, annual_vol, sharpe = metrics['total_return'], metrics['annual_vol'], metrics['sharpe']
 
     c1, c2, c3 = st.columns(3)
     c1.metric("Rendement Global", f"{total_return*100:.2f} %")
     c2.metric("Volatilité", f"{annual_vol*100:.2f} %", delta_color="inverse")
     c3.metric("Sharpe Ratio", f"{sharpe:.2f}")
 
+    c4, c5, c6 = st.columns(3)
+    c4.metric("Rééquilibrages", f"{result.metrics['n_rebalances']}")
+    c5.metric("Rotation annuelle", f"{result.metrics['annual_turnover'] * 100:.0f} %")
+    c6.metric("Frais", f"{result.metrics['total_costs']:,.2f} $", f"{-result.metrics['cost_pct']:.2f} %")
+
+    # Poids effectifs (dérive entre deux rééquilibrages)
+    with st.expander("🧱 Poids effectifs dans le temps"):
+        with span("chart.weights"):
+            weights = result.weights
+            weights = weights.iloc[shared_indices([weights[col] for col in weights.columns], max_points)]
+            fig_weights = go.Figure()
+            for col in weights.columns:
+                # go.Scatter : Scattergl ne gère pas les aires empilées
+                fig_weights.add_trace(go.Scatter(x=weights.index, y=weights[col] * 100, name=col, stackgroup='poids', line=dict(width=0.5)))
+            fig_weights.update_layout(
+                yaxis_title="Poids (%)", template="plotly_dark", height=350,
+                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig_weights, use_container_width=True)
+
     # Matrice Corrélation
     st.write("Matrice de Corrélation des actifs :")
-    corr_matrix = returns.corr()
-    fig_corr = px.imshow(corr_matrix, text_auto=True, color_continuous_scale='RdBu_r', zmin=-1, zmax=1, aspect="auto")
-    fig_corr.update_layout(template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig_corr, use_container_width=True)
\ No newline at end of file
+    with span("correlation"):
+        corr_matrix = cached("correlation", pd.DataFrame.corr, returns)
+    with span("chart.correlation"):
+        fig_corr = px.imshow(corr_matrix, text_auto=True, color_continuous_scale='RdBu_r', zmin=-1, zmax=1, aspect="auto")
+        fig_corr.update_layout(template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig_corr, use_container_width=True)
+
+    # ---------------------------------------------------------
+    # 7. FRONTIÈRE EFFICIENTE
+    # ---------------------------------------------------------
+    with st.expander("🧭 Frontière Efficiente"):
+        n_portfolios = st.select_slider("Portefeuilles aléatoires", [1000, 10000, 50000, 100000], value=10000)
+        with span("frontier"):
+            mu, cov = cached("estimate", estimate, returns, periods_per_year=ppy)
+            cloud, _, _ = cached("random_portfolios", random_portfolios, mu, cov, n_portfolios)
+            frontier = cached("frontier", efficient_frontier, mu, cov)
+            current_ret, current_vol, _ = portfolio_stats(list(normalized_weights.values()), mu, cov)
+
+        fig_front = go.Figure()
+        fig_front.add_trace(go.Scattergl(
+            x=cloud['volatility'], y=cloud['return'], mode='markers', name='Aléatoires',
+            marker=dict(size=3, color=cloud['sharpe'], colorscale='Viridis', showscale=True, colorbar=dict(title="Sharpe"))
+        ))
+        fig_front.add_trace(go.Scatter(
+            x=frontier['volatility'], y=frontier['return'], name='Frontière', line=dict(color='white', width=2)
+        ))
+        fig_front.add_trace(go.Scatter(
+            x=[current_vol], y=[current_ret], mode='markers', name='MON PORTEFEUILLE',
+            marker=dict(symbol='star', color='#00d2ff', size=16)
+        ))
+        fig_front.update_layout(
+            xaxis_title="Volatilité annualisée", yaxis_title="Rendement annualisé",
+            template="plotly_dark", height=450, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_front, use_container_width=True)
+
+    # ---------------------------------------------------------
+    # 8. SIMULATION MONTE CARLO
+    # ---------------------------------------------------------
+    with st.expander("🎲 Simulation Monte Carlo"):
+        c1, c2, c3 = st.columns(3)
+        horizon = c1.slider("Horizon (barres)" if is_intraday(interval) else "Horizon (jours de bourse)", 21, 504, 252)
+        n_paths = c2.select_slider("Trajectoires", [10000, 50000, 100000, 250000], value=100000)
+        mc_method = c3.radio("Modèle", ["Bootstrap historique", "Normale multivariée"])
+
+        if st.button("LANCER MONTE CARLO"):
+            with span("monte_carlo"):
+                mc = simulate(
+                    returns[list(normalized_weights)], list(normalized_weights.values()), horizon, n_paths,
+                    method="bootstrap" if mc_method == "Bootstrap historique" else "normal",
+                    initial_capital=initial_capital,
+                )
+
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Capital moyen final", f"{mc.expected_value:,.0f} $")
+            m2.metric("VaR 95%", f"{mc.var:.2f} %", delta_color="inverse")
+            m3.metric("CVaR 95%", f"{mc.cvar:.2f} %", delta_color="inverse")
+            m4.metric("Probabilité de perte", f"{mc.prob_loss * 100:.1f} %")
+
+            bands = mc.bands
+            fig_mc = go.Figure()
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['p95'], line=dict(width=0), showlegend=False))
+            fig_mc.add_trace(go.Scatter(
+                x=bands.index, y=bands['p5'], name='5% - 95%', line=dict(width=0),
+                fill='tonexty', fillcolor='rgba(0,210,255,0.15)'
+            ))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['p75'], line=dict(width=0), showlegend=False))
+            fig_mc.add_trace(go.Scatter(
+                x=bands.index, y=bands['p25'], name='25% - 75%', line=dict(width=0),
+                fill='tonexty', fillcolor='rgba(0,210,255,0.35)'
+            ))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['p50'], name='Médiane', line=dict(color='#00d2ff', width=3)))
+            fig_mc.update_layout(
+                title=f"{mc.n_paths:,} trajectoires simulées", xaxis_title=unit.capitalize(), yaxis_title="Capital ($)",
+                template="plotly_dark", height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig_mc, use_container_width=True)
+
+    # ---------------------------------------------------------
+    # 9. ANALYSE GLISSANTE
+    # ---------------------------------------------------------
+    with st.expander("📉 Analyse Glissante (corrélation, volatilité, bêta)"):
+        c1, c2 = st.columns(2)
+        window = c1.slider(f"Fenêtre glissante ({unit})", 20, 252, 60)
+        benchmark = c2.selectbox("Benchmark (bêta)", list(returns.columns))
+
+        try:
+            with span("rolling"):
+                stats = cached("rolling", rolling_stats, returns, window, benchmark=benchmark, periods_per_year=ppy)
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        with span("chart.rolling"):
+            chart_layout = dict(template="plotly_dark", height=350, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+            for title, frame in [("Volatilité annualisée", stats.volatility), ("Sharpe glissant", stats.sharpe),
+                                 (f"Bêta vs {benchmark}", stats.beta)]:
+                frame = frame.iloc[shared_indices([frame[col] for col in frame.columns], max_points)]
+                fig_roll = go.Figure()
+                for col in frame.columns:
+                    fig_roll.add_trace(scatter(frame.index, frame[col], name=col, line=dict(width=1.5)))
+                fig_roll.update_layout(title=title, **chart_layout)
+                st.plotly_chart(fig_roll, use_container_width=True)
+
+        # Corrélation à une date : lecture directe d'une tranche du tableau 3-D (une option par jour en intraday)
+        date = st.select_slider("Date de la matrice de corrélation", options=list(dict.fromkeys(stats.index.date)), value=stats.index[-1].date())
+        fig_corr_date = px.imshow(stats.corr_at(date), text_auto=".2f", color_continuous_scale='RdBu_r', zmin=-1, zmax=1, aspect="auto")
+        fig_corr_date.update_layout(title=f"Corrélations sur {window} {unit} au {date}", **chart_layout)
+        st.plotly_chart(fig_corr_date, use_container_width=True)
@@ -0,0 +1,166 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.backtest import BollingerBands, GoldenCross, RSIStrategy, calculate_metrics
+from modules.profiling import span, timed
+
+# Rapport quotidien multi-symboles : une ligne par symbole (prix du jour, signaux, risque).
+# Les lignes sont ajoutées au fil de l'eau dans un fichier partiel (JSON Lines) : un rapport
+# interrompu reprend là où il s'était arrêté.
+
+REPORT_STRATEGIES = [GoldenCross(), RSIStrategy(), BollingerBands()]
+RISK_WINDOW = 252  # Barres utilisées pour les métriques de risque (1 an)
+CHUNK_SIZE = 100   # Symboles téléchargés par appel groupé
+
+REPORT_COLUMNS = [
+    "ticker", "date", "open", "close", "high", "low", "range", "range_pct", "change_pct",
+    "golden_cross", "rsi", "bollinger", "rsi_value",
+    "vol_20d", "vol_1y", "sharpe_1y", "max_drawdown_1y", "var_95", "error",
+]
+
+
+# --- CALCULS PAR SYMBOLE ---
+def _signal_label(signals):
+    """État du signal de la dernière barre : ACHAT / VENTE (changement du jour), sinon INVESTI / HORS MARCHÉ"""
+    today, yesterday = int(signals[-1]), int(signals[-2]) if len(signals) > 1 else int(signals[-1])
+    if today != yesterday:
+        return "ACHAT" if today else "VENTE"
+    return "INVESTI" if today else "HORS MARCHÉ"
+
+
+@timed("report.ticker")
+def ticker_summary(ticker, data, strategies=REPORT_STRATEGIES, periods_per_year=252):
+    """Ligne du rapport pour un symbole (dernière barre, signaux des stratégies, métriques de risque)"""
+    if data.empty:
+        return {"ticker": ticker, "error": "Aucune donnée"}
+    last = data.iloc[-1]
+    close = data["Close"].to_numpy(dtype="float64")
+    row = {
+        "ticker": ticker,
+        "date": str(data.index[-1].date()),
+        "open": float(last["Open"]),
+        "close": float(last["Close"]),
+        "high": float(last["High"]),
+        "low": float(last["Low"]),
+        "range": float(last["High"] - last["Low"]),
+        "range_pct": float((last["High"] - last["Low"]) / last["Open"] * 100),
+        "change_pct": float((close[-1] / close[-2] - 1) * 100) if len(close) > 1 else 0.0,
+    }
+
+    for strategy in strategies:
+        signals, indicators = strategy.compute(close)
+        row[strategy.name] = _signal_label(signals)
+        if "RSI" in indicators:
+            row["rsi_value"] = float(indicators["RSI"][-1])
+
+    returns = close[-RISK_WINDOW - 1:]
+    returns = returns[1:] / returns[:-1] - 1
+    sharpe, max_drawdown = calculate_metrics(returns, periods_per_year)
+    row.update(
+        vol_20d=float(np.std(returns[-20:], ddof=1) * np.sqrt(periods_per_year)) if len(returns) > 20 else np.nan,
+        vol_1y=float(np.std(returns, ddof=1) * np.sqrt(periods_per_year)) if len(returns) > 1 else np.nan,
+        sharpe_1y=float(sharpe),
+        max_drawdown_1y=float(max_drawdown),
+        var_95=float(-np.percentile(returns, 5) * 100) if len(returns) else np.nan,  # VaR historique 1 jour
+    )
+    return row
+
+
+# --- GÉNÉRATION (reprise possible) ---
+def _read_partial(path):
+    """Lignes déjà calculées par une exécution interrompue"""
+    if not os.path.exists(path):
+        return []
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # Dernière ligne tronquée par l'interruption
+    return rows
+
+
+def build_report(tickers, store, partial_path, period="2y", chunk_size=CHUNK_SIZE):
+    """Calcule (ou reprend) les lignes du rapport ; chaque bloc de symboles = un seul téléchargement groupé"""
+    # Les symboles en erreur lors d'une exécution précédente sont retentés
+    rows = [row for row in _read_partial(partial_path) if not row.get("error")]
+    done = {row["ticker"] for row in rows}
+    todo = [ticker for ticker in dict.fromkeys(tickers) if ticker not in done]
+
+    with open(partial_path, "w") as f:
+        # Réécriture des lignes valides (supprime une éventuelle ligne tronquée)
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+        for start in range(0, len(todo), chunk_size):
+            chunk = todo[start:start + chunk_size]
+            with span("report.download", tickers=len(chunk)):
+                histories = store.get_many(chunk, period=period, max_age=0)
+            for ticker in chunk:
+                try:
+                    row = ticker_summary(ticker, histories[ticker])
+                except Exception as e:
+                    row = {"ticker": ticker, "error": str(e)}
+                rows.append(row)
+                f.write(json.dumps(row) + "\n")
+            f.flush()
+
+    order = {ticker: i for i, ticker in enumerate(tickers)}
+    table = pd.DataFrame(rows).reindex(columns=REPORT_COLUMNS)
+    return table.sort_values("ticker", key=lambda s: s.map(order), ignore_index=True)
+
+
+# --- SORTIES ---
+@timed("report.write")
+def write_table(table, path):
+    """Écrit le rapport structuré en CSV, Parquet ou JSON selon l'extension"""
+    tmp = path + ".tmp"
+    if path.endswith(".parquet"):
+        table.to_parquet(tmp, index=False)
+    elif path.endswith(".json"):
+        table.to_json(tmp, orient="records", indent=2, force_ascii=False)
+    else:
+        table.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def format_summary(table, date_str):
+    """Résumé texte (même en-tête que l'ancien rapport BTC-USD)"""
+    ok = table[table["error"].isna()]
+    lines = [
+        f"RAPPORT QUOTIDIEN - {date_str}",
+        "-------------------------------",
+        f"Actifs        : {len(table)} ({len(table) - len(ok)} en erreur)",
+    ]
+    if len(ok) == 1:
+        row = ok.iloc[0]
+        lines += [
+            f"Actif         : {row['ticker']}",
+            f"Ouverture     : {row['open']:.2f} $",
+            f"Clôture       : {row['close']:.2f} $",
+            f"Volatilité    : {row['range']:.2f} $",
+        ]
+    elif len(ok):
+        best, worst = ok.loc[ok["change_pct"].idxmax()], ok.loc[ok["change_pct"].idxmin()]
+        lines += [
+            f"Hausse max    : {best['ticker']} ({best['change_pct']:+.2f} %)",
+            f"Baisse max    : {worst['ticker']} ({worst['change_pct']:+.2f} %)",
+        ]
+    lines += ["-------------------------------"]
+
+    header = f"{'Symbole':<12}{'Ouverture':>12}{'Clôture':>12}{'Var. %':>9}{'Range %':>9}{'Vol. 1an':>10}{'Sharpe':>8}  GC / RSI / BB"
+    lines.append(header)
+    for _, row in table.iterrows():
+        if isinstance(row["error"], str):
+            lines.append(f"{row['ticker']:<12}❌ {row['error']}")
+            continue
+        lines.append(
+            f"{row['ticker']:<12}{row['open']:>12.2f}{row['close']:>12.2f}{row['change_pct']:>8.2f}%"
+            f"{row['range_pct']:>8.2f}%{row['vol_1y'] * 100:>9.1f}%{row['sharpe_1y']:>8.2f}"
+            f"  {row['golden_cross']} / {row['rsi']} / {row['bollinger']}"
+        )
+    lines += ["-------------------------------", "Généré automatiquement par Cron.", ""]
+    return "\n".join(lines)
@@ -0,0 +1,179 @@
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+
+import pandas as pd
+
+from modules.market_data import DEFAULT_DATA_DIR
+from modules.report import REPORT_COLUMNS, format_summary
+
+# Archive des rapports quotidiens (SQLite) : un résumé texte par jour + une ligne par (jour, symbole).
+# Index sur la date (clé primaire) et sur (symbole, date) : le tableau de bord interroge des plages
+# de dates et des séries par symbole sans parcourir le disque.
+
+DEFAULT_REPORT_DB = os.environ.get("QUANT_REPORT_DB", os.path.join(DEFAULT_DATA_DIR, "reports.db"))
+# Rétention appliquée par le cron : rapports supprimés après 2 ans, résumés texte retirés après 90 jours
+DEFAULT_KEEP_DAYS = 730
+DEFAULT_COMPACT_DAYS = 90
+
+# Colonnes numériques / texte d'une ligne de rapport ('date' du rapport = jour de génération)
+ROW_COLUMNS = ["bar_date" if c == "date" else c for c in REPORT_COLUMNS if c != "ticker"]
+TEXT_COLUMNS = {"bar_date", "golden_cross", "rsi", "bollinger", "error"}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS reports (
+    date TEXT PRIMARY KEY,
+    created_at REAL,
+    n_tickers INTEGER,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS report_rows (
+    date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    {", ".join(f"{c} {'TEXT' if c in TEXT_COLUMNS else 'REAL'}" for c in ROW_COLUMNS)},
+    PRIMARY KEY (date, ticker)
+);
+CREATE INDEX IF NOT EXISTS idx_rows_ticker_date ON report_rows (ticker, date);
+"""
+
+
+class ReportStore:
+    """Lecture / écriture de l'archive ; une connexion par appel (cron et Streamlit en parallèle)"""
+
+    def __init__(self, path=DEFAULT_REPORT_DB):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connexion le temps d'un bloc : validée en fin de bloc (annulée sur erreur) puis fermée"""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # Lecteurs non bloqués pendant l'écriture du cron
+            with conn:
+                yield conn
+
+    # --- ÉCRITURE ---
+    def add_report(self, date_str, table, summary=None):
+        """Ajoute (ou remplace) le rapport d'un jour : table = sortie de modules.report.build_report"""
+        table = table.rename(columns={"date": "bar_date"}).reindex(columns=["ticker"] + ROW_COLUMNS)
+        table = table.astype(object).where(table.notna(), None)
+        placeholders = ", ".join("?" * (len(ROW_COLUMNS) + 2))
+        with self._connect() as conn:
+            conn.execute("DELETE FROM report_rows WHERE date = ?", (date_str,))
+            conn.executemany(
+                f"INSERT INTO report_rows (date, ticker, {', '.join(ROW_COLUMNS)}) VALUES ({placeholders})",
+                ((date_str, *row) for row in table.itertuples(index=False, name=None)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (date, created_at, n_tickers, summary) VALUES (?, ?, ?, ?)",
+                (date_str, time.time(), len(table), summary),
+            )
+
+    # --- LECTURE ---
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def dates(self, limit=None, offset=0, start=None, end=None):
+        """Dates des rapports, les plus récentes d'abord (pagination par limit / offset)"""
+        query, params = "SELECT date FROM reports WHERE date >= ? AND date <= ? ORDER BY date DESC", [start or "", end or "9999"]
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(query, params)]
+
+    def summary(self, date_str):
+        """Résumé texte d'un rapport (None si absent) ; celui d'un rapport compacté est régénéré depuis ses lignes"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT summary FROM reports WHERE date = ?", (date_str,)).fetchone()
+        if row is None or row[0] is not None:
+            return None if row is None else row[0]
+        table = self.rows(date_str).rename(columns={"bar_date": "date"}).reindex(columns=REPORT_COLUMNS)
+        return format_summary(table, date_str)
+
+    def rows(self, date_str, limit=None, offset=0):
+        """Lignes d'un rapport (une par symbole), paginées"""
+        query, params = f"SELECT ticker, {', '.join(ROW_COLUMNS)} FROM report_rows WHERE date = ? ORDER BY ticker", [date_str]
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._connect() as conn:
+            table = pd.read_sql_query(query, conn, params=params)
+        # Colonnes numériques entièrement NULL (anciens rapports importés) : lues en object -> NaN
+        numeric = [c for c in ROW_COLUMNS if c not in TEXT_COLUMNS]
+        table[numeric] = table[numeric].apply(pd.to_numeric, errors="coerce")
+        return table
+
+    def n_rows(self, date_str):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM report_rows WHERE date = ?", (date_str,)).fetchone()[0]
+
+    def tickers(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT ticker FROM report_rows ORDER BY ticker")]
+
+    def history(self, ticker, columns=("close",), start=None, end=None):
+        """Série temporelle des métriques d'un symbole entre deux dates (index sur (symbole, date))"""
+        columns = [c for c in columns if c in ROW_COLUMNS]
+        query = (
+            f"SELECT date, {', '.join(columns)} FROM report_rows "
+            "WHERE ticker = ? AND date >= ? AND date <= ? ORDER BY date"
+        )
+        with self._connect() as conn:
+            table = pd.read_sql_query(query, conn, params=[ticker, start or "", end or "9999"])
+        return table.set_index(pd.DatetimeIndex(table.pop("date"), name="Date"))
+
+    # --- RÉTENTION / COMPACTAGE ---
+    def prune(self, keep_days=None, compact_days=None, today=None):
+        """Supprime les rapports de plus de keep_days jours ; au-delà de compact_days, ne garde que les chiffres"""
+        today = pd.Timestamp.now().normalize() if today is None else pd.Timestamp(today)
+        deleted = compacted = 0
+        with self._connect() as conn:
+            if keep_days is not None:
+                cutoff = (today - pd.Timedelta(days=keep_days)).strftime("%Y-%m-%d")
+                conn.execute("DELETE FROM report_rows WHERE date < ?", (cutoff,))
+                deleted = conn.execute("DELETE FROM reports WHERE date < ?", (cutoff,)).rowcount
+            if compact_days is not None:
+                # Le résumé texte se régénère depuis les lignes (voir summary()) : on le supprime des vieux rapports
+                cutoff = (today - pd.Timedelta(days=compact_days)).strftime("%Y-%m-%d")
+                compacted = conn.execute(
+                    "UPDATE reports SET summary = NULL WHERE date < ? AND summary IS NOT NULL", (cutoff,)
+                ).rowcount
+        if deleted or compacted:
+            with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                conn.execute("VACUUM")  # Rend l'espace libéré au système de fichiers
+        return deleted, compacted
+
+
+# --- IMPORT DES ANCIENS RAPPORTS TEXTE ---
+_DATE_RE = re.compile(r"rapport_(\d{4}-\d{2}-\d{2})")
+_FIELD_RE = re.compile(r"^(Actif|Ouverture|Clôture|Volatilité)\s*:\s*([^\s$]+)", re.MULTILINE)
+
+
+def parse_text_report(path):
+    """rapport_DATE.txt -> (date, table) ; utilise le fichier structuré voisin (csv/parquet/json) s'il existe"""
+    match = _DATE_RE.search(os.path.basename(path))
+    if match is None:
+        raise ValueError(f"Nom de rapport inattendu : {path}")
+    date_str = match.group(1)
+    base = path[:-len(".txt")]
+    for ext, reader in ((".parquet", pd.read_parquet), (".csv", pd.read_csv), (".json", pd.read_json)):
+        if os.path.exists(base + ext):
+            return date_str, reader(base + ext)
+
+    # Ancien format mono-actif (Actif / Ouverture / Clôture / Volatilité)
+    with open(path, "r") as f:
+        fields = dict(_FIELD_RE.findall(f.read()))
+    if "Actif" not in fields:
+        raise ValueError(f"Format de rapport non reconnu : {path}")
+    row = {"ticker": fields["Actif"], "date": date_str}
+    for key, column in (("Ouverture", "open"), ("Clôture", "close"), ("Volatilité", "range")):
+        if key in fields:
+            row[column] = float(fields[key])
+    return date_str, pd.DataFrame([row])
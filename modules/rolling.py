@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Statistiques glissantes multi-actifs. Les sommes (x) et (x x') de la fenêtre sont mises à jour
+# en O(k²) par pas (ajout du jour entrant, retrait du jour sortant) au lieu de recalculer chaque fenêtre.
+# Les covariances sont stockées dans un tableau 3-D compact float32 : (temps x actif x actif).
+
+RESYNC_EVERY = 1000  # Recalcul complet périodique des sommes (dérive des arrondis)
+
+
+@dataclass
+class RollingStats:
+    index: pd.DatetimeIndex   # Date de fin de chaque fenêtre
+    assets: list
+    window: int
+    mean: np.ndarray          # (temps x actif) rendement moyen de la fenêtre
+    cov: np.ndarray           # (temps x actif x actif) covariance journalière, float32
+    benchmark: str = None
+    periods_per_year: int = 252
+
+    # --- Accès à une date (pour les graphiques) ---
+    def _position(self, date):
+        pos = self.index.searchsorted(pd.Timestamp(date), side="right") - 1
+        return max(pos, 0)
+
+    def cov_at(self, date):
+        """Matrice de covariance (annualisée) de la fenêtre finissant à `date` (ou juste avant)"""
+        matrix = self.cov[self._position(date)].astype("float64") * self.periods_per_year
+        return pd.DataFrame(matrix, index=self.assets, columns=self.assets)
+
+    def corr_at(self, date):
+        """Matrice de corrélation de la fenêtre finissant à `date`"""
+        cov = self.cov_at(date).values
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(corr, index=self.assets, columns=self.assets)
+
+    # --- Séries temporelles ---
+    def _series(self, a, b):
+        return self.cov[:, self.assets.index(a), self.assets.index(b)].astype("float64")
+
+    def _variances(self):
+        return np.diagonal(self.cov, axis1=1, axis2=2).astype("float64")
+
+    @property
+    def volatility(self):
+        """Volatilité annualisée glissante"""
+        vol = np.sqrt(np.maximum(self._variances(), 0) * self.periods_per_year)
+        return pd.DataFrame(vol, index=self.index, columns=self.assets)
+
+    @property
+    def sharpe(self):
+        """Sharpe annualisé glissant (taux sans risque nul)"""
+        std = np.sqrt(np.maximum(self._variances(), 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, self.mean / std, 0.0) * np.sqrt(self.periods_per_year)
+        return pd.DataFrame(sharpe, index=self.index, columns=self.assets)
+
+    def correlation(self, a, b):
+        """Corrélation glissante entre deux actifs"""
+        cov, var_a, var_b = self._series(a, b), self._series(a, a), self._series(b, b)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.Series(cov / np.sqrt(var_a * var_b), index=self.index, name=f"{a} / {b}")
+
+    @property
+    def beta(self):
+        """Bêta glissant de chaque actif par rapport au benchmark"""
+        if self.benchmark is None:
+            raise ValueError("Aucun benchmark fourni à rolling_stats()")
+        var_bench = self._series(self.benchmark, self.benchmark)
+        columns = {}
+        for asset in self.assets:
+            if asset != self.benchmark:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    columns[asset] = self._series(asset, self.benchmark) / var_bench
+        return pd.DataFrame(columns, index=self.index)
+
+
+def rolling_stats(returns, window=60, benchmark=None, periods_per_year=252):
+    """Moyennes et covariances glissantes de tous les actifs (plus le benchmark éventuel)"""
+    returns = returns.dropna()
+    if benchmark is not None and not isinstance(benchmark, str):
+        # Benchmark externe (Series) : ajouté comme colonne supplémentaire
+        name = benchmark.name or "Benchmark"
+        returns = returns.join(benchmark.rename(name), how="inner")
+        benchmark = name
+
+    x = returns.to_numpy(dtype="float64")
+    n_obs, k = x.shape
+    if n_obs < window:
+        raise ValueError(f"Historique trop court ({n_obs} jours) pour une fenêtre de {window}")
+    # Centrage global : limite l'annulation numérique de S2 - S1 S1' / n
+    center = x.mean(axis=0)
+    x = x - center
+
+    n_windows = n_obs - window + 1
+    mean = np.empty((n_windows, k))
+    cov = np.empty((n_windows, k, k), dtype="float32")
+
+    s1 = x[:window].sum(axis=0)
+    s2 = x[:window].T @ x[:window]
+    for t in range(n_windows):
+        if t > 0:
+            if t % RESYNC_EVERY == 0:
+                s1 = x[t:t + window].sum(axis=0)
+                s2 = x[t:t + window].T @ x[t:t + window]
+            else:
+                # Entrée du jour t+window-1, sortie du jour t-1 : mise à jour en O(k²)
+                new, old = x[t + window - 1], x[t - 1]
+                s1 += new - old
+                s2 += np.outer(new, new) - np.outer(old, old)
+        window_mean = s1 / window
+        mean[t] = window_mean + center
+        cov[t] = (s2 - window * np.outer(window_mean, window_mean)) / (window - 1)
+
+    return RollingStats(
+        index=returns.index[window - 1:],
+        assets=list(returns.columns),
+        window=window,
+        mean=mean,
+        cov=cov,
+        benchmark=benchmark,
+        periods_per_year=periods_per_year,
+    )
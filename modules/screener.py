@@ -0,0 +1,202 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.backtest import BollingerBands, GoldenCross, RSIStrategy
+from modules.profiling import span, timed
+from modules.report import CHUNK_SIZE
+from modules.sweep import score_signals
+
+# Screener transversal : les clôtures de tout l'univers dans un panneau aligné (dates x symboles),
+# les stratégies de quant_a calculées pour toutes les colonnes en une passe (modules.indicators
+# accepte le 2-D) et un tableau filtrable des symboles. Seules les dernières barres cotées de chaque
+# symbole servent au calcul (préchauffage des indicateurs + fenêtre de backtest), chacun sur son propre
+# calendrier : les valeurs sont celles de Market Analyst, même dans un univers actions + cryptos.
+
+BACKTEST_WINDOW = 252  # Barres de la fenêtre de backtest (1 an)
+
+FILTERS = {
+    "golden_cross": "Golden Cross (MA courte > MA longue)",
+    "rsi_oversold": "RSI sous le seuil de survente",
+    "below_lower_band": "Prix sous la bande de Bollinger basse",
+}
+
+SCREEN_COLUMNS = [
+    "date", "close", "change_pct", "bars",
+    "sma_short", "sma_long", "golden_cross", "cross_age",
+    "rsi", "rsi_oversold",
+    "bb_upper", "bb_lower", "bb_pct", "below_lower_band",
+    "golden_cross_sharpe", "golden_cross_return_pct", "rsi_sharpe", "rsi_return_pct",
+    "bollinger_sharpe", "bollinger_return_pct", "bh_return_pct",
+]
+
+
+# --- PANNEAU DE PRIX ---
+class UniversePanel:
+    """Clôtures alignées d'un univers, gardées en mémoire ; chaque rafraîchissement ne remplace que la fin"""
+
+    def __init__(self, store, tickers, period="2y", interval="1d", chunk_size=CHUNK_SIZE):
+        self.store = store
+        self.tickers = list(dict.fromkeys(tickers))
+        self.period = period
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.panel = None
+        self.refreshed_at = 0.0
+        self.lock = threading.Lock()  # Une seule reconstruction à la fois (sessions Streamlit)
+
+    def _closes(self, since=None):
+        """Clôtures de tous les symboles (à partir de `since`), un téléchargement groupé par bloc"""
+        closes = {}
+        for start in range(0, len(self.tickers), self.chunk_size):
+            chunk = self.tickers[start:start + self.chunk_size]
+            with span("screener.download", tickers=len(chunk)):
+                histories = self.store.get_many(chunk, self.period, self.interval)
+            for ticker, history in histories.items():
+                close = history["Close"] if since is None else history["Close"][history.index >= since]
+                if not close.empty:
+                    closes[ticker] = close
+        if not closes:
+            return pd.DataFrame(columns=self.tickers, dtype="float64")
+        return pd.concat(closes, axis=1).sort_index().reindex(columns=self.tickers)
+
+    @timed("screener.panel")
+    def refresh(self, max_age=None):
+        """Panneau à jour : reconstruit au premier appel, sinon seules les barres depuis la dernière date changent"""
+        max_age = self.store.max_age if max_age is None else max_age
+        with self.lock:
+            if self.panel is not None and time.time() - self.refreshed_at <= max_age:
+                return self.panel
+            if self.panel is None or self.panel.empty:
+                self.panel = self._closes()
+            else:
+                # La dernière barre stockée peut avoir été complétée : elle est remplacée avec les nouvelles
+                last = self.panel.index[-1]
+                tail = self._closes(since=last)
+                self.panel = pd.concat([self.panel[self.panel.index < last], tail])
+            self.refreshed_at = time.time()
+            return self.panel
+
+
+_panels = {}
+_panels_lock = threading.Lock()
+
+
+def get_panel(store, tickers, period="2y", interval="1d"):
+    """Panneau partagé par toutes les sessions pour un même univers"""
+    key = (id(store), tuple(tickers), period, interval)
+    with _panels_lock:
+        if key not in _panels:
+            _panels[key] = UniversePanel(store, tickers, period, interval)
+    return _panels[key]
+
+
+# --- INDICATEURS EN UNE PASSE ---
+def warmup_bars(golden_cross, rsi, bollinger):
+    """Barres nécessaires avant que tous les indicateurs soient définis"""
+    return max(golden_cross.short_window, golden_cross.long_window, rsi.rsi_period + 1, bollinger.window)
+
+
+def screen_rows(golden_cross=GoldenCross(), rsi=RSIStrategy(), bollinger=BollingerBands(), window=BACKTEST_WINDOW):
+    """Barres de chaque symbole utilisées par screen() (le reste de l'historique n'influence pas le résultat)"""
+    return warmup_bars(golden_cross, rsi, bollinger) + window + 1
+
+
+def _valid_rank(values):
+    """Rang de chaque valeur définie en partant de la fin de sa colonne (1 = dernière barre cotée), 0 si NaN"""
+    valid = ~np.isnan(values)
+    return np.where(valid, np.cumsum(valid[::-1], axis=0)[::-1], 0)
+
+
+def panel_tail(panel, rows):
+    """Fin du panneau qui contient les `rows` dernières barres cotées de chaque symbole (clé de cache de screen)"""
+    rank = _valid_rank(panel.to_numpy(dtype="float64"))
+    used = np.flatnonzero(((rank > 0) & (rank <= rows)).any(axis=1))
+    return panel.iloc[used[0]:] if len(used) else panel.iloc[len(panel):]
+
+
+def own_bars(panel, rows):
+    """Les `rows` dernières barres cotées de chaque colonne, alignées par la fin -> (matrice barres x symboles, nb de barres)"""
+    # Chaque symbole garde son calendrier : pas de barre de week-end recopiée pour une action à côté des
+    # cryptos. Historique plus court : complété en tête par son 1er prix (rendements nuls), masqué ensuite
+    values = panel.to_numpy(dtype="float64")
+    rank = _valid_rank(values)
+    bars = np.minimum((rank > 0).sum(axis=0), rows)
+    close = np.full((rows, values.shape[1]), np.nan)
+    r, c = np.nonzero((rank > 0) & (rank <= rows))
+    close[rows - rank[r, c], c] = values[r, c]
+    first = np.minimum(rows - bars, rows - 1)
+    return np.take_along_axis(close, np.maximum(np.arange(rows)[:, None], first[None, :]), axis=0), bars
+
+
+def _bars_since_change(signals):
+    """Barres écoulées depuis le dernier changement de signal de chaque colonne"""
+    changed = np.zeros(signals.shape, dtype=bool)
+    changed[1:] = signals[1:] != signals[:-1]
+    last_change = len(signals) - 1 - np.argmax(changed[::-1], axis=0)
+    return np.where(changed.any(axis=0), len(signals) - 1 - last_change, len(signals))
+
+
+@timed("screener.compute")
+def screen(panel, golden_cross=GoldenCross(), rsi=RSIStrategy(), bollinger=BollingerBands(),
+           window=BACKTEST_WINDOW, periods_per_year=252):
+    """Une ligne par symbole : dernières valeurs des indicateurs, états des filtres et backtest sur `window` barres"""
+    warmup = warmup_bars(golden_cross, rsi, bollinger)
+    panel = panel.dropna(axis=1, how="all")
+    close, bars = own_bars(panel, warmup + window + 1)
+    last_dates = panel.apply(pd.Series.last_valid_index)
+
+    gc_signals, gc_values = golden_cross.compute(close)
+    rsi_signals, rsi_values = rsi.compute(close)
+    bb_signals, bb_values = bollinger.compute(close)
+    upper, lower = bb_values["Upper"][-1], bb_values["Lower"][-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = pd.DataFrame({
+            "date": last_dates.dt.date,
+            "close": close[-1],
+            "change_pct": (close[-1] / close[-2] - 1) * 100 if len(close) > 1 else np.nan,
+            "bars": bars,
+            "sma_short": gc_values["SMA_Short"][-1],
+            "sma_long": gc_values["SMA_Long"][-1],
+            "golden_cross": gc_signals[-1].astype(bool),
+            "cross_age": _bars_since_change(gc_signals),
+            "rsi": rsi_values["RSI"][-1],
+            "rsi_oversold": rsi_values["RSI"][-1] < rsi.oversold,
+            "bb_upper": upper,
+            "bb_lower": lower,
+            "bb_pct": (close[-1] - lower) / (upper - lower),
+            "below_lower_band": close[-1] < lower,
+        }, index=panel.columns)
+
+    # Backtest des trois stratégies sur la fenêtre, toutes les colonnes à la fois
+    recent = close[-(window + 1):]
+    market_returns = np.full(recent.shape, np.nan)
+    market_returns[1:] = recent[1:] / recent[:-1] - 1
+    for strategy, signals in [(golden_cross, gc_signals), (rsi, rsi_signals), (bollinger, bb_signals)]:
+        scores = score_signals(market_returns, signals[-(window + 1):], periods_per_year=periods_per_year)
+        table[f"{strategy.name}_sharpe"] = scores["sharpe"].to_numpy()
+        table[f"{strategy.name}_return_pct"] = scores["return_pct"].to_numpy()
+    table["bh_return_pct"] = (recent[-1] / recent[0] - 1) * 100
+
+    # Historique trop court : indicateurs et backtest non significatifs
+    table.loc[bars < warmup, ["sma_short", "sma_long", "rsi", "bb_upper", "bb_lower", "bb_pct"]] = np.nan
+    table.loc[bars < warmup, ["golden_cross", "rsi_oversold", "below_lower_band"]] = False
+    table.loc[bars < window + 1, [c for c in table.columns if c.endswith(("_sharpe", "_return_pct"))]] = np.nan
+    table.index.name = "ticker"
+    return table[SCREEN_COLUMNS]
+
+
+# --- FILTRES ---
+def apply_filters(table, filters=(), match="all", sort_by=None, ascending=True):
+    """Symboles qui remplissent les filtres ('all' : tous, 'any' : au moins un), triés"""
+    unknown = [name for name in filters if name not in FILTERS]
+    if unknown:
+        raise ValueError(f"Filtre inconnu : {', '.join(unknown)} (choix : {', '.join(FILTERS)})")
+    if filters:
+        flags = table[list(filters)]
+        table = table[flags.all(axis=1) if match == "all" else flags.any(axis=1)]
+    if sort_by is not None:
+        table = table.sort_values(sort_by, ascending=ascending, na_position="last")
+    return table
@@ -0,0 +1,108 @@
+import os
+
+import streamlit as st
+from modules.market_data import get_store
+from modules.batch import read_tickers
+from modules.backtest import GoldenCross, RSIStrategy, BollingerBands
+from modules.screener import FILTERS, BACKTEST_WINDOW, get_panel, panel_tail, screen, screen_rows, apply_filters
+from modules.compute_cache import cached
+from modules.profiling import span
+
+# Univers filtré (fichier de symboles : QUANT_UNIVERSE=watchlist.txt, sinon la liste par défaut)
+DEFAULT_UNIVERSE = ["BTC-USD", "ETH-USD", "SOL-USD", "AAPL", "MSFT", "GOOGL", "TSLA", "NVDA", "GC=F", "EURUSD=X"]
+
+# Colonnes de tri proposées (libellé UI -> colonne du tableau, tri décroissant)
+SORT_COLUMNS = {
+    "Variation du jour": ("change_pct", True),
+    "RSI (croissant)": ("rsi", False),
+    "Position dans les bandes (%B)": ("bb_pct", False),
+    "Sharpe Golden Cross (1 an)": ("golden_cross_sharpe", True),
+    "Sharpe RSI (1 an)": ("rsi_sharpe", True),
+    "Sharpe Bollinger (1 an)": ("bollinger_sharpe", True),
+    "Buy & Hold (1 an)": ("bh_return_pct", True),
+    "Âge du croisement": ("cross_age", False),
+}
+
+
+def universe():
+    path = os.environ.get("QUANT_UNIVERSE")
+    return read_tickers(path) if path else DEFAULT_UNIVERSE
+
+
+def run():
+    # 1. TITRE
+    st.markdown('<div class="main-title">SCREENER</div>', unsafe_allow_html=True)
+    tickers = universe()
+
+    # 2. PARAMÈTRES (mêmes stratégies que Market Analyst)
+    st.sidebar.header("🛠 Indicateurs")
+    short_window = st.sidebar.slider("MA courte", 5, 100, 20)
+    long_window = st.sidebar.slider("MA longue", 20, 250, 50)
+    rsi_period = st.sidebar.slider("Période RSI", 5, 30, 14)
+    oversold = st.sidebar.slider("Seuil de survente RSI", 10, 50, 30)
+    bb_window = st.sidebar.slider("Fenêtre Bollinger", 5, 100, 20)
+    bb_std = st.sidebar.slider("Écarts-types Bollinger", 1.0, 3.0, 2.0, 0.5)
+    golden_cross = GoldenCross(short_window, long_window)
+    rsi = RSIStrategy(rsi_period, oversold=oversold)
+    bollinger = BollingerBands(bb_window, bb_std)
+
+    c_filters, c_match, c_sort = st.columns([3, 1, 2])
+    filters = c_filters.multiselect("Filtres", list(FILTERS), default=["golden_cross"], format_func=FILTERS.get)
+    match = c_match.radio("Combinaison", ["all", "any"], format_func={"all": "Tous", "any": "Au moins un"}.get)
+    sort_by, descending = SORT_COLUMNS[c_sort.selectbox("Trier par", list(SORT_COLUMNS))]
+
+    # 3. DONNÉES : panneau partagé, seules les nouvelles barres sont téléchargées
+    try:
+        with span("data.panel", tickers=len(tickers)):
+            panel = get_panel(get_store(), tickers).refresh()
+    except Exception as e:
+        st.error(f"Erreur téléchargement : {e}")
+        return
+    if panel.empty:
+        st.error("Pas de données.")
+        return
+
+    # 4. CALCUL : clé = fin du panneau -> recalcul uniquement quand une nouvelle barre arrive
+    rows = screen_rows(golden_cross, rsi, bollinger, BACKTEST_WINDOW)
+    with span("screen"):
+        table = cached("screener", screen, panel_tail(panel, rows), golden_cross, rsi, bollinger, BACKTEST_WINDOW)
+    try:
+        matches = apply_filters(table, filters, match, sort_by, ascending=not descending)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    # 5. RÉSULTATS
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Univers", f"{len(table)} / {len(tickers)}")
+    c2.metric("Correspondances", len(matches))
+    c3.metric("Dernière barre", str(panel.index[-1].date()))
+    st.dataframe(
+        matches, use_container_width=True,
+        column_config={
+            "date": st.column_config.DateColumn("Date"),
+            "close": st.column_config.NumberColumn("Clôture", format="%.2f"),
+            "change_pct": st.column_config.NumberColumn("Var. (%)", format="%.2f"),
+            "bars": st.column_config.NumberColumn("Barres"),
+            "sma_short": st.column_config.NumberColumn("MA courte", format="%.2f"),
+            "sma_long": st.column_config.NumberColumn("MA longue", format="%.2f"),
+            "golden_cross": st.column_config.CheckboxColumn("Golden Cross"),
+            "cross_age": st.column_config.NumberColumn("Âge croisement (barres)"),
+            "rsi": st.column_config.NumberColumn("RSI", format="%.1f"),
+            "rsi_oversold": st.column_config.CheckboxColumn("Survente"),
+            "bb_upper": st.column_config.NumberColumn("Bande haute", format="%.2f"),
+            "bb_lower": st.column_config.NumberColumn("Bande basse", format="%.2f"),
+            "bb_pct": st.column_config.NumberColumn("%B", format="%.2f"),
+            "below_lower_band": st.column_config.CheckboxColumn("Sous la bande"),
+            "golden_cross_sharpe": st.column_config.NumberColumn("Sharpe GC", format="%.2f"),
+            "golden_cross_return_pct": st.column_config.NumberColumn("Perf. GC (%)", format="%.1f"),
+            "rsi_sharpe": st.column_config.NumberColumn("Sharpe RSI", format="%.2f"),
+            "rsi_return_pct": st.column_config.NumberColumn("Perf. RSI (%)", format="%.1f"),
+            "bollinger_sharpe": st.column_config.NumberColumn("Sharpe BB", format="%.2f"),
+            "bollinger_return_pct": st.column_config.NumberColumn("Perf. BB (%)", format="%.1f"),
+            "bh_return_pct": st.column_config.NumberColumn("Buy & Hold (%)", format="%.1f"),
+        },
+    )
+    st.caption(f"Backtests sur les {BACKTEST_WINDOW} dernières barres, sans frais. "
+               "Les symboles à l'historique trop court n'ont pas de statistiques.")
+    st.download_button("Exporter (CSV)", matches.to_csv(), file_name="screener.csv", mime="text/csv")
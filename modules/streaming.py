@@ -0,0 +1,250 @@
+import math
+from collections import deque
+
+from modules.backtest import BollingerBands, BuyAndHold, GoldenCross, RSIStrategy
+
+# Indicateurs incrémentaux : état en O(fenêtre), mise à jour en O(1) par barre ou par tick.
+# update(x) ajoute une nouvelle barre ; update(x, new_bar=False) corrige la dernière (tick en cours de barre).
+
+RESYNC_EVERY = 10_000  # Recalcul périodique des sommes pour éviter la dérive des arrondis
+
+
+# --- FENÊTRE GLISSANTE (somme + moyenne/variance de Welford) ---
+class RollingWindow:
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0  # Somme des carrés des écarts à la moyenne (Welford)
+        self._updates = 0
+
+    def _add(self, x):
+        n = len(self.values) + 1
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+        self.values.append(x)
+
+    def _swap(self, old, new):
+        # Welford glissant : on remplace `old` par `new` sans changer la taille
+        old_mean = self.mean
+        self.mean += (new - old) / len(self.values)
+        self.m2 += (new - old) * (new - self.mean + old - old_mean)
+
+    def push(self, x):
+        if len(self.values) < self.window:
+            self._add(x)
+        else:
+            old = self.values.popleft()
+            self.values.append(x)
+            self._swap(old, x)
+        self._resync()
+
+    def replace_last(self, x):
+        old = self.values[-1]
+        self.values[-1] = x
+        self._swap(old, x)
+
+    def _resync(self):
+        self._updates += 1
+        if self._updates % RESYNC_EVERY == 0:
+            self.mean = sum(self.values) / len(self.values)
+            self.m2 = sum((v - self.mean) ** 2 for v in self.values)
+
+    @property
+    def full(self):
+        return len(self.values) == self.window
+
+    @property
+    def variance(self):
+        # ddof=1, comme rolling().std()
+        return max(self.m2, 0.0) / (self.window - 1) if self.window > 1 else math.nan
+
+
+# --- INDICATEURS ---
+class StreamingSMA:
+    """Moyenne mobile simple incrémentale (NaN tant que la fenêtre n'est pas pleine)"""
+
+    def __init__(self, window):
+        self.rolling = RollingWindow(window)
+
+    def update(self, x, new_bar=True):
+        if new_bar or not self.rolling.values:
+            self.rolling.push(x)
+        else:
+            self.rolling.replace_last(x)
+        return self.value
+
+    @property
+    def value(self):
+        return self.rolling.mean if self.rolling.full else math.nan
+
+
+class StreamingBollinger:
+    """Bandes de Bollinger incrémentales -> (moyenne, bande haute, bande basse)"""
+
+    def __init__(self, window=20, num_std=2.0):
+        self.rolling = RollingWindow(window)
+        self.num_std = num_std
+
+    def update(self, x, new_bar=True):
+        if new_bar or not self.rolling.values:
+            self.rolling.push(x)
+        else:
+            self.rolling.replace_last(x)
+        return self.value
+
+    @property
+    def value(self):
+        if not self.rolling.full:
+            return math.nan, math.nan, math.nan
+        mid = self.rolling.mean
+        width = math.sqrt(self.rolling.variance) * self.num_std
+        return mid, mid + width, mid - width
+
+
+class StreamingRSI:
+    """RSI incrémental, 'simple' (moyennes mobiles, comme quant_a) ou 'wilder'"""
+
+    def __init__(self, period=14, method="simple"):
+        if method not in ("simple", "wilder"):
+            raise ValueError(f"Lissage RSI inconnu : {method}")
+        self.period = period
+        self.method = method
+        self.prev_close = None   # Clôture de la barre précédente
+        self.last_close = None   # Clôture de la barre en cours
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        # Wilder : moyennes courantes et celles d'avant la dernière barre (pour corriger un tick)
+        self.count = 0
+        self.avg = (0.0, 0.0)
+        self.prev_avg = (0.0, 0.0)
+
+    def update(self, close, new_bar=True):
+        if self.last_close is None:
+            # 1re barre : variation nulle (comme delta.where(...) dans quant_a)
+            self.last_close = close
+            if self.method == "simple":
+                self.gains.push(0.0)
+                self.losses.push(0.0)
+            return self.value
+        if new_bar:
+            self.prev_close = self.last_close
+        self.last_close = close
+
+        if self.prev_close is None:  # Correction de la 1re barre : toujours aucune variation
+            return self.value
+        delta = close - self.prev_close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+        if self.method == "simple":
+            if new_bar:
+                self.gains.push(gain)
+                self.losses.push(loss)
+            else:
+                self.gains.replace_last(gain)
+                self.losses.replace_last(loss)
+        else:
+            if new_bar:
+                self.count += 1
+                self.prev_avg = self.avg
+            base_gain, base_loss = self.prev_avg
+            if self.count <= self.period:
+                # Amorçage : moyenne simple des `period` premières variations
+                self.avg = (base_gain + (gain - base_gain) / self.count, base_loss + (loss - base_loss) / self.count)
+            else:
+                self.avg = (base_gain + (gain - base_gain) / self.period, base_loss + (loss - base_loss) / self.period)
+        return self.value
+
+    @property
+    def value(self):
+        if self.method == "simple":
+            if not self.gains.full:
+                return math.nan
+            gain, loss = self.gains.mean, self.losses.mean
+        else:
+            if self.count < self.period:
+                return math.nan
+            gain, loss = self.avg
+        if loss == 0:
+            return math.nan if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+
+class CrossoverDetector:
+    """Signal (1 si rapide > lente) et changement de position (+1 achat, -1 vente, NaN à la 1re barre)"""
+
+    def __init__(self):
+        self.signal = None
+        self.prev_signal = None
+
+    def update(self, signal, new_bar=True):
+        if new_bar:
+            self.prev_signal = self.signal
+        self.signal = signal
+        change = math.nan if self.prev_signal is None else signal - self.prev_signal
+        return signal, change
+
+    def cross(self, fast, slow, new_bar=True):
+        return self.update(1 if fast > slow else 0, new_bar)
+
+
+# --- STRATÉGIES EN FLUX (mêmes règles que modules/backtest.py) ---
+class StreamingStrategy:
+    """Applique une stratégie barre par barre : update(close) -> (Signal, Position_Change)"""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.detector = CrossoverDetector()
+        if isinstance(strategy, GoldenCross):
+            self.indicators = (StreamingSMA(strategy.short_window), StreamingSMA(strategy.long_window))
+        elif isinstance(strategy, RSIStrategy):
+            self.indicators = (StreamingRSI(strategy.rsi_period, strategy.smoothing),)
+        elif isinstance(strategy, BollingerBands):
+            self.indicators = (StreamingBollinger(strategy.window, strategy.std_dev),)
+        elif isinstance(strategy, BuyAndHold):
+            self.indicators = ()
+        else:
+            raise ValueError(f"Stratégie non supportée en flux : {strategy}")
+
+    def update(self, close, new_bar=True):
+        values = [indicator.update(close, new_bar) for indicator in self.indicators]
+        if isinstance(self.strategy, GoldenCross):
+            signal = 1 if values[0] > values[1] else 0
+        elif isinstance(self.strategy, RSIStrategy):
+            signal = 1 if values[0] < self.strategy.overbought else 0
+        elif isinstance(self.strategy, BollingerBands):
+            signal = 1 if close > values[0][2] else 0
+        else:
+            signal = 1
+        return self.detector.update(signal, new_bar)
+
+    def prime(self, closes):
+        """Initialise l'état à partir de l'historique (une seule fois)"""
+        result = (0, math.nan)
+        for close in closes:
+            result = self.update(float(close))
+        return result
+
+
+class SignalMonitor:
+    """Suit une stratégie sur de nombreux symboles ; update() renvoie le signal et le changement éventuel"""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.streams = {}
+
+    def _stream(self, ticker):
+        if ticker not in self.streams:
+            self.streams[ticker] = StreamingStrategy(self.strategy)
+        return self.streams[ticker]
+
+    def prime(self, ticker, closes):
+        return self._stream(ticker).prime(closes)
+
+    def update(self, ticker, price, new_bar=True):
+        return self._stream(ticker).update(price, new_bar)
+
+    def signals(self):
+        """Signal courant de chaque symbole"""
+        return {ticker: stream.detector.signal for ticker, stream in self.streams.items()}
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from modules import indicators
+
+# --- GRILLES PAR DÉFAUT (mêmes bornes que les sliders de quant_a) ---
+DEFAULT_GRIDS = {
+    "golden_cross": {"short_window": np.arange(5, 51), "long_window": np.arange(50, 201)},
+    "rsi": {"rsi_period": np.arange(5, 31), "overbought": np.arange(50, 91)},
+    "bollinger": {"window": np.arange(10, 51), "std_dev": np.round(np.arange(1.0, 3.01, 0.1), 1)},
+}
+
+MAX_BLOCK_CELLS = 8_000_000  # Taille max (temps x combinaisons) d'un bloc, pour borner la mémoire
+
+
+# --- INDICATEURS POUR PLUSIEURS FENÊTRES (noyaux de modules.indicators, une colonne par fenêtre) ---
+def _matrix(kernel, close, windows):
+    close = np.asarray(close, dtype="float64")
+    out = np.empty((len(close), len(windows)), order="F")
+    for j, w in enumerate(windows):
+        kernel(close, int(w), out=out[:, j])
+    return out
+
+
+def rolling_mean_matrix(close, windows):
+    """Moyennes mobiles pour plusieurs fenêtres -> matrice (temps x fenêtre)"""
+    return _matrix(indicators.sma, close, windows)
+
+
+def rolling_std_matrix(close, windows):
+    """Écarts-types glissants (ddof=1, comme pandas) pour plusieurs fenêtres -> matrice (temps x fenêtre)"""
+    return _matrix(indicators.rolling_std, close, windows)
+
+
+def rsi_matrix(close, periods):
+    """RSI (moyenne simple, comme quant_a) pour plusieurs périodes -> matrice (temps x période)"""
+    return _matrix(indicators.rsi, close, periods)
+
+
+# --- SIGNAUX PAR BLOCS (temps x combinaisons) ---
+def _pairs(a, b):
+    grid_a, grid_b = np.meshgrid(a, b, indexing="ij")
+    return grid_a.ravel(), grid_b.ravel()
+
+
+def signal_blocks(close, strategy, grid=None, max_cells=MAX_BLOCK_CELLS):
+    """Génère (paramètres, signaux) par blocs ; signaux = matrice booléenne (temps x combinaisons)"""
+    grid = DEFAULT_GRIDS[strategy] if grid is None else grid
+    close = np.asarray(close, dtype="float64")
+    names = list(grid)
+    first, second = (np.asarray(grid[name]) for name in names)
+    # On découpe selon le premier paramètre : chaque bloc = quelques valeurs x toute la 2e grille
+    rows_per_block = max(1, max_cells // max(1, len(close) * len(second)))
+
+    if strategy == "golden_cross":
+        first_values = rolling_mean_matrix(close, first)
+        second_values = rolling_mean_matrix(close, second)
+    elif strategy == "rsi":
+        first_values = rsi_matrix(close, first)
+    elif strategy == "bollinger":
+        means = rolling_mean_matrix(close, first)
+        stds = rolling_std_matrix(close, first)
+    else:
+        raise ValueError(f"Stratégie sans grille : {strategy}")
+
+    for start in range(0, len(first), rows_per_block):
+        block = slice(start, start + rows_per_block)
+        if strategy == "golden_cross":
+            signals = first_values[:, block, None] > second_values[:, None, :]
+        elif strategy == "rsi":
+            signals = first_values[:, block, None] < second[None, None, :]
+        else:
+            lower = means[:, block, None] - stds[:, block, None] * second[None, None, :]
+            signals = close[:, None, None] > lower
+
+        a, b = _pairs(first[block], second)
+        params = pd.DataFrame({names[0]: a, names[1]: b})
+        yield params, signals.reshape(len(close), -1)
+
+
+# --- SCORING VECTORISÉ ---
+def score_signals(market_returns, signals, capital=10000, periods_per_year=252, execution=None):
+    """Sharpe, Max Drawdown et valeur finale de chaque colonne de signaux (rendements 1-D, ou 2-D : un actif par colonne)"""
+    if execution is None:
+        market_returns = np.nan_to_num(np.asarray(market_returns, dtype="float64")[1:])
+        # Strategy_Return = Market_Return * Signal.shift(1), la 1re ligne (NaN) est ignorée
+        strat = (market_returns[:, None] if market_returns.ndim == 1 else market_returns) * signals[:-1]
+    else:
+        # Rendements nets de frais / taille de position, calculés pour toutes les colonnes à la fois
+        strat = np.nan_to_num(execution.net_returns(market_returns, signals, capital, periods_per_year)[1:])
+
+    mean = strat.mean(axis=0)
+    std = strat.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(periods_per_year))
+
+    strat += 1.0
+    growth = np.cumprod(strat, axis=0, out=strat)
+    peak = np.maximum.accumulate(growth, axis=0)
+    max_drawdown = ((growth - peak) / peak).min(axis=0) * 100
+
+    final_value = capital * growth[-1]
+    return pd.DataFrame({
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "final_value": final_value,
+        "return_pct": (final_value - capital) / capital * 100,
+    })
+
+
+def sweep(close, strategy, grid=None, capital=10000, max_cells=MAX_BLOCK_CELLS, execution=None, periods_per_year=252):
+    """Évalue toutes les combinaisons de paramètres d'une stratégie, classées par Sharpe décroissant"""
+    close = np.asarray(close, dtype="float64")
+    market_returns = np.concatenate([[np.nan], close[1:] / close[:-1] - 1])
+
+    results = []
+    for params, signals in signal_blocks(close, strategy, grid, max_cells):
+        scores = score_signals(market_returns, signals, capital, periods_per_year, execution)
+        results.append(pd.concat([params, scores], axis=1))
+
+    table = pd.concat(results, ignore_index=True)
+    return table.sort_values("sharpe", ascending=False, ignore_index=True)
+
+
+def heatmap_table(results, value="sharpe"):
+    """Pivot (1er paramètre x 2e paramètre) d'un résultat de sweep, pour une heatmap"""
+    first, second = results.columns[:2]
+    return results.pivot(index=first, columns=second, values=value)
@@ -0,0 +1,168 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules.backtest import calculate_metrics
+from modules.sweep import DEFAULT_GRIDS, MAX_BLOCK_CELLS, score_signals, signal_blocks
+
+# Walk-forward : on choisit les paramètres sur une fenêtre d'entraînement, on les applique sur la
+# période suivante (hors échantillon), puis on décale. Les indicateurs sont causaux : la matrice de
+# signaux (temps x combinaisons) est calculée une seule fois sur tout l'historique et partagée par
+# toutes les fenêtres via un .npy en memmap (même principe que modules/batch.py).
+
+
+@dataclass
+class WalkForwardResult:
+    folds: pd.DataFrame         # Une ligne par fenêtre : dates, paramètres retenus, Sharpe train / test
+    returns: pd.Series          # Rendements hors échantillon recollés
+    equity: pd.Series           # Capital hors échantillon
+    buy_hold: pd.Series         # Buy & Hold sur la même période
+    metrics: dict
+
+
+# --- DÉCOUPAGE ---
+def make_folds(n_bars, train_size, test_size, anchored=False):
+    """Fenêtres (début train, fin train = début test, fin test) ; anchored = train qui s'allonge depuis 0"""
+    if train_size < 2 or test_size < 1:
+        raise ValueError("Fenêtres d'entraînement / de test trop courtes")
+    folds = []
+    for train_stop in range(train_size, n_bars, test_size):
+        train_start = 0 if anchored else train_stop - train_size
+        folds.append((train_start, train_stop, min(train_stop + test_size, n_bars)))
+    if not folds:
+        raise ValueError(f"Historique trop court ({n_bars} barres) pour {train_size} barres d'entraînement")
+    return folds
+
+
+# --- MATRICE DE SIGNAUX PARTAGÉE ---
+def pack_signals(close, strategy, grid, path, max_cells=MAX_BLOCK_CELLS):
+    """Écrit les signaux de toutes les combinaisons dans un .npy (temps x combinaisons) -> paramètres"""
+    grid = DEFAULT_GRIDS[strategy] if grid is None else grid
+    n_params = int(np.prod([len(values) for values in grid.values()]))
+    packed = np.lib.format.open_memmap(path, mode="w+", dtype=bool, shape=(len(close), n_params))
+
+    # Chaque bloc est écrit dès qu'il est calculé : la mémoire reste bornée par max_cells
+    all_params, start = [], 0
+    for params, signals in signal_blocks(close, strategy, grid, max_cells):
+        packed[:, start:start + len(params)] = signals
+        start += len(params)
+        all_params.append(params)
+    packed.flush()
+    del packed
+    return pd.concat(all_params, ignore_index=True)
+
+
+def train_sharpe(market_returns, signals, periods_per_year=252):
+    """Sharpe brut de chaque colonne de signaux (même calcul que score_signals sans frais, sans le drawdown)"""
+    # Strategy_Return = Market_Return * Signal.shift(1) ; signaux 0/1 -> sommes par produit matriciel
+    returns = np.nan_to_num(np.asarray(market_returns, dtype="float64")[1:])
+    positions = np.asarray(signals[:-1], dtype="float64")
+    n = len(returns)
+    mean = returns @ positions / n
+    var = ((returns * returns) @ positions - n * mean * mean) / (n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(var > 0, mean / np.sqrt(var) * np.sqrt(periods_per_year), 0.0)
+
+
+_shared = None
+
+
+def _init_worker(path, market_returns, execution=None, capital=10000):
+    """Chaque worker ouvre la matrice de signaux une seule fois, en lecture seule"""
+    global _shared
+    _shared = (np.load(path, mmap_mode="r"), market_returns, execution, capital)
+
+
+def _run_fold(task):
+    train_start, train_stop, test_stop, periods_per_year, max_cells = task
+    signals, market_returns, execution, capital = _shared
+
+    # Scoring de toutes les combinaisons sur la fenêtre d'entraînement, par blocs de colonnes
+    n_params = signals.shape[1]
+    columns = max(1, max_cells // max(1, train_stop - train_start))
+    sharpe = np.empty(n_params)
+    for start in range(0, n_params, columns):
+        block = signals[train_start:train_stop, start:start + columns]
+        train_returns = market_returns[train_start:train_stop]
+        if execution is None:
+            sharpe[start:start + columns] = train_sharpe(train_returns, block, periods_per_year)
+        else:
+            # Choix des paramètres sur les rendements nets, comme ceux du hors échantillon
+            scores = score_signals(train_returns, block, capital, periods_per_year, execution)
+            sharpe[start:start + columns] = scores["sharpe"].to_numpy()
+    best = int(np.argmax(sharpe))
+
+    # Hors échantillon : position du jour = signal de la veille (la dernière barre d'entraînement incluse)
+    position = np.asarray(signals[train_stop - 1:test_stop - 1, best], dtype="float64")
+    oos_returns = np.nan_to_num(market_returns[train_stop:test_stop]) * position
+    return best, sharpe[best], position, oos_returns
+
+
+# --- POINT D'ENTRÉE ---
+def walk_forward(prices, strategy, train_size=504, test_size=63, anchored=False, grid=None, capital=10000,
+                 workers=1, periods_per_year=252, max_cells=MAX_BLOCK_CELLS, execution=None):
+    """Walk-forward d'une stratégie de modules/sweep sur une série de clôtures (pd.Series indexée par date)"""
+    close = prices.to_numpy(dtype="float64")
+    market_returns = np.concatenate([[np.nan], close[1:] / close[:-1] - 1])
+    folds = make_folds(len(close), train_size, test_size, anchored)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "signals.npy")
+        params = pack_signals(close, strategy, grid, path, max_cells)
+        tasks = [(a, b, c, periods_per_year, max_cells) for a, b, c in folds]
+        if workers == 1:
+            _init_worker(path, market_returns, execution, capital)
+            outputs = list(map(_run_fold, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(path, market_returns, execution, capital)) as executor:
+                outputs = list(executor.map(_run_fold, tasks))
+
+    # Recollage des périodes de test
+    first, last = folds[0][1], folds[-1][2]
+    oos_returns = np.concatenate([output[3] for output in outputs])
+    if execution is not None:
+        # Frais et taille de position appliqués à la suite recollée des signaux retenus
+        stitched = np.zeros(len(close))
+        stitched[first - 1:last - 1] = np.concatenate([output[2] for output in outputs])
+        oos_returns = execution.net_returns(market_returns, stitched, capital, periods_per_year)[first:last]
+
+    index = prices.index
+    rows = []
+    for (train_start, train_stop, test_stop), (best, train_sharpe, _, _) in zip(folds, outputs):
+        fold_returns = oos_returns[train_stop - first:test_stop - first]
+        test_sharpe, _ = calculate_metrics(fold_returns, periods_per_year)
+        rows.append({
+            "train_start": index[train_start].date(),
+            "test_start": index[train_stop].date(),
+            "test_end": index[test_stop - 1].date(),
+            **params.iloc[best].to_dict(),
+            "train_sharpe": train_sharpe,
+            "test_sharpe": test_sharpe,
+            "test_return_pct": (np.prod(1 + fold_returns) - 1) * 100,
+        })
+
+    oos_index = index[first:last]
+    returns = pd.Series(oos_returns, index=oos_index, name="Strategy_Return")
+    market = pd.Series(np.nan_to_num(market_returns[first:last]), index=oos_index)
+    equity = capital * (1 + returns).cumprod()
+    buy_hold = capital * (1 + market).cumprod()
+
+    sharpe, max_drawdown = calculate_metrics(returns.values, periods_per_year)
+    bh_sharpe, bh_max_drawdown = calculate_metrics(market.values, periods_per_year)
+    table = pd.DataFrame(rows)
+    metrics = {
+        "return_pct": (equity.iloc[-1] - capital) / capital * 100,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "bh_return_pct": (buy_hold.iloc[-1] - capital) / capital * 100,
+        "bh_sharpe": bh_sharpe,
+        "bh_max_drawdown": bh_max_drawdown,
+        "mean_train_sharpe": table["train_sharpe"].mean(),
+        "n_folds": len(folds),
+    }
+    return WalkForwardResult(table, returns, equity, buy_hold, metrics)
@@ -0,0 +1,66 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from modules.backtest import STRATEGIES
+from modules.compute_cache import DEFAULT_CACHE_DIR
+from modules.market_data import open_store
+from modules.precompute import DEFAULT_VIEWS, STATE_FILE, AnalysisView, load_state, load_views, run_precompute, state_table
+
+DEFAULT_PRECOMPUTE_DIR = os.path.join("data", "compute_cache")
+
+
+def next_run(at, now=None):
+    """Prochaine occurrence de l'heure HH:MM (aujourd'hui si elle n'est pas passée)"""
+    now = datetime.now() if now is None else now
+    hour, minute = (int(part) for part in at.split(":"))
+    run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return run if run > now else run + timedelta(days=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Précalcul des vues par défaut des pages (après la clôture)")
+    parser.add_argument("--config", help="Vues à précalculer (JSON : {\"analysis\": [...], \"portfolios\": [...]})")
+    parser.add_argument("--tickers", nargs="*", default=[], help="Symboles supplémentaires pour Market Analyst")
+    parser.add_argument("--strategy", action="append", choices=list(STRATEGIES),
+                        help="Stratégies des symboles supplémentaires (défaut : golden_cross)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Processus de calcul (défaut : la moitié des cœurs)")
+    parser.add_argument("--nice", type=int, default=10, help="Baisse de priorité des processus de calcul")
+    parser.add_argument("--force", action="store_true", help="Recalculer même si les données n'ont pas changé")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR or DEFAULT_PRECOMPUTE_DIR,
+                        help="Cache persistant, le même que QUANT_CACHE_DIR de l'application")
+    parser.add_argument("--at", metavar="HH:MM", help="Tourner en continu et relancer chaque jour à cette heure")
+    parser.add_argument("--report", action="store_true", help="Générer aussi le rapport quotidien (remplace le cron de daily_report.py)")
+    parser.add_argument("--data-dir", help="Dossier du store local (défaut : data/)")
+    parser.add_argument("--offline", metavar="DIR", help="Lire les prix depuis un dossier de fichiers CSV/Parquet (store temporaire sans --data-dir)")
+    args = parser.parse_args(argv)
+
+    views = load_views(args.config) if args.config else list(DEFAULT_VIEWS)
+    views += [AnalysisView(ticker=ticker, strategy=strategy) for ticker in args.tickers for strategy in args.strategy or ["golden_cross"]]
+
+    store = open_store(args.data_dir, args.offline)
+    if not DEFAULT_CACHE_DIR:
+        print(f"ℹ️ L'application lit ces résultats avec QUANT_CACHE_DIR={args.cache_dir}")
+
+    while True:
+        if args.at:
+            wake = next_run(args.at)
+            print(f"⏳ Prochain précalcul : {wake:%Y-%m-%d %H:%M}")
+            time.sleep(max(0.0, (wake - datetime.now()).total_seconds()))
+        if args.report:
+            from daily_report import generate_report
+            generate_report(store=store)
+        start = time.perf_counter()
+        outcome = run_precompute(views, store, args.cache_dir, args.workers, args.nice, args.force)
+        counts = {status: list(outcome.values()).count(status) for status in ("calculé", "à jour", "erreur")}
+        print(f"✅ {len(outcome)} vues en {time.perf_counter() - start:.1f} s : "
+              + ", ".join(f"{n} {status}" for status, n in counts.items()))
+        print(state_table(load_state(os.path.join(args.cache_dir, STATE_FILE))).to_string(float_format="%.2f"))
+        if not args.at:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Les tests importent `modules` et `benchmarks` depuis la racine du dépôt, sans installation
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import gbm_close, gbm_ohlcv  # noqa: E402
+
+
+@pytest.fixture
+def closes():
+    """Clôtures journalières déterministes de 5 actifs (GBM)"""
+    return gbm_close(1500, 5, freq="B", seed=7)
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    """Dossier de prix hors ligne (<symbole>.csv) pour LocalProvider, dates récentes (période '2y')"""
+    folder = tmp_path / "fixtures"
+    folder.mkdir()
+    start = pd.Timestamp.now().normalize() - pd.offsets.BDay(599)
+    for seed, ticker in enumerate(["AAA", "BBB", "CCC"]):
+        gbm_ohlcv(600, freq="B", start=start, seed=seed).to_csv(folder / f"{ticker}.csv")
+    return folder
@@ -0,0 +1,24 @@
+import os
+
+from benchmarks.synthetic import gbm_ohlcv
+from modules.bar_store import BarStore, to_frame
+
+
+def test_append_keeps_stored_files_and_matches_merge(tmp_path):
+    bars = gbm_ohlcv(300, freq="min", seed=3)
+    store = BarStore(str(tmp_path))
+    store.append("AAA", "1m", bars.iloc[:200])
+    before = store.read("AAA", "1m")  # Vue d'un lecteur ouverte avant les mises à jour
+
+    # Dernière barre complétée : nouvelle version des fichiers, l'ancienne vue reste intacte
+    completed = bars.iloc[199:250].copy()
+    completed.iloc[0, completed.columns.get_loc("Close")] = -1.0
+    assert store.append("AAA", "1m", completed) == 250
+    assert to_frame(before)["Close"].iloc[-1] == bars["Close"].astype("float32").iloc[199]
+
+    assert store.append("AAA", "1m", bars.iloc[250:]) == 300  # Ajout pur en fin de fichier
+    frame = to_frame(store.read("AAA", "1m"))
+    assert frame.index.equals(bars.index)
+    assert frame["Close"].iloc[199] == -1.0
+    assert (frame["Close"].iloc[200:] == bars["Close"].astype("float32").iloc[200:]).all()
+    assert not [name for name in os.listdir(tmp_path / "1m" / "AAA") if name.endswith(".tmp")]
@@ -0,0 +1,16 @@
+import os
+
+from modules.compute_cache import ComputeCache
+
+
+def test_disk_bytes_match_directory_after_overwrites(tmp_path):
+    cache = ComputeCache(cache_dir=str(tmp_path))
+    for size in (1000, 1000, 5000, 200):  # La même clé réécrite (deux sessions, ou un fichier illisible)
+        cache._save("prices-abc", b"x" * size)
+    cache._save("prices-def", b"y" * 300)
+    assert cache.disk_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+    with cache.record_keys() as keys:
+        cache.call("double", lambda x: 2 * x, 21)
+    assert cache.recording is None and len(keys) == 1
+    assert cache.disk_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
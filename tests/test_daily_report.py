@@ -0,0 +1,40 @@
+import os
+
+import pandas as pd
+
+import daily_report
+from modules.report_store import ReportStore
+
+
+def test_offline_report_from_fixtures(fixture_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Le store de production serait data/ dans le dossier courant
+    output = tmp_path / "out"
+    db = tmp_path / "reports.db"
+    daily_report.main(["AAA", "BBB", "CCC", "ZZZ", "--offline", str(fixture_dir), "--output-dir", str(output),
+                       "--date", "2026-01-02", "--db", str(db), "--compact-days", "100000"])
+
+    table = pd.read_csv(output / "rapport_2026-01-02.csv")
+    assert sorted(table["ticker"]) == ["AAA", "BBB", "CCC", "ZZZ"]
+    assert table.set_index("ticker")["error"].notna().to_dict() == {"AAA": False, "BBB": False, "CCC": False, "ZZZ": True}
+    expected_close = pd.read_csv(fixture_dir / "AAA.csv", index_col=0)["Close"].iloc[-1]
+    assert table.set_index("ticker").loc["AAA", "close"] == expected_close
+
+    summary = (output / "rapport_2026-01-02.txt").read_text()
+    assert ReportStore(str(db)).summary("2026-01-02") == summary
+    assert not os.path.exists(output / ".rapport_2026-01-02.partial.jsonl")
+    # --offline sans --data-dir : rien n'est écrit dans data/
+    assert not os.path.exists(tmp_path / "data")
+
+
+def test_cron_archives_without_flat_files(fixture_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = tmp_path / "archive" / "reports.db"
+    store = ReportStore(str(db))
+    store.add_report("2020-01-02", pd.DataFrame([{"ticker": "AAA", "close": 1.0}]), "ancien")
+    daily_report.main(["AAA", "--offline", str(fixture_dir), "--date", "2026-01-02", "--db", str(db)])
+
+    # Archive seule : aucun rapport_DATE.* dans le dossier courant, rétention par défaut appliquée
+    assert sorted(os.listdir(tmp_path)) == ["archive", "fixtures"]
+    assert not [name for name in os.listdir(tmp_path / "archive") if "rapport_" in name]
+    assert store.dates() == ["2026-01-02"]
+    assert store.rows("2026-01-02")["ticker"].tolist() == ["AAA"]
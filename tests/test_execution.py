@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from modules.backtest import BuyAndHold, backtest
+from modules.execution import ExecutionModel
+
+
+@pytest.mark.parametrize("rebalance", ["entry", "daily"])
+def test_buy_and_hold_with_vol_targeting_trades(closes, rebalance):
+    close = closes.iloc[:, 0].to_numpy()
+    signals, _ = BuyAndHold().compute(close)
+    execution = ExecutionModel(target_vol=0.1, vol_window=20, rebalance=rebalance)
+    result = backtest(close, signals, execution=execution)
+
+    # Entrée dès la 1re barre : la position est dimensionnée dès que la vol réalisée est connue
+    assert np.all(result.position[1:20] == 0)
+    assert np.all(result.position[20:] > 0)
+    assert result.metrics["final_value"] != 10000
+
+
+def test_entry_sizing_matches_per_column(closes):
+    close = closes.to_numpy()
+    market_returns = np.full(close.shape, np.nan)
+    market_returns[1:] = close[1:] / close[:-1] - 1
+    signals = (np.random.default_rng(0).random(close.shape) > 0.3).astype(float)
+    execution = ExecutionModel(target_vol=0.15)
+    together = execution.exposure(signals, market_returns)
+    for k in range(close.shape[1]):
+        np.testing.assert_array_equal(together[:, k], execution.exposure(signals[:, k], market_returns[:, k]))
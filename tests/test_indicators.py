@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import indicators
+
+
+@pytest.mark.parametrize("window", [1, 5, 20, 200])
+def test_sma_matches_pandas(closes, window):
+    expected = closes.rolling(window).mean().to_numpy()
+    np.testing.assert_allclose(indicators.sma(closes.to_numpy(), window), expected, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [2, 20, 50])
+def test_rolling_std_matches_pandas(closes, window):
+    # Sommes glissantes : l'erreur d'arrondi est relative au niveau des prix, pas à l'écart-type
+    x = closes.to_numpy()
+    expected = closes.rolling(window).std().to_numpy()
+    np.testing.assert_allclose(indicators.rolling_std(x, window), expected, rtol=1e-8, atol=1e-8 * np.abs(x).max(),
+                               equal_nan=True)
+
+
+def test_rolling_std_on_trending_series():
+    # Série à fort niveau et tendance : l'annulation de S2 - S1² n'est pas visible
+    x = 1e6 + np.arange(20_000) * 10.0 + np.sin(np.arange(20_000))
+    expected = pd.Series(x).rolling(30).std().to_numpy()
+    np.testing.assert_allclose(indicators.rolling_std(x, 30), expected, rtol=1e-6, equal_nan=True)
+
+
+def test_out_argument_is_filled_in_place(closes):
+    x = closes.iloc[:, 0].to_numpy()
+    out = np.empty_like(x)
+    result = indicators.sma(x, 10, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, pd.Series(x).rolling(10).mean(), rtol=1e-10, equal_nan=True)
+
+
+def test_rsi_simple_matches_pandas(closes):
+    close = closes.iloc[:, 0]
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    expected = 100 - 100 / (1 + gain / loss)
+    np.testing.assert_allclose(indicators.rsi(close.to_numpy(), 14), expected, rtol=1e-8, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_missing_values_match_pandas(closes, window):
+    prices = closes.copy()
+    prices.iloc[0, 1] = np.nan
+    prices.iloc[10, 0] = np.nan
+    prices.iloc[400:403, 2] = np.nan
+    x = prices.to_numpy()
+    np.testing.assert_allclose(indicators.sma(x, window), prices.rolling(window).mean(), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(indicators.rolling_std(x, window), prices.rolling(window).std(), rtol=1e-8,
+                               atol=1e-8 * np.nanmax(np.abs(x)), equal_nan=True)
+    # L'indicateur reprend une fois la fenêtre passée au-delà du NaN
+    assert np.isfinite(indicators.sma(x[:, 0], window)[10 + window:]).all()
+
+    close = prices.iloc[:, 0]
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    np.testing.assert_allclose(indicators.rsi(close.to_numpy(), 14), 100 - 100 / (1 + gain / loss), rtol=1e-8,
+                               equal_nan=True)
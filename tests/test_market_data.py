@@ -0,0 +1,31 @@
+import pytest
+
+from modules.market_data import LocalProvider, MarketDataStore
+
+
+class FlakyProvider(LocalProvider):
+    """Fichiers locaux, mais chaque téléchargement échoue tant que `offline` est vrai"""
+    offline = False
+
+    def download(self, ticker, start=None, interval="1d"):
+        if self.offline:
+            raise ConnectionError("réseau indisponible")
+        return super().download(ticker, start, interval)
+
+
+@pytest.mark.parametrize("many", [False, True])
+def test_failed_refresh_keeps_data_stale(fixture_dir, tmp_path, many):
+    provider = FlakyProvider(str(fixture_dir))
+    store = MarketDataStore(str(tmp_path / "data"), provider)
+    stored = store.get_history("AAA")
+    fetched_at = store._read_meta("AAA", "1d")["fetched_at"]
+
+    # Rafraîchissement en échec : version disque servie, fetched_at inchangé pour réessayer au prochain appel
+    provider.offline = True
+    data = store.get_many(["AAA"], max_age=0)["AAA"] if many else store.get_history("AAA", max_age=0)
+    assert data.equals(stored)
+    assert store._read_meta("AAA", "1d")["fetched_at"] == fetched_at
+
+    provider.offline = False
+    store.get_many(["AAA"], max_age=0) if many else store.get_history("AAA", max_age=0)
+    assert store._read_meta("AAA", "1d")["fetched_at"] > fetched_at
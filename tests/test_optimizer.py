@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from modules import optimizer
+
+
+@pytest.mark.parametrize("lower, upper", [(0.0, 1.0), (0.05, 1.0), (0.0, 0.3), (0.05, 0.3)])
+def test_max_sharpe_beats_random_portfolios(closes, lower, upper):
+    mu, cov = optimizer.estimate(np.log(closes).diff().dropna())
+    mu = mu - mu.mean() + 0.1  # Rendements excédentaires positifs quelles que soient les bornes
+    weights = optimizer.max_sharpe(mu, cov, lower, upper)
+    assert weights.sum() == pytest.approx(1.0, abs=1e-12)
+    assert weights.min() >= lower and weights.max() <= upper
+
+    _, best, _ = optimizer.random_portfolios(mu, cov, 20_000, lower, upper)
+    sharpe = optimizer.portfolio_stats(np.vstack([weights, best]), mu, cov)[2]
+    assert sharpe[0] >= sharpe[1] - 1e-9
+
+
+def test_max_sharpe_without_positive_excess_is_min_variance(closes):
+    mu, cov = optimizer.estimate(np.log(closes).diff().dropna())
+    risk_free = mu.max() + 0.01
+    weights = optimizer.max_sharpe(mu, cov, risk_free=risk_free)
+    np.testing.assert_allclose(weights, optimizer.min_variance(mu, cov), atol=1e-12)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from modules.execution import ExecutionModel
+from modules.portfolio import REBALANCE_FREQUENCIES, backtest_portfolio, rebalance_positions
+
+
+def per_bar(prices, weights, capital, rebalance, threshold, execution):
+    """Référence : une itération par barre (dérive des avoirs, puis ordre éventuel à la clôture)"""
+    target = np.array(list(weights.values()))
+    values = prices[list(weights)].to_numpy()
+    calendar = set(rebalance_positions(prices.index, rebalance)) if rebalance in REBALANCE_FREQUENCIES else set()
+
+    def costs(amounts, scale):
+        return execution.cost_rate * amounts.sum() + execution.fixed_fee * np.count_nonzero(amounts > 1e-12 * scale)
+
+    holdings = target * (capital - costs(target * capital, capital))
+    equity = [holdings.sum()]
+    last = len(values) - 1
+    for t in range(1, len(values)):
+        holdings = holdings * values[t] / values[t - 1]
+        value = holdings.sum()
+        drift = np.abs(holdings / value - target).max()
+        if t < last and (rebalance == "daily" or t in calendar or (rebalance == "threshold" and drift > threshold)):
+            holdings = target * (value - costs(np.abs(target * value - holdings), value))
+        equity.append(holdings.sum())
+    return np.array(equity)
+
+
+@pytest.mark.parametrize("rebalance", ["none", "daily", "weekly", "monthly", "quarterly", "threshold"])
+@pytest.mark.parametrize("execution", [ExecutionModel(), ExecutionModel(commission_bps=10, fixed_fee=1.0)],
+                         ids=["sans frais", "frais"])
+def test_backtest_portfolio_matches_per_bar_loop(closes, rebalance, execution):
+    weights = {"ASSET000": 0.4, "ASSET001": 0.3, "ASSET002": 0.2, "ASSET003": 0.1}
+    result = backtest_portfolio(closes, weights, 10000, rebalance, 0.05, execution)
+    expected = per_bar(closes, weights, 10000, rebalance, 0.05, execution)
+    np.testing.assert_allclose(result.equity.to_numpy(), expected, rtol=1e-9)
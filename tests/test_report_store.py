@@ -0,0 +1,24 @@
+import os
+import shutil
+
+import import_reports
+from modules.report_store import ReportStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_compacted_legacy_report_summary(tmp_path):
+    # Ancien rapport mono-actif (BTC-USD) : seules ouverture / clôture / volatilité sont connues
+    legacy = tmp_path / "rapport_2026-01-08.txt"
+    shutil.copy(os.path.join(ROOT, "rapport_2026-01-08.txt"), legacy)
+    db = str(tmp_path / "reports.db")
+    import_reports.main([str(legacy), "--db", db, "--compact-days", "0"])
+
+    store = ReportStore(db)
+    assert store.prune(compact_days=0) == (0, 0)  # Déjà compacté par l'import
+    rows = store.rows("2026-01-08")
+    assert rows.loc[0, "close"] == 91117.70
+    assert rows["change_pct"].isna().all()
+    summary = store.summary("2026-01-08")
+    assert "RAPPORT QUOTIDIEN - 2026-01-08" in summary
+    assert "91117.70" in summary
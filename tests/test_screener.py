@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import gbm_close
+from modules import indicators
+from modules.backtest import GoldenCross
+from modules.screener import BACKTEST_WINDOW, panel_tail, screen, screen_rows
+
+
+@pytest.fixture
+def mixed_panel():
+    """Univers crypto (7 j / 7) + actions (jours ouvrés) : jointure externe des calendriers, comme UniversePanel"""
+    crypto = gbm_close(800, 2, freq="D", start="2023-01-02", seed=1).add_prefix("C-")
+    stocks = gbm_close(600, 2, freq="B", start="2023-01-02", seed=2).add_prefix("S-")
+    stocks.iloc[300, 0] = np.nan  # Barre manquante
+    return pd.concat([crypto, stocks], axis=1).sort_index()
+
+
+def test_screen_uses_each_ticker_calendar(mixed_panel):
+    table = screen(mixed_panel)
+    for ticker in mixed_panel.columns:
+        own = mixed_panel[ticker].dropna().to_numpy()
+        row = table.loc[ticker]
+        assert row["close"] == own[-1]
+        assert row["change_pct"] == pytest.approx((own[-1] / own[-2] - 1) * 100)
+        assert row["sma_long"] == pytest.approx(indicators.sma(own, GoldenCross().long_window)[-1], rel=1e-10)
+        assert row["rsi"] == pytest.approx(indicators.rsi(own, 14)[-1], rel=1e-8)
+        recent = own[-(BACKTEST_WINDOW + 1):]
+        assert row["bh_return_pct"] == pytest.approx((recent[-1] / recent[0] - 1) * 100)
+
+
+def test_panel_tail_gives_the_same_table(mixed_panel):
+    tail = panel_tail(mixed_panel, screen_rows())
+    assert len(tail) < len(mixed_panel)
+    pd.testing.assert_frame_equal(screen(tail), screen(mixed_panel))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from modules.backtest import BollingerBands, GoldenCross, RSIStrategy
+from modules.sweep import score_signals, signal_blocks
+
+# Chaque combinaison de la grille doit donner exactement les signaux de la stratégie de quant_a
+CASES = [
+    ("golden_cross", {"short_window": np.array([5, 20]), "long_window": np.array([50, 120])},
+     lambda a, b: GoldenCross(a, b)),
+    ("rsi", {"rsi_period": np.array([7, 14]), "overbought": np.array([60, 70])},
+     lambda a, b: RSIStrategy(a, overbought=b)),
+    ("bollinger", {"window": np.array([10, 20]), "std_dev": np.array([1.5, 2.0])},
+     lambda a, b: BollingerBands(a, b)),
+]
+
+
+@pytest.mark.parametrize("strategy, grid, make", CASES, ids=[case[0] for case in CASES])
+def test_sweep_signals_match_strategies(closes, strategy, grid, make):
+    close = closes.iloc[:, 0].to_numpy()
+    for params, signals in signal_blocks(close, strategy, grid, max_cells=len(close) * 2):
+        for j, (a, b) in enumerate(params.itertuples(index=False)):
+            expected, _ = make(a, b).compute(close)
+            np.testing.assert_array_equal(signals[:, j], expected.astype(bool), err_msg=f"{strategy}({a}, {b})")
+
+
+def test_bollinger_signals_on_trending_series():
+    close = 1e5 + np.arange(3000) * 50.0 + np.cumsum(np.random.default_rng(0).normal(0, 1, 3000))
+    grid = {"window": np.array([20]), "std_dev": np.array([2.0])}
+    _, signals = next(signal_blocks(close, "bollinger", grid))
+    expected, _ = BollingerBands(20, 2.0).compute(close)
+    np.testing.assert_array_equal(signals[:, 0], expected.astype(bool))
+
+
+def test_score_signals_matches_per_column(closes):
+    close = closes.to_numpy()
+    market_returns = np.full(close.shape, np.nan)
+    market_returns[1:] = close[1:] / close[:-1] - 1
+    signals, _ = GoldenCross(10, 40).compute(close)
+    together = score_signals(market_returns, signals)
+    for k in range(close.shape[1]):
+        alone = score_signals(market_returns[:, k], signals[:, k:k + 1])
+        np.testing.assert_allclose(together.iloc[k].to_numpy(), alone.iloc[0].to_numpy(), rtol=1e-10)